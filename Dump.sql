@@ -60,6 +60,7 @@ CREATE TABLE `announcements` (
   `admin_id` varchar(20) DEFAULT NULL,
   PRIMARY KEY (`announcement_id`),
   KEY `admin_id` (`admin_id`),
+  KEY `ix_announcements_audience_sent` (`target_audience`,`sent_at`),
   CONSTRAINT `announcements_ibfk_1` FOREIGN KEY (`admin_id`) REFERENCES `admin` (`admin_id`)
 ) ENGINE=InnoDB AUTO_INCREMENT=13 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -99,6 +100,7 @@ CREATE TABLE `booking` (
   KEY `req_lecturer_id` (`req_lecturer_id`),
   KEY `approved_by_admin_id` (`approved_by_admin_id`),
   KEY `status_id` (`status_id`),
+  KEY `ix_booking_room_status_window` (`room_id`,`status_id`,`req_start_datetime`,`req_end_datetime`),
   CONSTRAINT `booking_ibfk_1` FOREIGN KEY (`room_id`) REFERENCES `rooms` (`room_id`),
   CONSTRAINT `booking_ibfk_2` FOREIGN KEY (`event_id`) REFERENCES `event` (`event_id`),
   CONSTRAINT `booking_ibfk_3` FOREIGN KEY (`req_organizer_id`) REFERENCES `organizer` (`organizer_id`),
@@ -131,6 +133,7 @@ CREATE TABLE `category` (
   `created_by_admin_id` varchar(20) DEFAULT NULL,
   PRIMARY KEY (`category_id`),
   KEY `created_by_admin_id` (`created_by_admin_id`),
+  FULLTEXT KEY `ft_category_name` (`category_name`),
   CONSTRAINT `category_ibfk_1` FOREIGN KEY (`created_by_admin_id`) REFERENCES `admin` (`admin_id`)
 ) ENGINE=InnoDB AUTO_INCREMENT=9 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -181,6 +184,41 @@ INSERT INTO `equipment_request` VALUES (1,1,2,1,1,'AD01'),(2,4,2,2,4,'AD03'),(3,
 /*!40000 ALTER TABLE `equipment_request` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `equipmentreservation`
+--
+
+DROP TABLE IF EXISTS `equipmentreservation`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `equipmentreservation` (
+  `reservation_id` int NOT NULL AUTO_INCREMENT,
+  `request_id` int NOT NULL,
+  `equipment_id` int NOT NULL,
+  `event_id` int NOT NULL,
+  `quantity` int NOT NULL,
+  `start_datetime` datetime NOT NULL,
+  `end_datetime` datetime NOT NULL,
+  PRIMARY KEY (`reservation_id`),
+  UNIQUE KEY `request_id` (`request_id`),
+  KEY `event_id` (`event_id`),
+  KEY `ix_reservation_equipment_window` (`equipment_id`,`start_datetime`,`end_datetime`),
+  CONSTRAINT `equipmentreservation_ibfk_1` FOREIGN KEY (`request_id`) REFERENCES `equipment_request` (`request_id`),
+  CONSTRAINT `equipmentreservation_ibfk_2` FOREIGN KEY (`equipment_id`) REFERENCES `equipments` (`equipment_id`),
+  CONSTRAINT `equipmentreservation_ibfk_3` FOREIGN KEY (`event_id`) REFERENCES `event` (`event_id`)
+) ENGINE=InnoDB AUTO_INCREMENT=4 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `equipmentreservation`
+--
+
+LOCK TABLES `equipmentreservation` WRITE;
+/*!40000 ALTER TABLE `equipmentreservation` DISABLE KEYS */;
+INSERT INTO `equipmentreservation` VALUES (1,1,1,1,1,'2026-03-01 09:00:00','2026-03-01 18:00:00'),(2,2,4,2,4,'2026-03-12 09:00:00','2026-03-12 19:00:00'),(3,6,4,5,7,'2026-01-01 08:56:00','2026-01-03 00:00:00');
+/*!40000 ALTER TABLE `equipmentreservation` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Table structure for table `equipments`
 --
@@ -226,10 +264,21 @@ CREATE TABLE `event` (
   `category_id` int DEFAULT NULL,
   `organizer_id` varchar(20) DEFAULT NULL,
   `lecturer_id` varchar(20) DEFAULT NULL,
+  `updated_at` datetime DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  `confirmed_count` int NOT NULL DEFAULT '0',
+  `high_demand` tinyint(1) NOT NULL DEFAULT '0',
   PRIMARY KEY (`event_id`),
   KEY `category_id` (`category_id`),
   KEY `organizer_id` (`organizer_id`),
   KEY `lecturer_id` (`lecturer_id`),
+  KEY `ix_event_status_start` (`event_status`,`start_datetime`,`event_id`),
+  KEY `ix_event_start` (`start_datetime`,`event_id`),
+  KEY `ix_event_organizer_start` (`organizer_id`,`start_datetime`,`event_id`),
+  KEY `ix_event_lecturer_start` (`lecturer_id`,`start_datetime`,`event_id`),
+  KEY `ix_event_status_end_start` (`event_status`,`end_datetime`,`start_datetime`),
+  KEY `ix_event_organizer_end` (`organizer_id`,`end_datetime`,`start_datetime`),
+  KEY `ix_event_lecturer_end` (`lecturer_id`,`end_datetime`,`start_datetime`),
+  FULLTEXT KEY `ft_event_title_description` (`title`,`description`),
   CONSTRAINT `event_ibfk_1` FOREIGN KEY (`category_id`) REFERENCES `category` (`category_id`),
   CONSTRAINT `event_ibfk_2` FOREIGN KEY (`organizer_id`) REFERENCES `organizer` (`organizer_id`),
   CONSTRAINT `event_ibfk_3` FOREIGN KEY (`lecturer_id`) REFERENCES `lecturer` (`lecturer_id`)
@@ -242,10 +291,42 @@ CREATE TABLE `event` (
 
 LOCK TABLES `event` WRITE;
 /*!40000 ALTER TABLE `event` DISABLE KEYS */;
-INSERT INTO `event` VALUES (1,'Python Bootcamp','Learn coding basics','A001.jpg','2026-03-01 09:00:00','2026-03-01 18:00:00','Upcoming','Computer Lab 3',40,1,'OR01',NULL),(2,'Inter-Uni Friendly','Friendly volleyball match','A002.jpg','2026-03-12 09:00:00','2026-03-12 19:00:00','Upcoming','Sports Field',200,3,'OR03',NULL),(3,'Jazz Night','Live jazz performance','A003.jpg','2026-03-01 19:00:00','2026-03-01 23:00:00','Upcoming','Pending Approval',500,2,'OR02',NULL),(4,'Physics Future Talk','Discussion on Quantum Physics','A004.jpg','2026-02-15 08:00:00','2026-02-15 14:00:00','Upcoming','Lecture Theatre 1',150,7,NULL,'LE04'),(5,'Let\'s sing','Come join us if you have a wonderful voice','A005.jpg','2026-01-01 08:56:00','2026-01-03 00:00:00','Expired','Grand Hall',80,2,'OR02',NULL),(6,'Photography Day','In this event, I will show u how to take a really good picture.','A006.jpg','2026-03-04 07:00:00','2026-03-04 19:00:00','Upcoming','Grand Hall',20,2,'OR04',NULL),(10,'Advanced AI Research Seminar','A deep dive into neural networks by Prof. Ahmad Zaki.','A007.jpg','2026-03-20 10:00:00','2026-03-20 13:00:00','Upcoming','Seminar Room 1',50,7,NULL,'LE03'),(11,'Chinese Calligraphy Workshop','Learn the art of traditional brush writing.','A008.jpg','2026-03-25 14:00:00','2026-03-25 17:00:00','Upcoming','Activity Room',30,1,'OR06',NULL),(12,'Cyberjaya Fun Run','5km run around the campus perimeter.','A009.jpg','2026-04-01 07:00:00','2026-04-01 11:00:00','Upcoming','Sports Field',200,3,'OR12',NULL),(13,'Valorant Campus Championship','Inter-faculty e-sports tournament finals.','A010.jpg','2026-04-05 09:00:00','2026-04-05 21:00:00','Upcoming','Lecture Theatre 2',100,2,'OR09',NULL),(16,'dsfsjdfnl','gjggffghhgh',NULL,'2026-03-18 10:00:00','2026-03-18 22:00:00','Pending','Activity Room',50,2,'OR08',NULL);
+INSERT INTO `event` VALUES (1,'Python Bootcamp','Learn coding basics','A001.jpg','2026-03-01 09:00:00','2026-03-01 18:00:00','Upcoming','Computer Lab 3',40,1,'OR01',NULL,'2026-02-04 11:37:40',2,0),(2,'Inter-Uni Friendly','Friendly volleyball match','A002.jpg','2026-03-12 09:00:00','2026-03-12 19:00:00','Upcoming','Sports Field',200,3,'OR03',NULL,'2026-02-04 11:37:40',1,0),(3,'Jazz Night','Live jazz performance','A003.jpg','2026-03-01 19:00:00','2026-03-01 23:00:00','Upcoming','Pending Approval',500,2,'OR02',NULL,'2026-02-04 11:37:40',1,0),(4,'Physics Future Talk','Discussion on Quantum Physics','A004.jpg','2026-02-15 08:00:00','2026-02-15 14:00:00','Upcoming','Lecture Theatre 1',150,7,NULL,'LE04','2026-02-04 11:37:40',1,0),(5,'Let\'s sing','Come join us if you have a wonderful voice','A005.jpg','2026-01-01 08:56:00','2026-01-03 00:00:00','Expired','Grand Hall',80,2,'OR02',NULL,'2026-02-04 11:37:40',1,0),(6,'Photography Day','In this event, I will show u how to take a really good picture.','A006.jpg','2026-03-04 07:00:00','2026-03-04 19:00:00','Upcoming','Grand Hall',20,2,'OR04',NULL,'2026-02-04 11:37:40',1,0),(10,'Advanced AI Research Seminar','A deep dive into neural networks by Prof. Ahmad Zaki.','A007.jpg','2026-03-20 10:00:00','2026-03-20 13:00:00','Upcoming','Seminar Room 1',50,7,NULL,'LE03','2026-02-04 11:37:40',0,0),(11,'Chinese Calligraphy Workshop','Learn the art of traditional brush writing.','A008.jpg','2026-03-25 14:00:00','2026-03-25 17:00:00','Upcoming','Activity Room',30,1,'OR06',NULL,'2026-02-04 11:37:40',0,0),(12,'Cyberjaya Fun Run','5km run around the campus perimeter.','A009.jpg','2026-04-01 07:00:00','2026-04-01 11:00:00','Upcoming','Sports Field',200,3,'OR12',NULL,'2026-02-04 11:37:40',1,0),(13,'Valorant Campus Championship','Inter-faculty e-sports tournament finals.','A010.jpg','2026-04-05 09:00:00','2026-04-05 21:00:00','Upcoming','Lecture Theatre 2',100,2,'OR09',NULL,'2026-02-04 11:37:40',1,0),(16,'dsfsjdfnl','gjggffghhgh',NULL,'2026-03-18 10:00:00','2026-03-18 22:00:00','Pending','Activity Room',50,2,'OR08',NULL,'2026-02-04 11:37:40',0,0);
 /*!40000 ALTER TABLE `event` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `eventratingrollup`
+--
+
+DROP TABLE IF EXISTS `eventratingrollup`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `eventratingrollup` (
+  `event_id` int NOT NULL,
+  `rating_count` int NOT NULL DEFAULT '0',
+  `rating_sum` int NOT NULL DEFAULT '0',
+  `stars_1` int NOT NULL DEFAULT '0',
+  `stars_2` int NOT NULL DEFAULT '0',
+  `stars_3` int NOT NULL DEFAULT '0',
+  `stars_4` int NOT NULL DEFAULT '0',
+  `stars_5` int NOT NULL DEFAULT '0',
+  `latest_at` datetime DEFAULT NULL,
+  PRIMARY KEY (`event_id`),
+  CONSTRAINT `eventratingrollup_ibfk_1` FOREIGN KEY (`event_id`) REFERENCES `event` (`event_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `eventratingrollup`
+--
+
+LOCK TABLES `eventratingrollup` WRITE;
+/*!40000 ALTER TABLE `eventratingrollup` DISABLE KEYS */;
+INSERT INTO `eventratingrollup` VALUES (5,1,5,0,0,0,0,1,'2026-01-25 17:49:26');
+/*!40000 ALTER TABLE `eventratingrollup` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Table structure for table `feedback`
 --
@@ -263,6 +344,7 @@ CREATE TABLE `feedback` (
   PRIMARY KEY (`feedback_id`),
   KEY `student_id` (`student_id`),
   KEY `event_id` (`event_id`),
+  KEY `ix_feedback_event_submitted` (`event_id`,`submitted_at`),
   CONSTRAINT `feedback_ibfk_1` FOREIGN KEY (`student_id`) REFERENCES `student` (`student_id`),
   CONSTRAINT `feedback_ibfk_2` FOREIGN KEY (`event_id`) REFERENCES `event` (`event_id`),
   CONSTRAINT `feedback_chk_1` CHECK ((`rating` between 1 and 5))
@@ -279,6 +361,38 @@ INSERT INTO `feedback` VALUES (9,5,'Love the music vibe!','2026-01-25 17:49:26',
 /*!40000 ALTER TABLE `feedback` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `hostratingrollup`
+--
+
+DROP TABLE IF EXISTS `hostratingrollup`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `hostratingrollup` (
+  `host_type` varchar(20) NOT NULL,
+  `host_id` varchar(20) NOT NULL,
+  `rating_count` int NOT NULL DEFAULT '0',
+  `rating_sum` int NOT NULL DEFAULT '0',
+  `stars_1` int NOT NULL DEFAULT '0',
+  `stars_2` int NOT NULL DEFAULT '0',
+  `stars_3` int NOT NULL DEFAULT '0',
+  `stars_4` int NOT NULL DEFAULT '0',
+  `stars_5` int NOT NULL DEFAULT '0',
+  `latest_at` datetime DEFAULT NULL,
+  PRIMARY KEY (`host_type`,`host_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `hostratingrollup`
+--
+
+LOCK TABLES `hostratingrollup` WRITE;
+/*!40000 ALTER TABLE `hostratingrollup` DISABLE KEYS */;
+INSERT INTO `hostratingrollup` VALUES ('Organizer','OR02',1,5,0,0,0,0,1,'2026-01-25 17:49:26');
+/*!40000 ALTER TABLE `hostratingrollup` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Table structure for table `lecturer`
 --
@@ -351,8 +465,10 @@ CREATE TABLE `registration` (
   `student_id` varchar(20) NOT NULL,
   `event_id` int NOT NULL,
   PRIMARY KEY (`registration_id`),
+  UNIQUE KEY `uq_registration_student_event` (`student_id`,`event_id`),
   KEY `student_id` (`student_id`),
   KEY `event_id` (`event_id`),
+  KEY `ix_registration_event_status` (`event_id`,`status`,`registration_id`),
   CONSTRAINT `registration_ibfk_1` FOREIGN KEY (`student_id`) REFERENCES `student` (`student_id`),
   CONSTRAINT `registration_ibfk_2` FOREIGN KEY (`event_id`) REFERENCES `event` (`event_id`)
 ) ENGINE=InnoDB AUTO_INCREMENT=14 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -420,6 +536,31 @@ INSERT INTO `rooms` VALUES (1,'Grand Hall',400,'DTC','Hall',1),(2,'Lecture Theat
 /*!40000 ALTER TABLE `rooms` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `schema_migrations`
+--
+
+DROP TABLE IF EXISTS `schema_migrations`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `schema_migrations` (
+  `version` varchar(20) NOT NULL,
+  `description` varchar(200) DEFAULT NULL,
+  `applied_at` datetime DEFAULT NULL,
+  PRIMARY KEY (`version`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `schema_migrations`
+--
+
+LOCK TABLES `schema_migrations` WRITE;
+/*!40000 ALTER TABLE `schema_migrations` DISABLE KEYS */;
+INSERT INTO `schema_migrations` VALUES ('0001','Identity index, event counters, equipment ledger, listing and search indexes','2026-02-04 11:37:40'),('0002','Composite indexes for listings, conflict checks, registrations, announcements and feedback','2026-02-04 11:37:40'),('0003','Feedback rating rollups per event and per host','2026-02-04 11:37:40'),('0004','Host schedule indexes for double-booking checks','2026-02-04 11:37:40');
+/*!40000 ALTER TABLE `schema_migrations` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Table structure for table `student`
 --
@@ -448,6 +589,31 @@ LOCK TABLES `student` WRITE;
 INSERT INTO `student` VALUES ('1221100001','Muhammad Aiman Bin Razak','muhammad.aiman.razak@student.mmu.edu.my','Aiman@001','017-6011001','Active'),('1221100002','Nur Syafiqah Binti Rahman','nur.syafiqah.rahman@student.mmu.edu.my','Syafiqah@02','017-6011002','Active'),('1221100003','Daniel Wong Wei Jian','daniel.wong.wei@student.mmu.edu.my','WeiJian#3','017-6011003','Active'),('1221100004','Aina Sofea Binti Zulkifli','aina.sofea.zulkifli@student.mmu.edu.my','Sofea@04','017-6011004','Active'),('1221100005','Arif Hakimi Bin Azlan','arif.hakimi.azlan@student.mmu.edu.my','Hakimi@05','017-6011005','Active'),('1221100006','Nur Haziqah Binti Salleh','nur.haziqah.salleh@student.mmu.edu.my','Haziqah@06','017-6011006','Active'),('1221100007','Low Jian Sheng','low.jian.sheng@student.mmu.edu.my','JSheng@07','017-6011007','Active'),('1221100008','Muhammad Irfan Bin Latif','muhammad.irfan.latif@student.mmu.edu.my','Irfan@08','017-6011008','Active'),('1221100009','Tan Mei Yi','tan.mei.yi@student.mmu.edu.my','MeiYi@09','017-6011009','Active'),('1221100010','Suresh Kumar A/L Raman','suresh.kumar.raman@student.mmu.edu.my','Suresh@10','017-6011010','Active'),('243UC245VH','Hau Lin Jun','hau.lin.jun@student.mmu.edu.my','limjun12','019-8364886','Active'),('243UC245YH','Ali Bin Azmad','ali.bin.azmad@student.mmu.edu.my','Ali_123','019-32764583','Active'),('243UC246H7','Ethan Yeo Zheng Ming','ethan.yeo.zheng@student.mmu.edu.my','yeoo456','019-7364899','Active'),('243UC246T9','Lim Mei Ling','lim.mei.ling@student.mmu.edu.my','Mei_789','019-74926499','Active'),('243UC246Y9','Fatin Najwa binti Nor Azmad','fatin.najwa@student.mmu.edu.my','fatin_995','018-4283849','Active'),('243UC247A1','Chong Wei Hong','chong.wei.hong@student.mmu.edu.my','WeiHong!1','012-1111131','Active'),('243UC247B2','Siti Nurhaliza Binti Ahmad','siti.nurhaliza.ahmad@student.mmu.edu.my','Siti@B2','012-2222242','Active'),('243UC247C3','Muthu A/L Sami','muthu.al.sami@student.mmu.edu.my','Muthu#93','012-3333363','Active'),('243UC247D4','Jessica Tan Mei Xuan','jessica.tan.mei@student.mmu.edu.my','JessMX@4','012-4444474','Active'),('243UC247E5','Ahmad Faizal Bin Hassan','ahmad.faizal.hassan@student.mmu.edu.my','Faizal@55','012-5555585','Active'),('243UC247F6','Kevin Rogers Tan Jun','kevin.rogers.tan@student.mmu.edu.my','KRtan@66','012-6666696','Active'),('243UC247G7','Nurul Izzah Binti Zainal','nurul.izzah.zainal@student.mmu.edu.my','Izzah@77','012-7777727','Active'),('243UC247H8','Lee Min Ho','lee.min.ho@student.mmu.edu.my','MinHo#88','012-8888818','Active'),('243UC247I9','Sarah Aisyah Binti Kamal','sarah.aisyah.kamal@student.mmu.edu.my','Aisyah@99','012-9999949','Active'),('243UC247J0','Wan Amirul Hakim','wan.amirul.hakim@student.mmu.edu.my','Amirul@10','013-0000030','Active');
 /*!40000 ALTER TABLE `student` ENABLE KEYS */;
 UNLOCK TABLES;
+
+--
+-- Table structure for table `useridentity`
+--
+
+DROP TABLE IF EXISTS `useridentity`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `useridentity` (
+  `email` varchar(100) NOT NULL,
+  `role` varchar(20) NOT NULL,
+  `user_id` varchar(20) NOT NULL,
+  PRIMARY KEY (`email`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `useridentity`
+--
+
+LOCK TABLES `useridentity` WRITE;
+/*!40000 ALTER TABLE `useridentity` DISABLE KEYS */;
+INSERT INTO `useridentity` VALUES ('ahmad.faizal.hassan@student.mmu.edu.my','student','243UC247E5'),('aina.sofea.zulkifli@student.mmu.edu.my','student','1221100004'),('aktan@mmu.edu.my','lecturer','LE01'),('ali.bin.azmad@student.mmu.edu.my','student','243UC245YH'),('anwen@staff.mmu.edu.my','admin','AD02'),('arif.hakimi.azlan@student.mmu.edu.my','student','1221100005'),('azaki@mmu.edu.my','lecturer','LE03'),('azlan.s@mmu.edu.my','lecturer','LE10'),('chinese.society@mmu.edu.my','organizer','OR06'),('chong.wei.hong@student.mmu.edu.my','student','243UC247A1'),('cybersecure.club@mmu.edu.my','organizer','OR10'),('daniel.wong.wei@student.mmu.edu.my','student','1221100003'),('debate.society@mmu.edu.my','organizer','OR05'),('deepa.r@mmu.edu.my','lecturer','LE11'),('esports.club@mmu.edu.my','organizer','OR09'),('ethan.yeo.zheng@student.mmu.edu.my','student','243UC246H7'),('fatin.najwa@student.mmu.edu.my','student','243UC246Y9'),('hau.lin.jun@student.mmu.edu.my','student','243UC245VH'),('indian.society@mmu.edu.my','organizer','OR07'),('it.society@mmu.edu.my','organizer','OR01'),('j.leong@mmu.edu.my','lecturer','LE09'),('japanese.club@mmu.edu.my','organizer','OR08'),('jessica.tan.mei@student.mmu.edu.my','student','243UC247D4'),('john.doe@mmu.edu.my','lecturer','LE07'),('kavitha@staff.mmu.edu.my','admin','AD03'),('kevin.rogers.tan@student.mmu.edu.my','student','243UC247F6'),('lee.min.ho@student.mmu.edu.my','student','243UC247H8'),('lim.mei.ling@student.mmu.edu.my','student','243UC246T9'),('low.jian.sheng@student.mmu.edu.my','student','1221100007'),('m.chen@mmu.edu.my','lecturer','LE08'),('muhammad.aiman.razak@student.mmu.edu.my','student','1221100001'),('muhammad.irfan.latif@student.mmu.edu.my','student','1221100008'),('music.club@mmu.edu.my','organizer','OR02'),('muthu.al.sami@student.mmu.edu.my','student','243UC247C3'),('nasuha@staff.mmu.edu.my','admin','AD01'),('nur.haziqah.salleh@student.mmu.edu.my','student','1221100006'),('nur.syafiqah.rahman@student.mmu.edu.my','student','1221100002'),('nurul.izzah.zainal@student.mmu.edu.my','student','243UC247G7'),('photo.club@mmu.edu.my','organizer','OR04'),('rkumar@mmu.edu.my','lecturer','LE04'),('running.club@mmu.edu.my','organizer','OR12'),('sarah.aisyah.kamal@student.mmu.edu.my','student','243UC247I9'),('siti.aminah@mmu.edu.my','lecturer','LE06'),('siti.nurhaliza.ahmad@student.mmu.edu.my','student','243UC247B2'),('suresh.kumar.raman@student.mmu.edu.my','student','1221100010'),('swimming.club@mmu.edu.my','organizer','OR11'),('swong@mmu.edu.my','lecturer','LE02'),('tan.mei.yi@student.mmu.edu.my','student','1221100009'),('volleyball.club@mmu.edu.my','organizer','OR03'),('wan.amirul.hakim@student.mmu.edu.my','student','243UC247J0'),('ww.ng@mmu.edu.my','lecturer','LE12'),('xuelee@mmu.edu.my','lecturer','LE05'),('xueyan@staff.mmu.edu.my','admin','AD04');
+/*!40000 ALTER TABLE `useridentity` ENABLE KEYS */;
+UNLOCK TABLES;
 /*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
 
 /*!40101 SET SQL_MODE=@OLD_SQL_MODE */;
@@ -1,10 +1,24 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
-from flask import jsonify
+from flask import jsonify, Response, stream_with_context
 from models import db, Admin, Event, Booking, Category, Rooms, Announcements, Student, Organizer, Lecturer, Equipment_request, Registration
 from datetime import datetime
 from sqlalchemy import func, extract
 import json
+import hashlib
+from sqlalchemy.orm import joinedload
+from loading import eager
+from room_index import room_index
+from listing_cache import invalidate_listings
+from announcement_badges import bump_announcement_version
+from equipment_ledger import reserve, release, release_event
+from bulk_requests import process_bulk, MAX_ASSIGNMENT_ITEMS
+from dashboard_stats import get_admin_stats, invalidate_admin_stats
+from principals import invalidate_principal, find_identity, add_identity, remove_identity
+from schedule_conflicts import invalidate_student_schedules
+from room_assignment import propose_assignment, default_window as default_assignment_window
+from room_utilization import utilization_available, utilization_report, default_window, WEEKDAYS, OPEN_HOUR, CLOSE_HOUR
+from request_profiler import request_profiler, DUPLICATE_THRESHOLD
 
 admin_view = Blueprint('admin_view', __name__)
 
@@ -23,43 +37,12 @@ def admin_home():
         current_user.admin_name = request.form['name']
         current_user.admin_phone = request.form['phonenumber']
         db.session.commit()
+        invalidate_principal(current_user)
         flash('Profile updated.', 'success')
         return redirect(url_for('admin_view.admin_home'))
 
-    # Statistics
-    # 1. VENUE BOOKINGS (Breakdown)
-    # IDs: 1=Pending, 2=Approved, 3=Rejected
-    venue_pending = Booking.query.filter_by(status_id=1).count()
-    venue_approved = Booking.query.filter_by(status_id=2).count()
-    venue_rejected = Booking.query.filter_by(status_id=3).count()
-
-    # 2. EQUIPMENT REQUESTS (Breakdown - NEW)
-    equip_pending = Equipment_request.query.filter_by(status_id=1).count()
-    equip_approved = Equipment_request.query.filter_by(status_id=2).count()
-    equip_rejected = Equipment_request.query.filter_by(status_id=3).count()
-
-    # 3. USER COUNTS
-    student_count = Student.query.count()
-    lecturer_count = Lecturer.query.count()
-    organizer_count = Organizer.query.count()
-
-    stats = {
-        # Card Totals
-        'pending_bookings': venue_pending + equip_pending,
-        'total_users': student_count + lecturer_count + organizer_count,
-        'upcoming_events': Event.query.filter(Event.start_datetime > datetime.now(), Event.event_status == 'Upcoming').count(),
-
-        # Chart 1: User Demographics
-        'chart_users': {
-            'Students': student_count,
-            'Lecturers': lecturer_count,
-            'Organizers': organizer_count
-        },
-
-        # Chart 2: Venue vs Equipment (Split Data)
-        'chart_venue': [venue_approved, venue_pending, venue_rejected],
-        'chart_equip': [equip_approved, equip_pending, equip_rejected]
-    }
+    # Statistics (two grouped queries when cold, served from cache when warm)
+    stats = get_admin_stats()
 
     return render_template("admin/admin_dashboard.html", admin=current_user, stats=stats)
 
@@ -71,10 +54,14 @@ def admin_home():
 @login_required
 def process_requests():
     # Fetch Pending Venue Bookings (Status ID 1 = Pending)
-    venue_requests = Booking.query.filter_by(status_id=1).order_by(Booking.booking_date.asc()).all()
+    venue_requests = Booking.query.filter_by(status_id=1)\
+                                  .options(*eager(joinedload(Booking.event), joinedload(Booking.room)))\
+                                  .order_by(Booking.booking_date.asc()).all()
     
     # Fetch Pending Equipment Requests (Status ID 1 = Pending)
-    equipment_requests = Equipment_request.query.filter_by(status_id=1).all()
+    equipment_requests = Equipment_request.query.filter_by(status_id=1)\
+                                                .options(*eager(joinedload(Equipment_request.event),
+                                                                joinedload(Equipment_request.equipment))).all()
     
     return render_template('admin/process_requests.html', 
                            venue_requests=venue_requests, 
@@ -116,6 +103,9 @@ def booking_action(booking_id, action):
         flash(f'Venue booking for {booking.room.room_name} rejected.', 'danger')
     
     db.session.commit()
+    room_index.add_booking(booking)
+    invalidate_admin_stats()
+    invalidate_listings()
     return redirect(url_for('admin_view.process_requests'))
 
 
@@ -134,32 +124,157 @@ def equipment_action(req_id, action):
 
     # 2. Handle Approval
     if action == 'approve':
-        # CHECK: Is there enough stock?
-        if equipment_item.total_stock >= req.quantity:
-            # A. Deduct Stock
-            equipment_item.total_stock -= req.quantity
-            
-            # B. Update Status to Approved (ID 2 = Approved)
+        if req.status_id == 2:
+            flash('This request has already been approved.', 'info')
+            return redirect(url_for('admin_view.process_requests'))
+
+        # CHECK: Are enough units free during the event? (total_stock is not touched)
+        reserved, available = reserve(req)
+        if reserved:
+            # Update Status to Approved (ID 2 = Approved)
             req.status_id = 2 
             
-            flash(f'Request approved. {req.quantity} {equipment_item.item_name}(s) deducted from stock.', 'success')
+            flash(f'Request approved. {req.quantity} {equipment_item.item_name}(s) reserved for the event.', 'success')
         else:
-            # Not enough stock
-            flash(f'Cannot approve: Insufficient stock. Only {equipment_item.total_stock} left.', 'danger')
+            # Not enough stock for that time window
+            db.session.rollback()
+            flash(f'Cannot approve: Insufficient stock. Only {available} available during this event.', 'danger')
             return redirect(url_for('admin_view.process_requests'))
 
     # 3. Handle Rejection
     elif action == 'reject':
-        # If we are rejecting a request that was PREVIOUSLY approved, we must return the stock
+        # If we are rejecting a request that was PREVIOUSLY approved, its units go back
         if req.status_id == 2: # 2 = Approved
-             equipment_item.total_stock += req.quantity
+            release(req)
 
         req.status_id = 3 # 3 = Rejected
         flash('Equipment request rejected.', 'warning')
 
     db.session.commit()
+    invalidate_admin_stats()
     return redirect(url_for('admin_view.process_requests'))
 
+# ========================================================
+# 3b. BULK APPROVE/REJECT (Venue & Equipment)
+# ========================================================
+# Form fields (or JSON keys): action = 'approve' | 'reject',
+# booking_ids = [...], equipment_ids = [...]
+# JSON callers get the per-item results back; the form gets flash messages.
+@admin_view.route('/process-requests/bulk', methods=['POST'])
+@login_required
+def bulk_request_action():
+    if not isinstance(current_user, Admin):
+        return redirect(url_for('auth.login'))
+
+    if request.is_json:
+        data = request.get_json(silent=True) or {}
+        action = data.get('action')
+        raw_booking_ids = data.get('booking_ids') or []
+        raw_equipment_ids = data.get('equipment_ids') or []
+        # A string would otherwise be read one character (= one ID) at a time
+        if not isinstance(raw_booking_ids, list) or not isinstance(raw_equipment_ids, list):
+            return jsonify({'error': 'booking_ids and equipment_ids must be lists of integers.'}), 400
+    else:
+        action = request.form.get('action')
+        raw_booking_ids = request.form.getlist('booking_ids')
+        raw_equipment_ids = request.form.getlist('equipment_ids')
+
+    try:
+        booking_ids = [int(i) for i in raw_booking_ids]
+        equipment_ids = [int(i) for i in raw_equipment_ids]
+    except (TypeError, ValueError):
+        booking_ids = equipment_ids = None
+
+    if action not in ('approve', 'reject') or booking_ids is None:
+        if request.is_json:
+            return jsonify({'error': "action must be 'approve' or 'reject' and IDs must be integers."}), 400
+        flash('Invalid bulk action.', 'danger')
+        return redirect(url_for('admin_view.process_requests'))
+
+    results = process_bulk(action, booking_ids, equipment_ids, current_user.admin_id)
+    succeeded = sum(1 for r in results if r['ok'])
+
+    if request.is_json:
+        return jsonify({'action': action, 'succeeded': succeeded,
+                        'failed': len(results) - succeeded, 'results': results})
+
+    if not results:
+        flash('No requests selected.', 'info')
+    else:
+        verb = 'approved' if action == 'approve' else 'rejected'
+        flash(f'{succeeded} of {len(results)} selected request(s) {verb}.',
+              'success' if succeeded == len(results) else 'warning')
+        flash_bulk_failures(results)
+    return redirect(url_for('admin_view.process_requests'))
+
+
+def flash_bulk_failures(results, shown=5):
+    # One flash for all failures: the session cookie cannot hold hundreds
+    failed = [r for r in results if not r['ok']]
+    if not failed:
+        return
+    details = '; '.join(f"{'Booking' if r['type'] == 'booking' else 'Equipment request'} #{r['id']}: {r['message'].rstrip('.')}"
+                        for r in failed[:shown])
+    more = f' (and {len(failed) - shown} more)' if len(failed) > shown else ''
+    flash(f'{len(failed)} not done. {details}{more}.', 'danger')
+
+
+# ========================================================
+# 3c. ROOM ASSIGNMENT OPTIMIZER (Pending Venue Bookings)
+# ========================================================
+# Proposes a room for every pending booking in the period
+# (?start=YYYY-MM-DD&end=YYYY-MM-DD, end exclusive; default: the next 30 days).
+# Nothing changes until the admin applies the proposal.
+@admin_view.route('/process-requests/optimize')
+@login_required
+def optimize_rooms():
+    if not isinstance(current_user, Admin):
+        return redirect(url_for('auth.login'))
+
+    start, end = default_assignment_window()
+    try:
+        if request.args.get('start'):
+            start = datetime.strptime(request.args['start'], '%Y-%m-%d')
+        if request.args.get('end'):
+            end = datetime.strptime(request.args['end'], '%Y-%m-%d')
+    except ValueError:
+        flash('Dates must be in YYYY-MM-DD format.', 'danger')
+        return redirect(url_for('admin_view.optimize_rooms'))
+    if end <= start:
+        flash('The end date must be after the start date.', 'danger')
+        return redirect(url_for('admin_view.optimize_rooms'))
+
+    proposal = propose_assignment(start, end)
+    return render_template('admin/room_assignment.html', proposal=proposal)
+
+
+# Approves the ticked bookings in the rooms from the proposal, in one transaction
+@admin_view.route('/process-requests/optimize/apply', methods=['POST'])
+@login_required
+def apply_room_assignment():
+    if not isinstance(current_user, Admin):
+        return redirect(url_for('auth.login'))
+
+    try:
+        booking_ids = [int(i) for i in request.form.getlist('booking_ids')]
+        room_overrides = {i: int(request.form[f'room_{i}']) for i in booking_ids}
+    except (KeyError, TypeError, ValueError):
+        flash('Invalid room assignment.', 'danger')
+        return redirect(url_for('admin_view.optimize_rooms'))
+
+    results = process_bulk('approve', booking_ids, [], current_user.admin_id, room_overrides,
+                           limit=MAX_ASSIGNMENT_ITEMS)
+    succeeded = sum(1 for r in results if r['ok'])
+
+    if not results:
+        flash('No bookings selected.', 'info')
+    else:
+        flash(f'{succeeded} of {len(results)} booking(s) approved with the proposed rooms.',
+              'success' if succeeded == len(results) else 'warning')
+        flash_bulk_failures(results)
+    return redirect(url_for('admin_view.process_requests'))
+
+
 # ========================================================
 # 4. MANAGE USER ACCOUNTS
 # ========================================================
@@ -212,8 +327,11 @@ def delete_user(type, id):
             flash('Cannot delete user. They have published (Upcoming) events. Please remove the events first.', 'danger')
         else:
             try:
+                remove_identity(type, user)
                 db.session.delete(user)
                 db.session.commit()
+                invalidate_principal(user)
+                invalidate_admin_stats()
                 flash('User account deleted successfully.', 'success')
             except Exception as e:
                 db.session.rollback()
@@ -244,12 +362,8 @@ def create_user():
 
     try:
         # --- CHECK IF EMAIL ALREADY EXISTS ---
-        # We check all 3 tables to ensure email uniqueness across the system
-        email_exists = (
-            Student.query.filter_by(student_email=email).first() or
-            Organizer.query.filter_by(organizer_email=email).first() or
-            Lecturer.query.filter_by(lecturer_email=email).first()
-        )
+        # One lookup in the identity index covers every account type
+        email_exists = find_identity(email or '')
 
         if email_exists:
             flash(f'Error: The email "{email}" is already in use by another account.', 'danger')
@@ -299,9 +413,11 @@ def create_user():
             flash('Invalid user type selected.', 'danger')
             return redirect(url_for('admin_view.manage_users'))
 
-        # 3. Save to Database
+        # 3. Save to Database (and register the email in the identity index)
         db.session.add(new_user)
+        add_identity(user_type, user_id, email)
         db.session.commit()
+        invalidate_admin_stats()
         flash(f'New {user_type.capitalize()} account ({name}) created successfully.', 'success')
 
     except Exception as e:
@@ -329,6 +445,7 @@ def manage_rooms():
             elif room:
                 db.session.delete(room)
                 db.session.commit()
+                room_index.remove_room(room.room_id)
                 flash('Space deleted successfully.', 'success')
             return redirect(url_for('admin_view.manage_rooms'))
 
@@ -348,6 +465,7 @@ def manage_rooms():
             )
             db.session.add(new_room)
             db.session.commit()
+            room_index.refresh_room(new_room)
             flash('Space added successfully.', 'success')
 
         # 4. Handle EDIT
@@ -360,6 +478,7 @@ def manage_rooms():
                 room.location = location
                 room.room_type = room_type
                 db.session.commit()
+                room_index.refresh_room(room)
                 flash('Space updated successfully.', 'success')
 
         return redirect(url_for('admin_view.manage_rooms'))
@@ -410,6 +529,7 @@ def manage_announcements():
             )
             db.session.add(new_announcement)
             db.session.commit()
+            bump_announcement_version()
             flash('Announcement sent successfully.', 'success')
             
         return redirect(url_for('admin_view.manage_announcements'))
@@ -427,40 +547,83 @@ def manage_announcements():
 def monitor_events():
     return render_template("admin/monitor_events.html")
 
+# Calendar colours by event status (anything else uses the default blue)
+CALENDAR_COLORS = {
+    'Upcoming': '#1cc88a',   # Green
+    'Expired': '#858796',    # Gray
+    'Cancelled': '#e74a3b',  # Red
+}
+
+def parse_calendar_date(value):
+    # FullCalendar sends ISO strings such as '2026-03-01T00:00:00+08:00'.
+    # Event times are stored as naive local datetimes, so drop the offset.
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+
 @admin_view.route('/api/calendar-events')
 @login_required
 def get_calendar_events():
+    # 1. Visible range sent by the calendar widget (?start=...&end=...)
+    try:
+        range_start = parse_calendar_date(request.args.get('start'))
+        range_end = parse_calendar_date(request.args.get('end'))
+    except ValueError:
+        return jsonify({'error': 'Invalid start/end date.'}), 400
+
     # Filter: Show everything EXCEPT 'Pending' (matching your original logic)
-    events = Event.query.filter(Event.event_status != 'Pending').all()
-    
-    events_list = []
-    for e in events:
-        # Define color based on Status
-        color = '#4e73df' # Default Blue
-        if e.event_status == 'Upcoming':
-            color = '#1cc88a' # Green
-        elif e.event_status == 'Expired':
-            color = '#858796' # Gray
-        elif e.event_status == 'Cancelled':
-            color = '#e74a3b' # Red
-
-        events_list.append({
-            'id': e.event_id,
-            'title': e.title,
-            'start': e.start_datetime.isoformat(), # ISO format is required for JS
-            'end': e.end_datetime.isoformat(),
-            # Generate the URL for the event details page
-            'url': url_for('admin_view.view_event', event_id=e.event_id), 
-            'backgroundColor': color,
-            'borderColor': color,
-            # Add extra data for tooltips
-            'extendedProps': {
-                'venue': e.venue_location or 'TBD',
-                'status': e.event_status
+    query = db.session.query(Event).filter(Event.event_status != 'Pending')
+    if range_start:
+        query = query.filter(Event.end_datetime > range_start)
+    if range_end:
+        query = query.filter(Event.start_datetime < range_end)
+
+    # 2. Cheap fingerprint of the window -> ETag / Last-Modified
+    # An unchanged month is answered with 304 without loading any rows
+    total, last_updated, max_id = query.with_entities(
+        func.count(Event.event_id), func.max(Event.updated_at), func.max(Event.event_id)
+    ).one()
+    fingerprint = f'{range_start}|{range_end}|{total}|{last_updated}|{max_id}'
+    etag = hashlib.md5(fingerprint.encode()).hexdigest()
+
+    # 3. Only the columns the calendar needs
+    rows = query.with_entities(
+        Event.event_id, Event.title, Event.start_datetime, Event.end_datetime,
+        Event.event_status, Event.venue_location
+    ).order_by(Event.start_datetime.asc())
+
+    # Build the details URL once instead of calling url_for per row
+    url_prefix, url_suffix = url_for('admin_view.view_event', event_id=0).rsplit('/0/', 1)
+
+    def generate():
+        yield '['
+        for i, e in enumerate(rows.yield_per(500)):
+            color = CALENDAR_COLORS.get(e.event_status, '#4e73df') # Default Blue
+            item = {
+                'id': e.event_id,
+                'title': e.title,
+                'start': e.start_datetime.isoformat(), # ISO format is required for JS
+                'end': e.end_datetime.isoformat(),
+                'url': f'{url_prefix}/{e.event_id}/{url_suffix}',
+                'backgroundColor': color,
+                'borderColor': color,
+                # Add extra data for tooltips
+                'extendedProps': {
+                    'venue': e.venue_location or 'TBD',
+                    'status': e.event_status
+                }
             }
-        })
-    
-    return jsonify(events_list)
+            yield (',' if i else '') + json.dumps(item)
+        yield ']'
+
+    # 4. Stream the JSON array; browsers revalidate with If-None-Match
+    response = Response(stream_with_context(generate()), mimetype='application/json')
+    response.set_etag(etag)
+    if last_updated:
+        response.last_modified = last_updated
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 # ========================================================
@@ -472,8 +635,8 @@ def view_event(event_id):
     # 1. Fetch the specific event by ID
     event = Event.query.get_or_404(event_id)
     
-    # 2. Calculate confirmed participants (Optional, useful for Admin)
-    confirmed_count = Registration.query.filter_by(event_id=event_id, status='Confirmed').count()
+    # 2. Confirmed participants (kept up to date on Event by registrations.py)
+    confirmed_count = event.confirmed_count
     
     # 3. Calculate spots left
     # (Ensure capacity is not None to avoid errors)
@@ -584,7 +747,8 @@ def delete_event(event_id):
         # 1. Delete Related Venue Bookings
         Booking.query.filter_by(event_id=event_id).delete()
 
-        # 2. Delete Related Equipment Requests
+        # 2. Delete Related Equipment Requests (and their reservations)
+        release_event(event_id)
         Equipment_request.query.filter_by(event_id=event_id).delete()
 
         # 3. Delete Participant Registrations
@@ -593,6 +757,10 @@ def delete_event(event_id):
         # 4. Finally, Delete the Event itself
         db.session.delete(event)
         db.session.commit()
+        room_index.remove_event(event_id)
+        invalidate_admin_stats()
+        invalidate_listings()
+        invalidate_student_schedules()  # its registrations are gone
 
         flash(f'Event "{event_title}" and all associated records have been permanently deleted.', 'success')
     
@@ -601,3 +769,99 @@ def delete_event(event_id):
         flash(f'Error deleting event: {str(e)}', 'danger')
 
     return redirect(url_for('admin_view.monitor_events'))
+
+
+# ========================================================
+# 12. ROOM UTILIZATION REPORT
+# ========================================================
+@admin_view.route('/utilization')
+@login_required
+def room_utilization():
+    if not isinstance(current_user, Admin):
+        return redirect(url_for('auth.login'))
+
+    # 1. Reporting window (?start=YYYY-MM-DD&end=YYYY-MM-DD, end exclusive; default: last 12 months)
+    start, end = default_window()
+    try:
+        if request.args.get('start'):
+            start = datetime.strptime(request.args['start'], '%Y-%m-%d')
+        if request.args.get('end'):
+            end = datetime.strptime(request.args['end'], '%Y-%m-%d')
+    except ValueError:
+        flash('Dates must be in YYYY-MM-DD format.', 'danger')
+        return redirect(url_for('admin_view.room_utilization'))
+
+    # 2. Build the report (needs NumPy); the window is checked there
+    report = None
+    if utilization_available():
+        try:
+            report = utilization_report(start, end)
+        except ValueError as e:
+            flash(str(e), 'danger')
+            return redirect(url_for('admin_view.room_utilization'))
+    else:
+        flash('Utilization analytics need NumPy on the server (pip install numpy).', 'warning')
+
+    return render_template("admin/utilization.html", report=report, start=start, end=end,
+                           weekdays=WEEKDAYS, open_hour=OPEN_HOUR, close_hour=CLOSE_HOUR)
+
+
+# ========================================================
+# 13. REQUEST PROFILER (SQL_PROFILING=1)
+# ========================================================
+@admin_view.route('/debug/requests')
+@login_required
+def debug_requests():
+    if not isinstance(current_user, Admin):
+        return redirect(url_for('auth.login'))
+
+    # Worst routes first (?sort=db_ms|queries|duration|duplicates)
+    sort = request.args.get('sort', 'db_ms')
+    if sort not in ('db_ms', 'queries', 'duration', 'duplicates'):
+        sort = 'db_ms'
+
+    return render_template("admin/debug_requests.html", profiler=request_profiler, sort=sort,
+                           routes=request_profiler.top_routes(sort), slow=request_profiler.recent_slow(),
+                           duplicate_threshold=DUPLICATE_THRESHOLD)
+
+
+@admin_view.route('/debug/requests/reset', methods=['POST'])
+@login_required
+def reset_debug_requests():
+    if not isinstance(current_user, Admin):
+        return redirect(url_for('auth.login'))
+
+    request_profiler.reset()
+    flash('Request statistics cleared.', 'success')
+    return redirect(url_for('admin_view.debug_requests'))
+
+
+# ========================================================
+# 14. ROOM INDEX CHECK (this worker's live index vs the Booking table)
+# ========================================================
+@admin_view.route('/debug/room-index')
+@login_required
+def debug_room_index():
+    if not isinstance(current_user, Admin):
+        return redirect(url_for('auth.login'))
+
+    # Checks the index this process is serving from, without reloading it
+    problems = room_index.verify()
+    return jsonify({
+        'enabled': room_index.enabled,
+        'loaded': room_index.is_loaded(),
+        'consistent': not problems,
+        'problems': problems,
+    })
+
+
+@admin_view.route('/debug/room-index/reload', methods=['POST'])
+@login_required
+def reload_room_index():
+    if not isinstance(current_user, Admin):
+        return redirect(url_for('auth.login'))
+
+    if not room_index.enabled:
+        return jsonify({'error': 'The room index is off (ROOM_INDEX=0).'}), 400
+    room_index.load()
+    return jsonify({'reloaded': True})
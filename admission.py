@@ -0,0 +1,135 @@
+import queue
+import threading
+from sqlalchemy.exc import IntegrityError
+from models import db, Registration
+from registrations import reserve_seat
+
+# Outcomes returned by AdmissionQueue.submit
+CONFIRMED = 'Confirmed'
+WAITLISTED = 'Waitlisted'
+DUPLICATE = 'Duplicate'
+BUSY = 'Busy'
+
+
+class _Ticket:
+    __slots__ = ('student_id', 'event_id', 'done', 'outcome')
+
+    def __init__(self, student_id, event_id):
+        self.student_id = student_id
+        self.event_id = event_id
+        self.done = threading.Event()
+        self.outcome = BUSY
+
+
+# ========================================================
+# ADMISSION QUEUE (high-demand events)
+# ========================================================
+# Sign-ups for events marked high_demand are not written by the request
+# thread. They are queued and a single worker thread per process drains the
+# queue in batches, one transaction per batch:
+#   - duplicates are checked with one query for the whole batch
+#   - each sign-up takes a seat with reserve_seat(); once the event is full
+#     it gets a 'Waitlisted' registration instead
+# The request thread waits for its own outcome (up to REGISTRATION_WAIT seconds).
+class AdmissionQueue:
+    def __init__(self, batch_size=50, max_pending=5000, wait_timeout=10):
+        self.batch_size = batch_size
+        self.wait_timeout = wait_timeout
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._app = None
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def init_app(self, app):
+        app.extensions['admission_queue'] = self
+        self._app = app
+        self.batch_size = app.config.get('REGISTRATION_BATCH_SIZE', self.batch_size)
+        self.wait_timeout = app.config.get('REGISTRATION_WAIT', self.wait_timeout)
+
+    def submit(self, student_id, event_id):
+        ticket = _Ticket(student_id, event_id)
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(ticket)
+        except queue.Full:
+            return BUSY
+        # If this times out the ticket is still processed; the caller should
+        # point the student at My Registrations
+        ticket.done.wait(self.wait_timeout)
+        return ticket.outcome
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='admission-queue', daemon=True)
+                self._worker.start()
+
+    # ----------------------------------------------------
+    # Worker
+    # ----------------------------------------------------
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            with self._app.app_context():
+                self._process_batch(batch)
+
+    def _process_batch(self, batch):
+        try:
+            try:
+                outcomes = self._admit(batch)
+                db.session.commit()
+            except Exception as e:
+                # One bad sign-up must not fail the rest: retry them one by one
+                db.session.rollback()
+                self._app.logger.warning(f'Admission batch of {len(batch)} failed, retrying singly: {e}')
+                outcomes = []
+                for ticket in batch:
+                    try:
+                        outcomes.extend(self._admit([ticket]))
+                        db.session.commit()
+                    except IntegrityError:
+                        # uq_registration_student_event: registered by another process
+                        db.session.rollback()
+                        outcomes.append(DUPLICATE)
+                    except Exception as e:
+                        db.session.rollback()
+                        self._app.logger.error(f'Admission of {ticket.student_id} to event {ticket.event_id} failed: {e}')
+                        outcomes.append(BUSY)
+        finally:
+            db.session.remove()
+
+        for ticket, outcome in zip(batch, outcomes):
+            ticket.outcome = outcome
+            ticket.done.set()
+
+    def _admit(self, tickets):
+        # Existing registrations for everyone in the batch, in one query
+        existing = set(
+            db.session.query(Registration.student_id, Registration.event_id)
+            .filter(Registration.event_id.in_({t.event_id for t in tickets}),
+                    Registration.student_id.in_({t.student_id for t in tickets}))
+            .all()
+        )
+
+        outcomes = []
+        for ticket in tickets:
+            key = (ticket.student_id, ticket.event_id)
+            if key in existing:
+                outcomes.append(DUPLICATE)
+                continue
+            existing.add(key)
+
+            status = CONFIRMED if reserve_seat(ticket.event_id) else WAITLISTED
+            db.session.add(Registration(student_id=ticket.student_id, event_id=ticket.event_id, status=status))
+            outcomes.append(status)
+        return outcomes
+
+
+admission_queue = AdmissionQueue()
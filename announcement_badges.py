@@ -0,0 +1,64 @@
+import threading
+import time
+from sqlalchemy import func
+from cache import TTLCache
+from models import db, Announcements
+
+# The announcement version is the highest announcement ID in the database, so
+# every worker process (and every server) sees the same version: sending an
+# announcement is what bumps it. Each process re-reads it at most once every
+# VERSION_CHECK_SECONDS, so a new announcement reaches every badge within
+# that time. The TTL is only a backstop for rows changed outside the app.
+VERSION_CHECK_SECONDS = 2
+_version = None
+_checked_at = float('-inf')
+_version_lock = threading.Lock()
+
+# audience ('All', 'Student', 'LE04', ...) -> (version, [(sent_at, announcement_id), ...])
+audience_cache = TTLCache(maxsize=4096, ttl=300)
+
+
+# ========================================================
+# ANNOUNCEMENT BADGE IDS (used by the context processors)
+# ========================================================
+def get_announcement_ids(role_audience, user_id):
+    # IDs of announcements for 'All', the user's role and the user, newest first
+    entries = []
+    for audience in ('All', role_audience, user_id):
+        entries.extend(_audience_entries(audience))
+    entries.sort(key=lambda entry: (entry[0] is not None, entry[0]), reverse=True)
+    return [announcement_id for _, announcement_id in entries]
+
+
+def announcement_version():
+    # MAX(announcement_id): one primary-key lookup, at most every VERSION_CHECK_SECONDS
+    global _version, _checked_at
+    now = time.monotonic()
+    if _version is None or now - _checked_at >= VERSION_CHECK_SECONDS:
+        version = db.session.query(func.max(Announcements.announcement_id)).scalar() or 0
+        with _version_lock:
+            _version, _checked_at = version, now
+    return _version
+
+
+def bump_announcement_version():
+    # Called after sending: this process re-reads the version on its next render
+    global _checked_at
+    with _version_lock:
+        _checked_at = float('-inf')
+
+
+def _audience_entries(audience):
+    version = announcement_version()
+    cached = audience_cache.get(audience)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    # Only the two columns the badge needs
+    entries = [
+        (row.sent_at, row.announcement_id)
+        for row in db.session.query(Announcements.sent_at, Announcements.announcement_id)
+                             .filter(Announcements.target_audience == audience)
+    ]
+    audience_cache.set(audience, (version, entries))
+    return entries
@@ -0,0 +1,167 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from flask import url_for as flask_url_for, send_file, request, abort
+from werkzeug.security import safe_join
+
+# brotli is optional: without it only .gz variants are built
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+HASH_LENGTH = 12
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+# Text assets worth precompressing (images are already compressed)
+COMPRESSIBLE = {'.css', '.js', '.svg', '.json', '.txt', '.html'}
+
+# css/home.<hash>.css -> (css/home, <hash>, .css)
+_HASHED_NAME = re.compile(r'^(.+)\.([0-9a-f]{%d})(\.[^./]+)$' % HASH_LENGTH)
+
+
+# ========================================================
+# FINGERPRINTED STATIC ASSETS
+# ========================================================
+# url_for('static', filename='css/home.css') in templates returns
+# /assets/css/home.<hash>.css, where <hash> comes from the file's content.
+# Those URLs are served with a one-year immutable Cache-Control, so a browser
+# never asks for them again; editing the file changes its URL instead.
+#
+# The manifest (filename -> hash) is filled on first use and re-hashed when a
+# file's size or mtime changes, so uploads and edits need no build step.
+# If a .br / .gz file sits next to the asset (flask build-assets writes them)
+# it is sent to browsers that accept that encoding.
+class AssetManifest:
+    def __init__(self):
+        self.static_folder = None
+        self._entries = {}  # filename -> ((mtime_ns, size), hash)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.extensions['assets'] = self
+        self.static_folder = app.static_folder
+        app.add_url_rule('/assets/<path:filename>', 'asset', self.serve)
+        # Templates keep calling url_for('static', ...) and get the hashed URL
+        app.jinja_env.globals['url_for'] = self.url_for
+
+        @app.cli.command('build-assets')
+        def build_assets_command():
+            """Fingerprint every static file and write .gz/.br copies of text assets."""
+            count = 0
+            for filename in self.walk():
+                print(f'{filename} -> {self.hashed_name(filename)}')
+                if os.path.splitext(filename)[1] in COMPRESSIBLE:
+                    count += self.precompress(filename)
+            print(f'{count} precompressed file(s) written.'
+                  + ('' if brotli else ' Install brotli for .br variants.'))
+
+    # ----------------------------------------------------
+    # Manifest
+    # ----------------------------------------------------
+    def walk(self):
+        # Every servable static file, relative to the static folder
+        for root, dirs, files in os.walk(self.static_folder):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))  # e.g. images/.incoming
+            for name in sorted(files):
+                # Skips precompressed copies and extensionless placeholders (static/temp)
+                if name.endswith(('.gz', '.br')) or name.startswith('.') or not os.path.splitext(name)[1]:
+                    continue
+                yield os.path.relpath(os.path.join(root, name), self.static_folder).replace(os.sep, '/')
+
+    def file_hash(self, filename):
+        # Content hash of a static file, or None if it does not exist
+        path = safe_join(self.static_folder, filename)
+        try:
+            stat = os.stat(path)
+        except (TypeError, OSError):
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(filename)
+        if entry and entry[0] == key:
+            return entry[1]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        file_hash = digest.hexdigest()[:HASH_LENGTH]
+        with self._lock:
+            self._entries[filename] = (key, file_hash)
+        return file_hash
+
+    def hashed_name(self, filename):
+        file_hash = self.file_hash(filename)
+        if file_hash is None:
+            return None
+        stem, ext = os.path.splitext(filename)
+        return f'{stem}.{file_hash}{ext}'
+
+    def asset_url(self, filename):
+        hashed = self.hashed_name(filename)
+        if hashed is None:
+            return flask_url_for('static', filename=filename)  # missing file: let it 404 as before
+        return flask_url_for('asset', filename=hashed)
+
+    def url_for(self, endpoint, **values):
+        if endpoint == 'static' and set(values) == {'filename'}:
+            return self.asset_url(values['filename'])
+        return flask_url_for(endpoint, **values)
+
+    # ----------------------------------------------------
+    # Precompression (flask build-assets)
+    # ----------------------------------------------------
+    def precompress(self, filename):
+        path = safe_join(self.static_folder, filename)
+        with open(path, 'rb') as f:
+            data = f.read()
+        written = 0
+        variants = [('.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', lambda d: brotli.compress(d, quality=11)))
+        for suffix, compress in variants:
+            compressed = compress(data)
+            if len(compressed) < len(data):
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed)
+                written += 1
+        return written
+
+    # ----------------------------------------------------
+    # Serving /assets/<name>.<hash>.<ext>
+    # ----------------------------------------------------
+    def serve(self, filename):
+        match = _HASHED_NAME.match(filename)
+        if not match:
+            abort(404)
+        original = match.group(1) + match.group(3)
+        current_hash = self.file_hash(original)
+        if current_hash is None:
+            abort(404)
+
+        path = safe_join(self.static_folder, original)
+        mimetype = mimetypes.guess_type(original)[0] or 'application/octet-stream'
+        encoding = None
+        accepted = request.accept_encodings
+        for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if accepted[name] and os.path.exists(path + suffix) \
+                    and os.path.getmtime(path + suffix) >= os.path.getmtime(path):
+                path, encoding = path + suffix, name
+                break
+
+        response = send_file(path, mimetype=mimetype, conditional=True)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        if match.group(2) == current_hash:
+            response.headers['Cache-Control'] = IMMUTABLE
+        else:
+            # An old URL (the file changed since): serve the current file, but do not pin it
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+asset_manifest = AssetManifest()
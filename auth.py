@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, flash, redirect, url_for,
 from models import Student, Admin, Organizer, Lecturer, db
 from flask_login import login_user, login_required, logout_user, current_user
 from markupsafe import Markup # Required for adding links in Flash messages
+from principals import invalidate_principal, find_identity, find_user_by_email
 
 auth = Blueprint('auth', __name__)
 
@@ -16,42 +17,14 @@ def login():
         email = request.form.get('email', '').strip().lower()
         password = request.form.get('password', '')
 
-        user_found = None
-        user_type = None
-        target_route = 'student_view.home'
-
-        # --- 1. LOCATE USER BY EMAIL ---
-        
-        # Check Student
-        student = Student.query.filter_by(student_email=email).first()
-        if student:
-            user_found = student
-            user_type = 'student'
-            target_route = 'student_view.home'
-            
-        # Check Organizer
-        if not user_found:
-            organizer = Organizer.query.filter_by(organizer_email=email).first()
-            if organizer:
-                user_found = organizer
-                user_type = 'organizer'
-                target_route = 'organizer_view.dashboard'
-
-        # Check Lecturer
-        if not user_found:
-            lecturer = Lecturer.query.filter_by(lecturer_email=email).first()
-            if lecturer:
-                user_found = lecturer
-                user_type = 'lecturer'
-                target_route = 'lecturer_view.dashboard'
-
-        # Check Admin
-        if not user_found:
-            admin = Admin.query.filter_by(admin_email=email).first()
-            if admin:
-                user_found = admin
-                user_type = 'admin'
-                target_route = 'admin_view.admin_home'
+        # --- 1. LOCATE USER BY EMAIL (one lookup in the identity index) ---
+        user_found, user_type = find_user_by_email(email)
+        target_route = {
+            'student': 'student_view.home',
+            'organizer': 'organizer_view.dashboard',
+            'lecturer': 'lecturer_view.dashboard',
+            'admin': 'admin_view.admin_home',
+        }.get(user_type, 'student_view.home')
 
         # --- 2. VALIDATE USER ---
         if user_found:
@@ -81,15 +54,8 @@ def forgot_password():
         # 1. Get email directly from the form
         email = request.form.get('email', '').strip().lower()
         
-        # 2. Check Database (Manual Check)
-        user = (
-            Student.query.filter_by(student_email=email).first() or
-            Organizer.query.filter_by(organizer_email=email).first() or
-            Lecturer.query.filter_by(lecturer_email=email).first() or
-            Admin.query.filter_by(admin_email=email).first()
-        )
-
-        if user:
+        # 2. Check Database (identity index)
+        if find_identity(email):
             # 3. Store email in session (CRITICAL for next step)
             session['reset_email'] = email
             flash('Email verified. Please set your new password.', 'success')
@@ -118,22 +84,17 @@ def reset_password():
             email = session['reset_email']
             
             # 3. Find user again to update
-            student = Student.query.filter_by(student_email=email).first()
-            organizer = Organizer.query.filter_by(organizer_email=email).first()
-            lecturer = Lecturer.query.filter_by(lecturer_email=email).first()
-            admin = Admin.query.filter_by(admin_email=email).first()
+            user, user_type = find_user_by_email(email)
 
             try:
-                if student:
-                    student.student_password = new_pwd
-                elif organizer:
-                    organizer.organizer_password = new_pwd
-                elif lecturer:
-                    lecturer.lecturer_password = new_pwd
-                elif admin:
-                    admin.admin_password = new_pwd
+                if user:
+                    setattr(user, f"{user_type}_password", new_pwd)
                 
                 db.session.commit()
+
+                # Drop the cached copy so the new password is picked up everywhere
+                if user:
+                    invalidate_principal(user)
                 
                 # 4. Success: Clear session & Redirect
                 session.pop('reset_email', None)
@@ -0,0 +1,265 @@
+"""
+Latency and query-count benchmark for the hot routes.
+
+Drives the real app in-process through the Flask test client (no web server,
+no network) against a database filled by generate_campus_data.py, and
+reports p50/p95 latency and SQL statements per request for each route:
+
+    python generate_campus_data.py --database-uri sqlite:////tmp/campus.db
+    python benchmark.py --database-uri sqlite:////tmp/campus.db --output before.json
+    # ...change something...
+    python benchmark.py --database-uri sqlite:////tmp/campus.db --output after.json --compare before.json
+
+The JSON is stable (sorted keys, rounded numbers), so two runs can also be
+compared with a plain diff. The listing cache is on, as in production; pass
+--no-cache to measure the uncached queries. Venue bookings created by the
+book_venue route are deleted again at the end.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from models import db
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def pick_fixtures():
+    # Accounts and rows the routes are exercised with (the generator's, or any)
+    from models import Admin, Organizer, Student, Event, Registration
+    from sqlalchemy import func
+    now = datetime.now()
+
+    # The student with the most upcoming registrations: the busiest home page
+    student_id = db.session.query(Registration.student_id).join(Event, Event.event_id == Registration.event_id).filter(
+        Event.end_datetime >= now
+    ).group_by(Registration.student_id).order_by(func.count().desc()).limit(1).scalar() \
+        or db.session.query(Student.student_id).order_by(Student.student_id).limit(1).scalar()
+    event_id = db.session.query(Event.event_id).filter(
+        Event.event_status == 'Upcoming', Event.end_datetime >= now
+    ).order_by(Event.confirmed_count.desc()).limit(1).scalar()
+    pending = db.session.query(Event.event_id).filter(
+        Event.event_status == 'Pending', Event.organizer_id.isnot(None), Event.start_datetime >= now
+    ).order_by(Event.event_id).all()
+
+    return {
+        'student': f'student:{student_id}' if student_id else None,
+        'organizer': f"organizer:{db.session.query(Organizer.organizer_id).order_by(Organizer.organizer_id).limit(1).scalar()}",
+        'admin': f"admin:{db.session.query(Admin.admin_id).order_by(Admin.admin_id).limit(1).scalar()}",
+        'event_id': event_id,
+        'pending_events': [row.event_id for row in pending],
+    }
+
+
+def book_venue_requests(fixtures):
+    # One booking request per call, each for another pending event and a room
+    # that is free for it (so every call takes the full path, not the conflict one)
+    from models import Event
+    from room_index import room_index
+    pending = iter(fixtures['pending_events'])
+
+    def next_request():
+        for event_id in pending:
+            event = db.session.get(Event, event_id)
+            free = room_index.find_free_rooms(event.start_datetime, event.end_datetime, event.capacity or 0)
+            if free:
+                return f'/organizer/event/{event_id}/book-venue', {'room_id': free[0]['room_id']}
+        return None
+    return next_request
+
+
+def routes(fixtures):
+    # name -> (session user, method, path or callable returning (path, form))
+    month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    next_month = (month + timedelta(days=32)).replace(day=1)
+    table = {
+        'student.home': ('student', 'GET', '/student/home'),
+        'student.events': ('student', 'GET', '/student/events'),
+        'student.events.search': ('student', 'GET', '/student/events?search=Python'),
+        'student.events.past': ('student', 'GET', '/student/events?timeframe=past'),
+        'student.event_details': ('student', 'GET', f"/student/event/{fixtures['event_id']}"),
+        'organizer.book_venue': ('organizer', 'POST', book_venue_requests(fixtures)),
+        'admin.dashboard': ('admin', 'GET', '/admin/dashboard'),
+        'admin.process_requests': ('admin', 'GET', '/admin/process-requests'),
+        'admin.calendar_events': ('admin', 'GET', f'/admin/api/calendar-events?start={month.isoformat()}'
+                                                  f'&end={next_month.isoformat()}'),
+    }
+    if fixtures['event_id'] is None:
+        del table['student.event_details']
+    return table
+
+
+def run(app, iterations, warmup, only=None):
+    from sqlalchemy import event as sa_event
+    from models import Booking
+    from room_index import room_index
+
+    queries = [0]
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        queries[0] += 1
+
+    with app.app_context():
+        sa_event.listen(db.engine, 'before_cursor_execute', count_query)
+        fixtures = pick_fixtures()
+        last_booking = db.session.query(db.func.max(Booking.booking_id)).scalar() or 0
+        table = routes(fixtures)
+        db.session.remove()
+
+    results = {}
+    try:
+        for name, (role, method, target) in table.items():
+            if only and name not in only:
+                continue
+            client = app.test_client()
+            if fixtures[role] is None:
+                print(f'  {name:<26} skipped (no {role} account)')
+                continue
+            with client.session_transaction() as sess:
+                sess['_user_id'] = fixtures[role]
+                sess['_fresh'] = True
+
+            timings, counts, statuses = [], [], set()
+            for i in range(warmup + iterations):
+                if callable(target):
+                    with app.app_context():
+                        request_args = target()
+                        db.session.remove()
+                    if request_args is None:
+                        break
+                    path, form = request_args
+                else:
+                    path, form = target, None
+
+                queries[0] = 0
+                started = time.perf_counter()
+                response = client.open(path, method=method, data=form)
+                elapsed = (time.perf_counter() - started) * 1000
+                response.close()
+                statuses.add(response.status_code)
+                if i == 0:
+                    first = elapsed
+                if i >= warmup:
+                    timings.append(elapsed)
+                    counts.append(queries[0])
+
+            if not timings:
+                print(f'  {name:<26} skipped (nothing to request)')
+                continue
+            results[name] = {
+                'n': len(timings),
+                'first_ms': round(first, 2),
+                'p50_ms': round(percentile(timings, 50), 2),
+                'p95_ms': round(percentile(timings, 95), 2),
+                'mean_ms': round(statistics.mean(timings), 2),
+                'queries_median': int(statistics.median(counts)),
+                'queries_max': max(counts),
+                'status': sorted(statuses),
+            }
+            print(f"  {name:<26} p50 {results[name]['p50_ms']:>8.2f} ms  p95 {results[name]['p95_ms']:>8.2f} ms"
+                  f"  queries {results[name]['queries_median']:>3}  status {','.join(map(str, sorted(statuses)))}")
+    finally:
+        # Remove the venue requests made by book_venue
+        with app.app_context():
+            created = Booking.query.filter(Booking.booking_id > last_booking).all()
+            for booking in created:
+                room_index.remove_booking(booking.booking_id)
+                db.session.delete(booking)
+            db.session.commit()
+            sa_event.remove(db.engine, 'before_cursor_execute', count_query)
+    return results
+
+
+def table_counts(app):
+    from models import Student, Rooms, Event, Booking, Registration
+    with app.app_context():
+        return {model.__tablename__: model.query.count() for model in (Student, Rooms, Event, Booking, Registration)}
+
+
+def compare(old, new):
+    print(f"\nCompared with {old['meta'].get('commit')} ({old['meta'].get('generated_at')}):")
+    print(f"  {'route':<26} {'p50 ms':>20} {'p95 ms':>20} {'queries':>10}")
+    for name, now in new['routes'].items():
+        before = old['routes'].get(name)
+        if before is None:
+            print(f'  {name:<26} (new)')
+            continue
+
+        def delta(key):
+            change = (now[key] - before[key]) / before[key] * 100 if before[key] else 0
+            return f'{before[key]:.1f} -> {now[key]:.1f} ({change:+.0f}%)'
+        print(f"  {name:<26} {delta('p50_ms'):>20} {delta('p95_ms'):>20}"
+              f" {before['queries_median']:>4} -> {now['queries_median']:<3}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-uri', default=os.environ.get('DATABASE_URL'))
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--route', action='append', help='only run this route (repeatable)')
+    parser.add_argument('--no-cache', action='store_true', help='turn the listing page cache off')
+    parser.add_argument('--output', help='write the results as JSON')
+    parser.add_argument('--compare', help='JSON from an earlier run to compare with')
+    args = parser.parse_args()
+    if not args.database_uri:
+        parser.error('pass --database-uri or set DATABASE_URL')
+
+    # The app reads these at import time
+    os.environ['DATABASE_URL'] = args.database_uri
+    os.environ['SCHEDULER_ENABLED'] = '0'
+    if args.no_cache:
+        os.environ['LISTING_CACHE'] = 'none'
+
+    from app import app
+    app.config['WTF_CSRF_ENABLED'] = False
+
+    counts = table_counts(app)
+    with app.app_context():
+        dialect = db.engine.dialect.name
+    print(f"Benchmarking against {counts} ({args.iterations} iterations, {args.warmup} warm-up)")
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'dialect': dialect,
+            'rows': counts,
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+            'listing_cache': app.config.get('LISTING_CACHE'),
+        },
+        'routes': run(app, args.iterations, args.warmup, args.route),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'Wrote {args.output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+    if any(status >= 500 for route in results['routes'].values() for status in route['status']):
+        print('Some requests failed with a server error.')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
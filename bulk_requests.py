@@ -0,0 +1,239 @@
+from types import SimpleNamespace
+from flask import current_app
+from sqlalchemy.orm import selectinload
+from models import db, Booking, Equipment_request, Equipments, Rooms
+from room_index import room_index
+from equipment_ledger import reservations_by_item, free_units, add_reservation
+from dashboard_stats import invalidate_admin_stats
+from listing_cache import invalidate_listings
+
+# Request status IDs: 1=Pending, 2=Approved, 3=Rejected
+PENDING, APPROVED, REJECTED = 1, 2, 3
+
+# Upper bound on IDs per bulk call, per request type
+MAX_BULK_ITEMS = 1000
+# ... and when applying an optimizer proposal, which covers a whole period
+MAX_ASSIGNMENT_ITEMS = 10000
+
+
+def _result(kind, item_id, ok, message):
+    return {'type': kind, 'id': item_id, 'ok': ok, 'message': message}
+
+
+# ========================================================
+# BULK APPROVE / REJECT (admin request queue)
+# ========================================================
+# Handles many venue bookings and equipment requests in one transaction:
+#   1. lock the affected Rooms/Equipments rows, then the requests themselves
+#      (always in ID order, so two admins cannot deadlock each other)
+#   2. load every approved booking / reservation that could clash, in one
+#      query per request type
+#   3. re-validate and apply each item, counting the ones approved earlier
+#      in the same batch
+#   4. commit once
+# room_overrides ({booking_id: room_id}, approve only) checks bookings against
+# the rooms proposed by the assignment optimizer; a booking only moves to its
+# proposed room if it is approved there.
+# Returns one result dict per requested ID; IDs past `limit` (per request
+# type) are not processed and get a failed result saying so.
+def process_bulk(action, booking_ids, equipment_ids, admin_id, room_overrides=None, limit=MAX_BULK_ITEMS):
+    booking_ids, extra_bookings = _split(booking_ids, limit)
+    equipment_ids, extra_equipment = _split(equipment_ids, limit)
+    over_limit = f'Not processed: a batch holds at most {limit} requests of each type.'
+    skipped = ([_result('booking', i, False, over_limit) for i in extra_bookings] +
+               [_result('equipment', i, False, over_limit) for i in extra_equipment])
+
+    try:
+        results, changed_bookings = _apply(action, booking_ids, equipment_ids, admin_id, room_overrides or {})
+        # Snapshot before commit expires the objects (avoids one reload per booking)
+        changed_bookings = [SimpleNamespace(
+            booking_id=b.booking_id, room_id=b.room_id, event_id=b.event_id, status_id=b.status_id,
+            req_start_datetime=b.req_start_datetime, req_end_datetime=b.req_end_datetime
+        ) for b in changed_bookings]
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception(f'Bulk {action} of {len(booking_ids)} booking(s) and '
+                                     f'{len(equipment_ids)} equipment request(s) failed')
+        message = 'Not processed: the batch could not be saved, nothing was changed.'
+        return ([_result('booking', i, False, message) for i in booking_ids] +
+                [_result('equipment', i, False, message) for i in equipment_ids] + skipped)
+
+    for booking in changed_bookings:
+        room_index.add_booking(booking)
+    if changed_bookings:
+        invalidate_listings()  # venue shown on the event cards
+    if changed_bookings or any(r['ok'] for r in results):
+        invalidate_admin_stats()
+    return results + skipped
+
+
+def _split(ids, limit):
+    ids = sorted(set(ids))
+    return ids[:limit], ids[limit:]
+
+
+def _apply(action, booking_ids, equipment_ids, admin_id, room_overrides):
+    results = []
+    changed_bookings = []
+
+    # ----------------------------------------------------
+    # Venue bookings
+    # ----------------------------------------------------
+    bookings = {}
+    rooms = {}
+    if booking_ids:
+        room_ids = sorted({room_id for (room_id,) in db.session.query(Booking.room_id)
+                           .filter(Booking.booking_id.in_(booking_ids), Booking.room_id.isnot(None))}
+                          | set(room_overrides.values()))
+        if action == 'approve' and room_ids:
+            rooms = {room.room_id: room for room in
+                     Rooms.query.filter(Rooms.room_id.in_(room_ids)).order_by(Rooms.room_id).with_for_update().all()}
+
+        bookings = {b.booking_id: b for b in
+                    Booking.query.filter(Booking.booking_id.in_(booking_ids))
+                                 .options(selectinload(Booking.event), selectinload(Booking.room))
+                                 .order_by(Booking.booking_id).with_for_update().all()}
+
+    # Rooms proposed by the optimizer (re-checked: the proposal may be stale)
+    target_rooms = {}  # booking_id -> Rooms to check and approve it in
+    override_errors = {}
+    if action == 'approve':
+        for booking_id, room_id in room_overrides.items():
+            booking = bookings.get(booking_id)
+            if booking is None or booking.status_id != PENDING or booking.room_id == room_id:
+                continue
+            room = rooms.get(room_id)
+            needed = (booking.event.capacity or 0) if booking.event else 0
+            if room is None or room.is_active is False:
+                override_errors[booking_id] = 'The proposed room is no longer available.'
+            elif (room.capacity or 0) < needed:
+                override_errors[booking_id] = f'{room.room_name} holds fewer than {needed} people.'
+            else:
+                target_rooms[booking_id] = room
+
+    def target_room_id(booking):
+        room = target_rooms.get(booking.booking_id)
+        return room.room_id if room is not None else booking.room_id
+
+    approved_by_room = {}
+    pending = [b for b in bookings.values() if b.status_id == PENDING]
+    if action == 'approve' and pending:
+        windowed = [b for b in pending if b.req_start_datetime and b.req_end_datetime]
+        if windowed:
+            # Every approved booking in the batch's rooms and overall time span
+            rows = db.session.query(
+                Booking.room_id, Booking.req_start_datetime, Booking.req_end_datetime, Booking.booking_id
+            ).filter(
+                Booking.status_id == APPROVED,
+                Booking.room_id.in_({target_room_id(b) for b in windowed}),
+                Booking.req_start_datetime < max(b.req_end_datetime for b in windowed),
+                Booking.req_end_datetime > min(b.req_start_datetime for b in windowed)
+            ).all()
+            for row in rows:
+                approved_by_room.setdefault(row.room_id, []).append(
+                    (row.req_start_datetime, row.req_end_datetime, row.booking_id))
+
+    for booking_id in booking_ids:
+        booking = bookings.get(booking_id)
+        if booking is None:
+            results.append(_result('booking', booking_id, False, 'Booking not found.'))
+            continue
+        if booking.status_id != PENDING:
+            results.append(_result('booking', booking_id, False, 'Already processed.'))
+            continue
+        if booking_id in override_errors:
+            results.append(_result('booking', booking_id, False, override_errors[booking_id]))
+            continue
+
+        room = target_rooms.get(booking_id, booking.room)
+        room_name = room.room_name if room else 'the room'
+        if action == 'approve':
+            room_id = target_room_id(booking)
+            clash = None
+            if booking.req_start_datetime and booking.req_end_datetime:
+                clash = next((other_id for start, end, other_id in approved_by_room.get(room_id, ())
+                              if start < booking.req_end_datetime and end > booking.req_start_datetime), None)
+            if clash is not None:
+                results.append(_result('booking', booking_id, False,
+                                       f'{room_name} is already booked at that time (booking #{clash}).'))
+                continue
+
+            if booking_id in target_rooms:
+                booking.room_id = room.room_id
+                booking.room = room
+            booking.status_id = APPROVED
+            booking.approved_by_admin_id = admin_id
+            if booking.event:
+                booking.event.venue_location = room_name
+            approved_by_room.setdefault(room_id, []).append(
+                (booking.req_start_datetime, booking.req_end_datetime, booking_id))
+            results.append(_result('booking', booking_id, True, f'Approved: {room_name}.'))
+        else:
+            booking.status_id = REJECTED
+            booking.approved_by_admin_id = admin_id
+            if booking.event:
+                booking.event.venue_location = 'Not Booked'
+            results.append(_result('booking', booking_id, True, f'Rejected: {room_name}.'))
+        changed_bookings.append(booking)
+
+    # ----------------------------------------------------
+    # Equipment requests
+    # ----------------------------------------------------
+    requests = {}
+    items = {}
+    if equipment_ids:
+        item_ids = sorted({item_id for (item_id,) in db.session.query(Equipment_request.equipment_id)
+                           .filter(Equipment_request.request_id.in_(equipment_ids),
+                                   Equipment_request.equipment_id.isnot(None))})
+        if item_ids:
+            query = Equipments.query.filter(Equipments.equipment_id.in_(item_ids)).order_by(Equipments.equipment_id)
+            if action == 'approve':
+                query = query.with_for_update()
+            items = {item.equipment_id: item for item in query.all()}
+
+        requests = {r.request_id: r for r in
+                    Equipment_request.query.filter(Equipment_request.request_id.in_(equipment_ids))
+                                           .options(selectinload(Equipment_request.event))
+                                           .order_by(Equipment_request.request_id).with_for_update().all()}
+
+    reservations = {}
+    pending = [r for r in requests.values() if r.status_id == PENDING and r.event is not None]
+    if action == 'approve' and pending:
+        reservations = reservations_by_item(min(r.event.start_datetime for r in pending),
+                                            max(r.event.end_datetime for r in pending),
+                                            {r.equipment_id for r in pending})
+
+    for request_id in equipment_ids:
+        req = requests.get(request_id)
+        if req is None:
+            results.append(_result('equipment', request_id, False, 'Request not found.'))
+            continue
+        if req.status_id != PENDING:
+            results.append(_result('equipment', request_id, False, 'Already processed.'))
+            continue
+
+        item = items.get(req.equipment_id)
+        item_name = item.item_name if item else 'item'
+        if action == 'approve':
+            if item is None or req.event is None:
+                results.append(_result('equipment', request_id, False, 'Item or event no longer exists.'))
+                continue
+            item_reservations = reservations.setdefault(req.equipment_id, [])
+            available = free_units(item, item_reservations, req.event.start_datetime, req.event.end_datetime)
+            if req.quantity > available:
+                results.append(_result('equipment', request_id, False,
+                                       f'Insufficient stock: only {available} {item_name}(s) available during the event.'))
+                continue
+
+            req.status_id = APPROVED
+            req.approved_by_admin_id = admin_id
+            add_reservation(req)
+            item_reservations.append((req.event.start_datetime, req.event.end_datetime, req.quantity))
+            results.append(_result('equipment', request_id, True, f'Approved: {req.quantity} {item_name}(s).'))
+        else:
+            req.status_id = REJECTED
+            req.approved_by_admin_id = admin_id
+            results.append(_result('equipment', request_id, True, f'Rejected: {item_name}.'))
+
+    return results, changed_bookings
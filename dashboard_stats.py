@@ -0,0 +1,67 @@
+from datetime import datetime
+from sqlalchemy import func, literal, select, union_all
+from cache import TTLCache
+from models import db, Booking, Equipment_request, Student, Lecturer, Organizer, Event
+
+# Admin dashboard numbers, recomputed at most once a minute (or right after
+# an approval / account change clears the cache)
+stats_cache = TTLCache(maxsize=1, ttl=60)
+
+
+# ========================================================
+# ADMIN DASHBOARD STATISTICS
+# ========================================================
+def get_admin_stats():
+    stats = stats_cache.get('admin')
+    if stats is None:
+        stats = _compute_admin_stats()
+        stats_cache.set('admin', stats)
+    return stats
+
+
+def invalidate_admin_stats():
+    stats_cache.clear()
+
+
+def _compute_admin_stats():
+    # Query 1: request status breakdown for both request tables
+    # IDs: 1=Pending, 2=Approved, 3=Rejected
+    status_counts = union_all(
+        select(literal('venue').label('source'), Booking.status_id, func.count().label('total'))
+        .group_by(Booking.status_id),
+        select(literal('equip').label('source'), Equipment_request.status_id, func.count().label('total'))
+        .group_by(Equipment_request.status_id),
+    )
+    venue = {1: 0, 2: 0, 3: 0}
+    equip = {1: 0, 2: 0, 3: 0}
+    for source, status_id, total in db.session.execute(status_counts):
+        target = venue if source == 'venue' else equip
+        target[status_id] = total
+
+    # Query 2: user counts plus upcoming events, as one UNION
+    totals = union_all(
+        select(literal('students').label('name'), func.count().label('total')).select_from(Student),
+        select(literal('lecturers').label('name'), func.count().label('total')).select_from(Lecturer),
+        select(literal('organizers').label('name'), func.count().label('total')).select_from(Organizer),
+        select(literal('upcoming').label('name'), func.count().label('total')).select_from(Event)
+        .where(Event.start_datetime > datetime.now(), Event.event_status == 'Upcoming'),
+    )
+    counts = dict(db.session.execute(totals).all())
+
+    return {
+        # Card Totals
+        'pending_bookings': venue[1] + equip[1],
+        'total_users': counts['students'] + counts['lecturers'] + counts['organizers'],
+        'upcoming_events': counts['upcoming'],
+
+        # Chart 1: User Demographics
+        'chart_users': {
+            'Students': counts['students'],
+            'Lecturers': counts['lecturers'],
+            'Organizers': counts['organizers']
+        },
+
+        # Chart 2: Venue vs Equipment (Split Data)
+        'chart_venue': [venue[2], venue[1], venue[3]],
+        'chart_equip': [equip[2], equip[1], equip[3]]
+    }
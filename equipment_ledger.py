@@ -0,0 +1,131 @@
+from models import db, Equipments, EquipmentReservation, Equipment_request
+
+
+# ========================================================
+# EQUIPMENT RESERVATION LEDGER
+# ========================================================
+# Equipments.total_stock is the number of units owned and is never changed
+# by approvals. Each approved request adds an EquipmentReservation for its
+# event's [start, end) window, and the quantity free for a window is
+#   total_stock - (peak number of units reserved at any moment in the window)
+# The peak comes from a sweep over the overlapping reservations: +quantity
+# where one starts, -quantity where one ends, ends first on ties (half-open).
+
+def _peak_usage(reservations, start, end):
+    points = []
+    for res_start, res_end, quantity in reservations:
+        points.append((max(res_start, start), 1, quantity))
+        points.append((min(res_end, end), 0, -quantity))
+    points.sort()
+
+    peak = running = 0
+    for _, _, delta in points:
+        running += delta
+        if running > peak:
+            peak = running
+    return peak
+
+
+def reservations_by_item(start, end, equipment_ids=None):
+    # {equipment_id: [(start, end, quantity), ...]} for reservations overlapping
+    # [start, end), in start order. Uses ix_reservation_equipment_window.
+    query = db.session.query(
+        EquipmentReservation.equipment_id, EquipmentReservation.start_datetime,
+        EquipmentReservation.end_datetime, EquipmentReservation.quantity
+    ).filter(
+        EquipmentReservation.start_datetime < end,
+        EquipmentReservation.end_datetime > start
+    )
+    if equipment_ids is not None:
+        query = query.filter(EquipmentReservation.equipment_id.in_(equipment_ids))
+
+    by_item = {}
+    for row in query.order_by(EquipmentReservation.start_datetime):
+        by_item.setdefault(row.equipment_id, []).append((row.start_datetime, row.end_datetime, row.quantity))
+    return by_item
+
+
+def free_units(item, reservations, start, end):
+    # Units of `item` free for the whole of [start, end), given its reservations
+    return max((item.total_stock or 0) - _peak_usage(reservations, start, end), 0)
+
+
+def available_quantity(item, start, end):
+    reservations = reservations_by_item(start, end, [item.equipment_id])
+    return free_units(item, reservations.get(item.equipment_id, ()), start, end)
+
+
+def available_quantities(items, start, end):
+    # {equipment_id: units free for [start, end)} for every item, in one query
+    by_item = reservations_by_item(start, end)
+    return {item.equipment_id: free_units(item, by_item.get(item.equipment_id, ()), start, end)
+            for item in items}
+
+
+# ========================================================
+# LEDGER UPDATES (caller commits)
+# ========================================================
+def reserve(req):
+    # Returns (reserved, available). The Equipments row is locked first so
+    # two admins approving the same item at once cannot both take the last units.
+    event = req.event
+    item = db.session.query(Equipments).filter_by(equipment_id=req.equipment_id).with_for_update().one()
+    available = available_quantity(item, event.start_datetime, event.end_datetime)
+    if req.quantity > available:
+        return False, available
+
+    add_reservation(req)
+    return True, available
+
+
+def add_reservation(req):
+    # No availability check: callers validate first (see reserve)
+    db.session.add(EquipmentReservation(
+        request_id=req.request_id,
+        equipment_id=req.equipment_id,
+        event_id=req.event_id,
+        quantity=req.quantity,
+        start_datetime=req.event.start_datetime,
+        end_datetime=req.event.end_datetime
+    ))
+
+
+def reschedule_event(event_id, start, end):
+    # The event moved to [start, end): its reservations move with it. A request
+    # whose units are not free in the new window goes back to Pending (status 1)
+    # for the admin to decide again. Returns those requests.
+    reservations = EquipmentReservation.query.filter_by(event_id=event_id).order_by(
+        EquipmentReservation.equipment_id, EquipmentReservation.request_id).all()
+    if not reservations:
+        return []
+
+    # Lock the items (as reserve does), then re-check without the old windows
+    items = {item.equipment_id: item for item in db.session.query(Equipments).filter(
+        Equipments.equipment_id.in_({res.equipment_id for res in reservations})
+    ).order_by(Equipments.equipment_id).with_for_update()}
+    for res in reservations:
+        db.session.delete(res)
+    db.session.flush()
+
+    bumped = []
+    for res in reservations:
+        if res.quantity <= available_quantity(items[res.equipment_id], start, end):
+            db.session.add(EquipmentReservation(
+                request_id=res.request_id, equipment_id=res.equipment_id, event_id=event_id,
+                quantity=res.quantity, start_datetime=start, end_datetime=end))
+            db.session.flush()
+        else:
+            req = db.session.get(Equipment_request, res.request_id)
+            req.status_id = 1
+            req.approved_by_admin_id = None
+            bumped.append(req)
+    return bumped
+
+
+def release(req):
+    EquipmentReservation.query.filter_by(request_id=req.request_id).delete()
+
+
+def release_event(event_id):
+    # Call before deleting an event's Equipment_request rows
+    EquipmentReservation.query.filter_by(event_id=event_id).delete()
@@ -0,0 +1,140 @@
+"""
+EXPLAIN every hot query from the views and fail if one needs a full table scan.
+
+Run it after `flask db-upgrade`, against the real schema:
+
+    python explain_hot_queries.py --database-uri mysql+mysqldb://user:pw@localhost/event_space_management
+
+(or set DATABASE_URL). Exit status is 1 if any query falls back to a full scan
+or cannot run against the current schema.
+
+MySQL: a plan row with access type ALL and no usable key fails. ALL with a
+usable key is only a warning: on small tables the optimizer prefers a scan
+even though the index is there.
+SQLite: a plain "SCAN <table>" step (no index) fails.
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import func, select, text
+from models import db, Event, Booking, Registration, Announcements, Feedback, EquipmentReservation, EventRatingRollup
+
+
+def hot_queries():
+    now = datetime.now()
+    later = now + timedelta(days=30)
+    return [
+        ('student events: upcoming page',
+         select(Event).where(Event.end_datetime >= now, Event.event_status == 'Upcoming')
+                      .order_by(Event.start_datetime, Event.event_id).limit(7)),
+        ('student home: next upcoming',
+         select(Event).where(Event.start_datetime >= now, Event.event_status == 'Upcoming')
+                      .order_by(Event.start_datetime).limit(3)),
+        ('scheduler: expire-events',
+         select(Event.event_id).where(Event.event_status == 'Upcoming', Event.end_datetime < now)),
+        ('organizer: my events page',
+         select(Event).where(Event.organizer_id == 'OR01')
+                      .order_by(Event.start_datetime.desc(), Event.event_id.desc()).limit(7)),
+        ('lecturer: my events page',
+         select(Event).where(Event.lecturer_id == 'LE01')
+                      .order_by(Event.start_datetime.desc(), Event.event_id.desc()).limit(7)),
+        ('admin: calendar window',
+         select(Event.event_id, Event.title).where(Event.start_datetime < later, Event.end_datetime > now)),
+        ('bulk approval: room conflicts',
+         select(Booking.booking_id).where(Booking.room_id.in_([1, 2]), Booking.status_id == 2,
+                                          Booking.req_start_datetime < later, Booking.req_end_datetime > now)),
+        ('registration: duplicate check',
+         select(Registration.registration_id).where(Registration.student_id == 'S1', Registration.event_id == 1)),
+        ('registration: confirmed recount',
+         select(func.count()).select_from(Registration)
+                             .where(Registration.event_id == 1, Registration.status == 'Confirmed')),
+        ('registration: waitlist head',
+         select(Registration.registration_id).where(Registration.event_id == 1, Registration.status == 'Waitlisted')
+                                             .order_by(Registration.registration_id).limit(1)),
+        ('announcements: badge audience',
+         select(Announcements.sent_at, Announcements.announcement_id).where(Announcements.target_audience == 'Student')),
+        ('announcements: inbox',
+         select(Announcements).where(Announcements.target_audience.in_(['All', 'Student', 'S1']))
+                              .order_by(Announcements.sent_at.desc())),
+        ('feedback: host page',
+         select(Feedback).join(Event, Event.event_id == Feedback.event_id)
+                         .where(Event.organizer_id == 'OR01').order_by(Feedback.submitted_at.desc())),
+        ('feedback: per-event rollups',
+         select(EventRatingRollup).join(Event, Event.event_id == EventRatingRollup.event_id)
+                                  .where(Event.organizer_id == 'OR01')),
+        ('schedule: organizer clashes',
+         select(Event.event_id).where(Event.organizer_id == 'OR01', Event.end_datetime > now,
+                                      Event.start_datetime < later)),
+        ('schedule: lecturer clashes',
+         select(Event.event_id).where(Event.lecturer_id == 'LE01', Event.end_datetime > now,
+                                      Event.start_datetime < later)),
+        ('schedule: student registrations',
+         select(Event.start_datetime, Event.end_datetime, Event.event_id)
+         .join(Registration, Registration.event_id == Event.event_id)
+         .where(Registration.student_id == 'S1', Registration.status.in_(['Confirmed', 'Waitlisted']),
+                Event.end_datetime > now)),
+        ('equipment: reservations in window',
+         select(EquipmentReservation.quantity).where(EquipmentReservation.equipment_id == 1,
+                                                     EquipmentReservation.start_datetime < later,
+                                                     EquipmentReservation.end_datetime > now)),
+    ]
+
+
+def explain(conn, statement):
+    # Returns (status, [plan lines]) where status is 'ok', 'warn' or 'FULL SCAN'
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={'literal_binds': True}))
+
+    if conn.dialect.name == 'mysql':
+        rows = conn.execute(text('EXPLAIN ' + sql)).mappings().all()
+        status, lines = 'ok', []
+        for row in rows:
+            lines.append(f"{row['table']}: type={row['type']} key={row['key']} possible={row['possible_keys']} rows={row['rows']}")
+            if row['type'] == 'ALL':
+                status = 'warn' if row['possible_keys'] and status == 'ok' else 'FULL SCAN'
+        return status, lines
+
+    # SQLite (and the in-memory test setups)
+    rows = conn.execute(text('EXPLAIN QUERY PLAN ' + sql)).all()
+    lines = [row[-1] for row in rows]
+    full_scan = any(line.startswith('SCAN ') and ' INDEX ' not in f'{line} ' for line in lines)
+    return ('FULL SCAN' if full_scan else 'ok'), lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-uri', default=os.environ.get('DATABASE_URL'))
+    parser.add_argument('--verbose', '-v', action='store_true', help='print the plan of every query')
+    args = parser.parse_args()
+    if not args.database_uri:
+        parser.error('pass --database-uri or set DATABASE_URL')
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = args.database_uri
+    db.init_app(app)
+
+    failures = 0
+    with app.app_context(), db.engine.connect() as conn:
+        for name, statement in hot_queries():
+            try:
+                status, lines = explain(conn, statement)
+            except Exception as e:
+                # Usually a column or table that a pending migration adds
+                conn.rollback()
+                status, lines = 'ERROR', [str(getattr(e, 'orig', e))]
+            print(f'[{status:^9}] {name}')
+            if args.verbose or status != 'ok':
+                for line in lines:
+                    print(f'              {line}')
+            if status in ('FULL SCAN', 'ERROR'):
+                failures += 1
+
+    if failures:
+        print(f'{failures} hot query(ies) failed or need a full table scan. Run `flask db-upgrade`?')
+        sys.exit(1)
+    print('No hot query needs a full table scan.')
+
+
+if __name__ == '__main__':
+    main()
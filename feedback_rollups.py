@@ -0,0 +1,121 @@
+from sqlalchemy import update, insert, delete, select, func, case, or_, literal
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.exc import IntegrityError
+from models import db, Event, Feedback, EventRatingRollup, HostRatingRollup
+
+
+# ========================================================
+# FEEDBACK RATING ROLLUPS
+# ========================================================
+# EventRatingRollup / HostRatingRollup hold count, sum, a 1-5 histogram and
+# the latest submission time, so the feedback pages read averages from one
+# row per event instead of aggregating every Feedback row.
+#
+# record_feedback() runs in the same transaction as the Feedback insert: the
+# counters are bumped with a single UPDATE (col = col + 1), and the row is
+# created on the first rating. Two first ratings racing each other are
+# handled by retrying the UPDATE when the INSERT hits the primary key.
+
+def event_hosts(event):
+    # [(host_type, host_id)] the event's ratings count towards
+    hosts = []
+    if event.organizer_id:
+        hosts.append(('Organizer', event.organizer_id))
+    if event.lecturer_id:
+        hosts.append(('Lecturer', event.lecturer_id))
+    return hosts
+
+
+def _bump(model, keys, rating, submitted_at):
+    stars = f'stars_{rating}'
+    latest = case(
+        (or_(model.latest_at.is_(None), model.latest_at < submitted_at), submitted_at),
+        else_=model.latest_at
+    )
+    where = [getattr(model, column) == value for column, value in keys.items()]
+
+    while True:
+        updated = db.session.execute(
+            update(model).where(*where).values({
+                'rating_count': model.rating_count + 1,
+                'rating_sum': model.rating_sum + rating,
+                stars: getattr(model, stars) + 1,
+                'latest_at': latest,
+            }).execution_options(synchronize_session=False)
+        ).rowcount
+        if updated:
+            return
+
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(model).values(
+                    **keys, rating_count=1, rating_sum=rating, latest_at=submitted_at, **{stars: 1}))
+            return
+        except IntegrityError:
+            continue  # someone else created the row first; add to theirs
+
+
+def record_feedback(feedback, event):
+    # Call before committing the new Feedback row. rating must be 1-5.
+    rating = int(feedback.rating)
+    _bump(EventRatingRollup, {'event_id': event.event_id}, rating, feedback.submitted_at)
+    for host_type, host_id in event_hosts(event):
+        _bump(HostRatingRollup, {'host_type': host_type, 'host_id': host_id}, rating, feedback.submitted_at)
+
+
+def host_rollups(host_type, host_id):
+    # (HostRatingRollup or None, [EventRatingRollup with .event loaded], newest first)
+    host = db.session.get(HostRatingRollup, (host_type, host_id))
+    host_column = Event.organizer_id if host_type == 'Organizer' else Event.lecturer_id
+    events = EventRatingRollup.query.join(EventRatingRollup.event) \
+                                    .filter(host_column == host_id) \
+                                    .options(contains_eager(EventRatingRollup.event)) \
+                                    .order_by(EventRatingRollup.latest_at.desc()).all()
+    return host, events
+
+
+# ========================================================
+# REBUILD (flask rebuild-feedback-rollups)
+# ========================================================
+def _totals(*group_by):
+    return [
+        *group_by,
+        func.count(Feedback.feedback_id),
+        func.coalesce(func.sum(Feedback.rating), 0),
+        *[func.coalesce(func.sum(case((Feedback.rating == n, 1), else_=0)), 0) for n in range(1, 6)],
+        func.max(Feedback.submitted_at),
+    ]
+
+
+_COUNTERS = ['rating_count', 'rating_sum', 'stars_1', 'stars_2', 'stars_3', 'stars_4', 'stars_5', 'latest_at']
+
+
+def rebuild_rollups():
+    # Recompute both tables from Feedback (ratings outside 1-5 are ignored)
+    rated = Feedback.rating.between(1, 5)
+    db.session.execute(delete(HostRatingRollup))
+    db.session.execute(delete(EventRatingRollup))
+
+    db.session.execute(insert(EventRatingRollup).from_select(
+        ['event_id'] + _COUNTERS,
+        select(*_totals(Feedback.event_id)).where(rated, Feedback.event_id.isnot(None))
+                                           .group_by(Feedback.event_id)
+    ))
+    for host_type, host_column in (('Organizer', Event.organizer_id), ('Lecturer', Event.lecturer_id)):
+        db.session.execute(insert(HostRatingRollup).from_select(
+            ['host_type', 'host_id'] + _COUNTERS,
+            select(*_totals(literal(host_type), host_column))
+            .join(Event, Event.event_id == Feedback.event_id)
+            .where(rated, host_column.isnot(None))
+            .group_by(host_column)
+        ))
+    db.session.commit()
+    return db.session.query(func.count()).select_from(EventRatingRollup).scalar()
+
+
+def init_app(app):
+    @app.cli.command('rebuild-feedback-rollups')
+    def rebuild_feedback_rollups_command():
+        """Recompute the per-event and per-host rating rollups from Feedback."""
+        count = rebuild_rollups()
+        print(f'Rating rollups rebuilt for {count} event(s).')
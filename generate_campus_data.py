@@ -0,0 +1,242 @@
+"""
+Synthetic campus-scale data for benchmarks (see benchmark.py).
+
+Fills an EMPTY scratch database with seeded, realistic volumes: by default
+50k students, 2k rooms, 200k events, ~1M registrations and 1M venue
+bookings, spread over the last two years and the next one. The same --seed
+always produces the same rows.
+
+    python generate_campus_data.py --database-uri sqlite:////tmp/campus.db
+    python generate_campus_data.py --scale 0.05 --database-uri sqlite:////tmp/campus_small.db
+    python generate_campus_data.py --database-uri mysql+mysqldb://user:pw@localhost/campus_bench
+
+Every generated account uses the password 'bench'. Never point this at the
+live database.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from itertools import chain, islice
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import insert
+from models import (db, RequestStatus, Admin, Organizer, Lecturer, Student, UserIdentity, Category, Rooms,
+                    Equipments, Event, Booking, Registration, Announcements)
+import migrate
+
+FULL_SIZE = {
+    'students': 50000,
+    'organizers': 200,
+    'lecturers': 500,
+    'rooms': 2000,
+    'events': 200000,
+    'registrations': 1000000,
+    'bookings': 1000000,
+}
+
+PAST_DAYS, FUTURE_DAYS = 730, 365
+
+# (start hour, length in hours) of the teaching slots events are placed in
+SLOTS = [(8, 2), (10, 2), (13, 3), (16, 2), (19, 2)]
+
+ROOM_TYPES = [('Lecture Hall', (150, 250, 400)), ('Tutorial Room', (30, 40, 60)),
+              ('Lab', (30, 40)), ('Auditorium', (400, 800)), ('Seminar Room', (60, 100))]
+CATEGORIES = ['Academic', 'Workshop', 'Sports', 'Cultural', 'Career', 'Technology',
+              'Arts', 'Volunteering', 'Music', 'Gaming', 'Entrepreneurship', 'Wellness']
+TOPICS = ['Python', 'Data Science', 'Cybersecurity', 'Photography', 'Robotics', 'Public Speaking',
+          'Badminton', 'Chess', 'Film', 'Startup', 'Machine Learning', 'Web Design', 'Debate',
+          'Hackathon', 'Music Jam', 'Career Fair', 'Resume', 'Volleyball', 'Calligraphy', 'Cloud']
+FORMATS = ['Workshop', 'Bootcamp', 'Talk', 'Meetup', 'Tournament', 'Showcase', 'Seminar', 'Clinic']
+
+BATCH_SIZE = 10000
+PASSWORD = 'bench'
+
+
+def build_app(database_uri):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def bulk_insert(model, rows):
+    # Multi-row INSERTs in batches, one commit per batch. rows may be a
+    # generator, so the million-row tables are never held in memory at once.
+    started = time.perf_counter()
+    rows, total = iter(rows), 0
+    while True:
+        batch = list(islice(rows, BATCH_SIZE))
+        if not batch:
+            break
+        db.session.execute(insert(model), batch)
+        db.session.commit()
+        total += len(batch)
+    print(f'  {model.__tablename__:<15} {total:>9,} rows  {time.perf_counter() - started:6.1f}s')
+
+
+def generate(size, seed):
+    rng = random.Random(seed)
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    first_day = today - timedelta(days=PAST_DAYS)
+    now = datetime.now()
+
+    # 1. Lookups and people
+    if RequestStatus.query.count() == 0:
+        bulk_insert(RequestStatus, [{'status_id': 1, 'status_name': 'Pending'},
+                                    {'status_id': 2, 'status_name': 'Approved'},
+                                    {'status_id': 3, 'status_name': 'Rejected'}])
+
+    def people(prefix, role, count, width):
+        ids = [f'{prefix}{i:0{width}d}' for i in range(1, count + 1)]
+        rows = [{f'{role}_id': user_id, f'{role}_name': f'{role.title()} {user_id}',
+                 f'{role}_email': f'{user_id.lower()}@bench.mmu.edu.my', f'{role}_password': PASSWORD,
+                 f'{role}_phone': f'01{rng.randint(0, 9)}-{rng.randint(1000000, 9999999)}'} for user_id in ids]
+        return ids, rows
+
+    admin_ids, admins = people('BA', 'admin', 5, 2)
+    organizer_ids, organizers = people('BO', 'organizer', size['organizers'], 4)
+    lecturer_ids, lecturers = people('BL', 'lecturer', size['lecturers'], 4)
+    student_ids, students = people('BS', 'student', size['students'], 7)
+    bulk_insert(Admin, admins)
+    bulk_insert(Organizer, organizers)
+    bulk_insert(Lecturer, lecturers)
+    bulk_insert(Student, students)
+    bulk_insert(UserIdentity, [{'email': row[f'{role}_email'], 'role': role, 'user_id': row[f'{role}_id']}
+                               for role, rows in (('admin', admins), ('organizer', organizers),
+                                                  ('lecturer', lecturers), ('student', students))
+                               for row in rows])
+
+    # 2. Catalogue
+    bulk_insert(Category, [{'category_id': i, 'category_name': name, 'created_by_admin_id': admin_ids[0]}
+                           for i, name in enumerate(CATEGORIES, 1)])
+    rooms = []
+    for room_id in range(1, size['rooms'] + 1):
+        room_type, capacities = rng.choice(ROOM_TYPES)
+        rooms.append({'room_id': room_id, 'room_name': f'{room_type} {room_id}', 'capacity': rng.choice(capacities),
+                      'location': f'Block {chr(65 + room_id % 8)}, Level {room_id % 5 + 1}',
+                      'room_type': room_type, 'is_active': rng.random() > 0.03})
+    bulk_insert(Rooms, rooms)
+    bulk_insert(Equipments, [{'equipment_id': i, 'item_name': name, 'total_stock': rng.randint(5, 60)}
+                             for i, name in enumerate(['Projector', 'Microphone', 'Speaker', 'Laptop', 'Camera',
+                                                       'Extension Cord', 'Whiteboard', 'Table', 'Chair'], 1)])
+
+    # 3. Events, each in its own (room, day, slot) cell so approved bookings never overlap
+    days = PAST_DAYS + FUTURE_DAYS
+    per_event = size['registrations'] / max(1, size['events'])
+    cells = rng.sample(range(size['rooms'] * days * len(SLOTS)), size['events'])
+    events, bookings = [], []
+    for event_id, cell in enumerate(cells, 1):
+        room = rooms[cell % size['rooms']]
+        day, slot = divmod(cell // size['rooms'], len(SLOTS))
+        hour, length = SLOTS[slot]
+        start = first_day + timedelta(days=day, hours=hour)
+        end = start + timedelta(hours=length)
+
+        if end < now:
+            status = 'Expired'
+        else:
+            status = 'Pending' if rng.random() < 0.15 else 'Upcoming'
+        by_lecturer = rng.random() < 0.4
+        capacity = rng.randint(10, max(10, room['capacity'] or 10))
+        # Attendance: a few popular events, a long tail of small ones
+        attendees = 0 if status == 'Pending' else min(capacity, int(rng.expovariate(1 / per_event)), len(student_ids))
+
+        # Venue: most events got their room, some are still waiting, some were turned down
+        roll = rng.random()
+        if status == 'Pending' or (end > now and roll < 0.1):
+            booking_status = 1
+        elif roll < 0.85:
+            booking_status = 2
+        else:
+            booking_status = 3
+        host = {'req_lecturer_id': rng.choice(lecturer_ids)} if by_lecturer \
+            else {'req_organizer_id': rng.choice(organizer_ids)}
+
+        events.append({
+            'event_id': event_id,
+            'title': f'{rng.choice(TOPICS)} {rng.choice(FORMATS)} #{event_id}',
+            'description': f'A {rng.choice(FORMATS).lower()} on {rng.choice(TOPICS)} for all MMU students.',
+            'start_datetime': start, 'end_datetime': end,
+            'event_status': status,
+            'venue_location': {1: 'Pending Approval', 2: room['room_name'], 3: 'Not Booked'}[booking_status],
+            'capacity': capacity,
+            'confirmed_count': attendees,
+            'high_demand': rng.random() < 0.02,
+            'category_id': rng.randint(1, len(CATEGORIES)),
+            'organizer_id': None if by_lecturer else host['req_organizer_id'],
+            'lecturer_id': host['req_lecturer_id'] if by_lecturer else None,
+            'updated_at': start - timedelta(days=rng.randint(1, 30)),
+        })
+        bookings.append({
+            'booking_date': start - timedelta(days=rng.randint(3, 60)),
+            'req_start_datetime': start, 'req_end_datetime': end,
+            'status_id': booking_status, 'room_id': room['room_id'], 'event_id': event_id,
+            'approved_by_admin_id': rng.choice(admin_ids) if booking_status != 1 else None,
+            **host,
+        })
+
+    bulk_insert(Event, events)
+
+    # Earlier requests that were rejected (wrong room / clash) make up the rest of the bookings
+    def rejected_requests():
+        for _ in range(max(0, size['bookings'] - len(bookings))):
+            event = events[rng.randrange(len(events))]
+            yield {
+                'booking_date': event['start_datetime'] - timedelta(days=rng.randint(5, 90)),
+                'req_start_datetime': event['start_datetime'], 'req_end_datetime': event['end_datetime'],
+                'status_id': 3, 'room_id': rng.randint(1, size['rooms']), 'event_id': event['event_id'],
+                'approved_by_admin_id': rng.choice(admin_ids),
+                'req_organizer_id': event['organizer_id'], 'req_lecturer_id': event['lecturer_id'],
+            }
+    bulk_insert(Booking, chain(bookings, rejected_requests()))
+
+    # 4. Registrations, matching each event's confirmed_count
+    def registrations():
+        for event in events:
+            for student_id in rng.sample(student_ids, event['confirmed_count']):
+                yield {'student_id': student_id, 'event_id': event['event_id'], 'status': 'Confirmed',
+                       'registration_date': event['start_datetime'] - timedelta(hours=rng.randint(1, 720))}
+    bulk_insert(Registration, registrations())
+
+    # 5. A year of announcements
+    bulk_insert(Announcements, [{
+        'title': f'Notice {i}', 'message': 'Campus announcement.',
+        'sent_at': today - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 1440)),
+        'target_audience': rng.choice(['All', 'Student', 'Organizer', 'Lecturer']),
+        'admin_id': rng.choice(admin_ids),
+    } for i in range(1, 501)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-uri', default=os.environ.get('DATABASE_URL'))
+    parser.add_argument('--scale', type=float, default=1.0, help='fraction of the full campus size (default 1.0)')
+    parser.add_argument('--seed', type=int, default=42)
+    for name, value in FULL_SIZE.items():
+        parser.add_argument(f'--{name}', type=int, help=f'override the row count (full size: {value:,})')
+    args = parser.parse_args()
+    if not args.database_uri:
+        parser.error('pass --database-uri or set DATABASE_URL')
+
+    size = {name: getattr(args, name) or max(1, int(value * args.scale)) for name, value in FULL_SIZE.items()}
+
+    app = build_app(args.database_uri)
+    with app.app_context():
+        # Schema from the models, with every migration recorded as applied
+        db.create_all()
+        migrate.upgrade()
+        if Event.query.first() is not None:
+            print('The database already has events. Point --database-uri at an empty scratch database.')
+            sys.exit(1)
+
+        print(f"Generating (seed {args.seed}): " + ', '.join(f'{v:,} {k}' for k, v in size.items()))
+        started = time.perf_counter()
+        generate(size, args.seed)
+        print(f'Done in {time.perf_counter() - started:.1f}s.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from assets import asset_manifest
+
+# Pillow is optional: without it uploads are still stored and deduplicated,
+# and pages fall back to the original file
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+
+# Rendition name -> bounding box (the image is scaled down to fit, never up)
+RENDITIONS = {
+    'card': (640, 400),
+    'detail': (1280, 800),
+}
+
+CHUNK_SIZE = 64 * 1024
+
+# Partly written uploads/renditions (static/images/temp is a placeholder file)
+TEMP_DIR = '.incoming'
+
+
+# ========================================================
+# EVENT IMAGE PIPELINE
+# ========================================================
+# 1. ingest() streams the upload to a temp file while hashing it, then moves
+#    it to static/images/<sha256>.<ext>. A re-upload of the same picture hits
+#    the existing file, so it is stored once.
+# 2. The card/detail renditions (<hash>_card.webp + .jpg, <hash>_detail.webp
+#    + .jpg) are made on a small worker pool, off the request thread.
+# 3. Templates call event_image(filename, 'card'|'detail'), which returns the
+#    rendition URLs once they exist and the original until then.
+# Event.event_img keeps the original's filename, as before.
+class ImagePipeline:
+    def __init__(self, workers=2):
+        self.workers = workers
+        self.folder = None
+        self._pool = None
+        self._app = None
+        self._ready = set()  # rendition files known to exist
+        self._pending = set()  # uploads queued for renditions
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.extensions['image_pipeline'] = self
+        self._app = app
+        self.folder = app.config['UPLOAD_FOLDER']
+        self.workers = app.config.get('IMAGE_WORKERS', self.workers)
+        app.add_template_global(self.event_image, 'event_image')
+
+        @app.cli.command('build-image-renditions')
+        def build_image_renditions_command():
+            """Create missing card/detail renditions for every image in UPLOAD_FOLDER."""
+            if Image is None:
+                print('Pillow is not installed (pip install Pillow); nothing to do.')
+                return
+            count = 0
+            for filename in sorted(os.listdir(self.folder)):
+                stem, ext = os.path.splitext(filename)
+                if ext.lower() not in ALLOWED_EXTENSIONS or stem.endswith(tuple('_' + r for r in RENDITIONS)):
+                    continue
+                if not all(os.path.exists(self._path(stem, name, '.jpg')) for name in RENDITIONS):
+                    self._render(filename)
+                    count += 1
+            print(f'Renditions created for {count} image(s).')
+
+    # ----------------------------------------------------
+    # Upload (request thread)
+    # ----------------------------------------------------
+    def ingest(self, file):
+        # Returns the stored filename, or None for no file / unsupported type
+        if not file or not file.filename:
+            return None
+        ext = os.path.splitext(file.filename)[1].lower()
+        if ext not in ALLOWED_EXTENSIONS:
+            return None
+        ext = '.jpg' if ext == '.jpeg' else ext
+
+        temp_dir = os.path.join(self.folder, TEMP_DIR)
+        os.makedirs(temp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(dir=temp_dir, delete=False) as out:
+            temp_path = out.name
+            while True:
+                chunk = file.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+
+        stem = digest.hexdigest()[:32]
+        filename = stem + ext
+        final_path = os.path.join(self.folder, filename)
+        if os.path.exists(final_path):
+            os.remove(temp_path)  # same picture uploaded before
+        else:
+            os.replace(temp_path, final_path)
+
+        if Image is not None and not os.path.exists(self._path(stem, 'detail', '.jpg')):
+            self._submit(filename)
+        return filename
+
+    def _submit(self, filename):
+        with self._lock:
+            if filename in self._pending:
+                return  # the same picture is already being processed
+            self._pending.add(filename)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='image-pipeline')
+        self._pool.submit(self._render_logged, filename)
+
+    # ----------------------------------------------------
+    # Renditions (worker pool)
+    # ----------------------------------------------------
+    def _path(self, stem, rendition, ext):
+        return os.path.join(self.folder, f'{stem}_{rendition}{ext}')
+
+    def _render_logged(self, filename):
+        try:
+            self._render(filename)
+        except Exception as e:
+            self._app.logger.error(f'Image renditions for {filename} failed: {e}')
+        finally:
+            with self._lock:
+                self._pending.discard(filename)
+
+    def _render(self, filename):
+        stem = os.path.splitext(filename)[0]
+        with Image.open(os.path.join(self.folder, filename)) as original:
+            image = ImageOps.exif_transpose(original)
+            if image.mode in ('RGBA', 'LA', 'P'):
+                # Flatten transparency onto white for the JPEG fallback
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            else:
+                image = image.convert('RGB')
+
+            for rendition, box in RENDITIONS.items():
+                resized = image.copy()
+                resized.thumbnail(box, Image.LANCZOS)
+                # WebP first: the .jpg appearing is what marks the rendition ready
+                self._write(resized, self._path(stem, rendition, '.webp'), 'WEBP', quality=80, method=4)
+                self._write(resized, self._path(stem, rendition, '.jpg'), 'JPEG', quality=82,
+                            optimize=True, progressive=True)
+
+    def _write(self, image, path, fmt, **options):
+        # Write to a temp file and rename, so a page never serves half a file
+        temp_dir = os.path.join(self.folder, TEMP_DIR)
+        os.makedirs(temp_dir, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=temp_dir)
+        os.close(handle)
+        try:
+            image.save(temp_path, fmt, **options)
+            os.replace(temp_path, path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    # ----------------------------------------------------
+    # Template helper
+    # ----------------------------------------------------
+    def _exists(self, path):
+        if path in self._ready:
+            return True
+        if os.path.exists(path):
+            self._ready.add(path)
+            return True
+        return False
+
+    def event_image(self, filename, rendition='card'):
+        # {'src': fallback URL, 'webp': WebP URL or None}
+        if not filename:
+            return {'src': asset_manifest.asset_url('images/default.jpg'), 'webp': None}
+        stem = os.path.splitext(filename)[0]
+        if self._exists(self._path(stem, rendition, '.jpg')):
+            webp = self._path(stem, rendition, '.webp')
+            return {
+                'src': asset_manifest.asset_url(f'images/{stem}_{rendition}.jpg'),
+                'webp': asset_manifest.asset_url(f'images/{stem}_{rendition}.webp') if self._exists(webp) else None,
+            }
+        return {'src': asset_manifest.asset_url('images/' + filename), 'webp': None}
+
+
+image_pipeline = ImagePipeline()
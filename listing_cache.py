@@ -0,0 +1,144 @@
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+from markupsafe import Markup
+from cache import TTLCache
+
+
+# ========================================================
+# LISTING FRAGMENT CACHE (student home / events / club pages)
+# ========================================================
+# The event-card sections of the public listing pages are the same for every
+# viewer, so their rendered HTML is cached per (route, filter parameters).
+# The rest of the page (navbar, announcement badge, greeting) is still
+# rendered per request.
+#
+# Every entry carries the cache "generation" it was rendered under;
+# invalidate_listings() bumps the generation, which drops all of them at once.
+# Call it after any write that changes what an event card shows (create,
+# edit, publish, delete, venue changes). Entries also expire after
+# LISTING_CACHE_TTL seconds, because "upcoming" depends on the clock.
+#
+# Backends (LISTING_CACHE):
+#   'memory' - per-process LRU (default). Invalidation only reaches the
+#              process that made the change; other workers catch up at the TTL.
+#   'sqlite' - a local SQLite file (LISTING_CACHE_PATH) shared by every worker
+#              on the machine, so invalidation is seen by all of them.
+#   'none'   - disabled.
+
+class MemoryBackend:
+    def __init__(self, maxsize=512, ttl=60):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def generation(self):
+        return self._generation
+
+    def get(self, key):
+        item = self._cache.get(key)
+        if item is not None and item[0] == self._generation:
+            return item[1]
+        return None
+
+    def set(self, key, generation, value, ttl):
+        self._cache.set(key, (generation, value), ttl)
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+        self._cache.clear()
+
+
+class SQLiteBackend:
+    PRUNE_EVERY = 200  # sets between clean-ups of expired rows
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._sets = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute('CREATE TABLE IF NOT EXISTS fragments '
+                     '(key TEXT PRIMARY KEY, generation INTEGER, expires_at REAL, value TEXT)')
+        conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)')
+        conn.execute("INSERT OR IGNORE INTO meta VALUES ('generation', 0)")
+
+    def _conn(self):
+        # One connection per thread, in autocommit mode
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def generation(self):
+        row = self._conn().execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT f.value FROM fragments f JOIN meta m ON m.name = 'generation' AND m.value = f.generation "
+            "WHERE f.key = ? AND f.expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, generation, value, ttl):
+        conn = self._conn()
+        conn.execute('INSERT OR REPLACE INTO fragments VALUES (?, ?, ?, ?)',
+                     (key, generation, time.time() + ttl, value))
+        self._sets += 1
+        if self._sets % self.PRUNE_EVERY == 0:
+            conn.execute('DELETE FROM fragments WHERE expires_at <= ?', (time.time(),))
+
+    def invalidate(self):
+        conn = self._conn()
+        conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'generation'")
+        conn.execute("DELETE FROM fragments WHERE generation < (SELECT value FROM meta WHERE name = 'generation')")
+
+
+class ListingCache:
+    def __init__(self):
+        self.backend = MemoryBackend()
+        self.ttl = 60
+
+    def init_app(self, app):
+        app.extensions['listing_cache'] = self
+        self.ttl = app.config.get('LISTING_CACHE_TTL', self.ttl)
+        kind = app.config.get('LISTING_CACHE', 'memory')
+        if kind == 'sqlite':
+            path = app.config.get('LISTING_CACHE_PATH', os.path.join(app.instance_path, 'listing_cache.sqlite3'))
+            self.backend = SQLiteBackend(path)
+        elif kind == 'none':
+            self.backend = None
+        else:
+            self.backend = MemoryBackend(ttl=self.ttl)
+
+    def fragment(self, route, params, render):
+        # Cached HTML for (route, params); render() builds it on a miss
+        if self.backend is None:
+            return Markup(render())
+        key = route + '?' + urlencode(sorted((k, '' if v is None else v) for k, v in params.items()))
+        html = self.backend.get(key)
+        if html is None:
+            # Read the generation before rendering, so a write that lands
+            # while we render makes this entry stale rather than wrong
+            generation = self.backend.generation()
+            html = render()
+            self.backend.set(key, generation, html, self.ttl)
+        return Markup(html)
+
+    def invalidate(self):
+        if self.backend is not None:
+            self.backend.invalidate()
+
+
+listing_cache = ListingCache()
+
+
+def invalidate_listings():
+    listing_cache.invalidate()
@@ -0,0 +1,146 @@
+"""
+Load test for high-demand registration (admission queue + waitlist).
+
+Simulates a flash crowd: many students sign up for one event at the same
+moment, through admission_queue.submit() exactly as register_event does.
+It then cancels some confirmed registrations to exercise waitlist promotion,
+and checks that the event was never oversold.
+
+It creates its own tables and rows, so point it at a scratch database:
+
+    python load_test_registration.py
+    python load_test_registration.py --students 2000 --capacity 300 --threads 200
+    python load_test_registration.py --database-uri mysql+mysqldb://user:pw@localhost/scratch_db
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask
+from models import db, Event, Registration, Student
+from admission import admission_queue
+from registrations import promote_next_waitlisted, release_seat
+
+
+def build_app(database_uri):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    admission_queue.init_app(app)
+    return app
+
+
+def seed(students, capacity):
+    db.create_all()
+    event = Event(title='Load Test Event', capacity=capacity, event_status='Upcoming', high_demand=True)
+    db.session.add(event)
+    db.session.flush()
+
+    prefix = f'LT{event.event_id}-'
+    db.session.add_all(
+        Student(student_id=f'{prefix}{i}', student_name=f'Load Test {i}',
+                student_email=f'{prefix}{i}@loadtest.local', student_password='x')
+        for i in range(students)
+    )
+    db.session.commit()
+    return event.event_id, [f'{prefix}{i}' for i in range(students)]
+
+
+def sign_up(student_id, event_id):
+    started = time.perf_counter()
+    outcome = admission_queue.submit(student_id, event_id)
+    return outcome, time.perf_counter() - started
+
+
+def cancel(app, event_id, count):
+    # Same steps as student_view.cancel_registration
+    with app.app_context():
+        regs = Registration.query.filter_by(event_id=event_id, status='Confirmed') \
+                                 .order_by(Registration.registration_id).limit(count).all()
+        promoted = 0
+        for reg in regs:
+            db.session.delete(reg)
+            if promote_next_waitlisted(event_id) is None:
+                release_seat(event_id)
+            else:
+                promoted += 1
+            db.session.commit()
+        return len(regs), promoted
+
+
+def check(app, event_id, capacity):
+    with app.app_context():
+        event = db.session.get(Event, event_id)
+        db.session.refresh(event)
+        statuses = Counter(status for (status,) in
+                           db.session.query(Registration.status).filter_by(event_id=event_id))
+        duplicates = db.session.query(Registration.student_id).filter_by(event_id=event_id) \
+                               .group_by(Registration.student_id) \
+                               .having(db.func.count() > 1).count()
+    confirmed = statuses.get('Confirmed', 0)
+    problems = []
+    if confirmed > capacity:
+        problems.append(f'OVERSOLD: {confirmed} confirmed for a capacity of {capacity}')
+    if event.confirmed_count != confirmed:
+        problems.append(f'Counter drift: confirmed_count={event.confirmed_count}, rows={confirmed}')
+    if duplicates:
+        problems.append(f'{duplicates} student(s) registered more than once')
+    return statuses, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-uri', help='scratch database (default: a temporary SQLite file)')
+    parser.add_argument('--students', type=int, default=1000)
+    parser.add_argument('--capacity', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=100, help='concurrent request threads')
+    parser.add_argument('--retries', type=float, default=0.1, help='share of students who click Register twice')
+    parser.add_argument('--cancel', type=int, default=25, help='confirmed registrations to cancel afterwards')
+    args = parser.parse_args()
+
+    database_uri = args.database_uri
+    if not database_uri:
+        database_uri = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'load_test.db')
+    app = build_app(database_uri)
+
+    with app.app_context():
+        event_id, student_ids = seed(args.students, args.capacity)
+
+    requests = student_ids + student_ids[:int(len(student_ids) * args.retries)]
+    print(f'{len(requests)} sign-ups ({args.students} students) for capacity {args.capacity}, '
+          f'{args.threads} threads, batch size {admission_queue.batch_size}')
+
+    # 1. Flash crowd
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(lambda sid: sign_up(sid, event_id), requests))
+    elapsed = time.perf_counter() - started
+
+    outcomes = Counter(outcome for outcome, _ in results)
+    latencies = sorted(latency for _, latency in results)
+    print(f'Elapsed:    {elapsed:.2f}s ({len(requests) / elapsed:.0f} sign-ups/s)')
+    print(f'Latency:    p50 {latencies[len(latencies) // 2] * 1000:.0f}ms, '
+          f'p95 {latencies[int(len(latencies) * 0.95)] * 1000:.0f}ms, '
+          f'max {latencies[-1] * 1000:.0f}ms')
+    print(f'Outcomes:   {dict(outcomes)}')
+
+    # 2. Cancellations hand seats to the waitlist
+    cancelled, promoted = cancel(app, event_id, args.cancel)
+    print(f'Cancelled:  {cancelled}, promoted from waitlist: {promoted}')
+
+    # 3. Verify
+    statuses, problems = check(app, event_id, args.capacity)
+    print(f'Registrations: {dict(statuses)}')
+    if problems:
+        for problem in problems:
+            print(problem)
+        sys.exit(1)
+    print('OK: no oversell, counter matches the Registration table.')
+
+
+if __name__ == '__main__':
+    main()
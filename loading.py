@@ -0,0 +1,19 @@
+from flask import current_app
+from sqlalchemy.orm import raiseload
+
+
+# ========================================================
+# EAGER LOADING FOR LIST PAGES
+# ========================================================
+# List views pass the relationships their template uses, e.g.
+#   Booking.query.options(*eager(joinedload(Booking.room), joinedload(Booking.status)))
+# so each page runs a fixed number of queries however many rows it shows.
+#
+# With SQLALCHEMY_RAISELOAD on (debug), every other relationship of the
+# loaded rows is switched to raiseload: a template that starts using a
+# relationship nobody eager-loads fails with an error instead of quietly
+# adding one query per row.
+def eager(*options):
+    if current_app.config.get('SQLALCHEMY_RAISELOAD'):
+        return options + (raiseload('*'),)
+    return options
@@ -0,0 +1,142 @@
+import importlib.util
+import os
+import re
+from datetime import datetime
+from sqlalchemy import inspect, text, MetaData, Table, Column, String, DateTime
+from models import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+# Applied versions are recorded here (kept out of db.metadata on purpose)
+_meta = MetaData()
+schema_migrations = Table(
+    'schema_migrations', _meta,
+    Column('version', String(20), primary_key=True),
+    Column('description', String(200)),
+    Column('applied_at', DateTime),
+)
+
+
+# ========================================================
+# SCHEMA OPERATIONS (used by the files in migrations/)
+# ========================================================
+# Every operation checks the live schema first, so a migration can be run
+# against a database that already has some of its changes (e.g. one
+# imported from a newer Dump.sql).
+class Operations:
+    def __init__(self, connection):
+        self.conn = connection
+        self.dialect = connection.dialect.name
+        self.log = []
+
+    def quote(self, name):
+        return self.conn.dialect.identifier_preparer.quote(name)
+
+    def _inspector(self):
+        # A fresh inspector each time: earlier steps may have changed the schema
+        return inspect(self.conn)
+
+    def has_table(self, table):
+        return self._inspector().has_table(table)
+
+    def has_column(self, table, column):
+        return any(c['name'] == column for c in self._inspector().get_columns(table))
+
+    def has_index(self, table, name):
+        inspector = self._inspector()
+        names = {i['name'] for i in inspector.get_indexes(table)}
+        names |= {u['name'] for u in inspector.get_unique_constraints(table)}
+        return name in names
+
+    def execute(self, sql, **params):
+        return self.conn.execute(text(sql), params)
+
+    def create_table(self, model):
+        if self.has_table(model.__tablename__):
+            return False
+        model.__table__.create(self.conn)
+        self.log.append(f'created table {model.__tablename__}')
+        return True
+
+    def add_column(self, table, column, ddl):
+        # ddl: the column definition after the name, e.g. "INT NOT NULL DEFAULT 0"
+        if self.has_column(table, column):
+            return False
+        self.execute(f'ALTER TABLE {self.quote(table)} ADD COLUMN {self.quote(column)} {ddl}')
+        self.log.append(f'added column {table}.{column}')
+        return True
+
+    def create_index(self, table, name, columns, unique=False, fulltext=False):
+        if fulltext and self.dialect != 'mysql':
+            return False  # only MySQL has FULLTEXT; search.py has a fallback
+        if self.has_index(table, name):
+            return False
+        kind = 'UNIQUE ' if unique else 'FULLTEXT ' if fulltext else ''
+        cols = ', '.join(self.quote(c) for c in columns)
+        self.execute(f'CREATE {kind}INDEX {self.quote(name)} ON {self.quote(table)} ({cols})')
+        self.log.append(f'created index {name} on {table}')
+        return True
+
+
+# ========================================================
+# RUNNER
+# ========================================================
+def discover():
+    # [(version, description, module)] ordered by version; files are NNNN_name.py
+    found = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = re.match(r'^(\d{4})_(\w+)\.py$', filename)
+        if not match:
+            continue
+        spec = importlib.util.spec_from_file_location(f'migration_{match.group(1)}',
+                                                      os.path.join(MIGRATIONS_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        found.append((match.group(1), getattr(module, 'description', match.group(2)), module))
+    return found
+
+
+def applied_versions():
+    schema_migrations.create(db.engine, checkfirst=True)
+    with db.engine.connect() as conn:
+        return {row.version for row in conn.execute(schema_migrations.select())}
+
+
+def upgrade():
+    # Applies every pending migration in order; returns [(version, description, log)]
+    done = applied_versions()
+    results = []
+    for version, description, module in discover():
+        if version in done:
+            continue
+        with db.engine.begin() as conn:
+            op = Operations(conn)
+            module.upgrade(op)
+            conn.execute(schema_migrations.insert().values(
+                version=version, description=description, applied_at=datetime.now()))
+
+        # Data fix-ups that go through the ORM run after the schema commit
+        if hasattr(module, 'after_upgrade'):
+            module.after_upgrade()
+        results.append((version, description, op.log))
+    return results
+
+
+def init_app(app):
+    @app.cli.command('db-upgrade')
+    def db_upgrade_command():
+        """Apply pending schema migrations from migrations/."""
+        results = upgrade()
+        if not results:
+            print('Database schema is up to date.')
+        for version, description, log in results:
+            print(f'{version} {description}')
+            for line in log or ['(nothing to change)']:
+                print(f'    {line}')
+
+    @app.cli.command('db-status')
+    def db_status_command():
+        """List schema migrations and whether they have been applied."""
+        done = applied_versions()
+        for version, description, _ in discover():
+            print(f"[{'x' if version in done else ' '}] {version} {description}")
@@ -0,0 +1,60 @@
+# Brings databases created from the original Dump.sql up to the schema the
+# app now expects: the login email index, event change tracking, the
+# registration counter / waitlist, the equipment reservation ledger and the
+# listing + full-text indexes. A fresh import of the current Dump.sql
+# already has all of this, so every step is skipped there.
+from datetime import datetime
+from models import UserIdentity, EquipmentReservation
+
+description = 'Identity index, event counters, equipment ledger, listing and search indexes'
+
+
+def upgrade(op):
+    # 1. Email -> account index used at login (filled in after_upgrade)
+    op.create_table(UserIdentity)
+
+    # 2. Event columns
+    on_update = ' ON UPDATE CURRENT_TIMESTAMP' if op.dialect == 'mysql' else ''
+    if op.add_column('Event', 'updated_at', 'DATETIME NULL' + on_update):
+        op.execute('UPDATE Event SET updated_at = :now', now=datetime.now())
+    op.add_column('Event', 'confirmed_count', 'INT NOT NULL DEFAULT 0')
+    op.add_column('Event', 'high_demand', 'TINYINT(1) NOT NULL DEFAULT 0')
+
+    # 3. Event listing (keyset pagination) and search indexes
+    op.create_index('Event', 'ix_event_status_start', ['event_status', 'start_datetime', 'event_id'])
+    op.create_index('Event', 'ix_event_start', ['start_datetime', 'event_id'])
+    op.create_index('Event', 'ix_event_organizer_start', ['organizer_id', 'start_datetime', 'event_id'])
+    op.create_index('Event', 'ix_event_lecturer_start', ['lecturer_id', 'start_datetime', 'event_id'])
+    op.create_index('Event', 'ft_event_title_description', ['title', 'description'], fulltext=True)
+    op.create_index('Category', 'ft_category_name', ['category_name'], fulltext=True)
+
+    # 4. Waitlist head lookup
+    op.create_index('Registration', 'ix_registration_event_status', ['event_id', 'status', 'registration_id'])
+
+    # 5. Equipment reservation ledger. Approvals used to subtract from
+    #    total_stock for good, so give those units back and record them as
+    #    reservations for their event's time window instead.
+    if op.create_table(EquipmentReservation):
+        op.execute("""
+            INSERT INTO EquipmentReservation
+                (request_id, equipment_id, event_id, quantity, start_datetime, end_datetime)
+            SELECT r.request_id, r.equipment_id, r.event_id, r.quantity, e.start_datetime, e.end_datetime
+            FROM Equipment_request r
+            JOIN Event e ON e.event_id = r.event_id
+            WHERE r.status_id = 2 AND r.quantity IS NOT NULL
+              AND e.start_datetime IS NOT NULL AND e.end_datetime IS NOT NULL
+        """)
+        op.execute("""
+            UPDATE Equipments SET total_stock = COALESCE(total_stock, 0) + (
+                SELECT COALESCE(SUM(r.quantity), 0) FROM Equipment_request r
+                WHERE r.equipment_id = Equipments.equipment_id AND r.status_id = 2
+            )
+        """)
+
+
+def after_upgrade():
+    from principals import rebuild_identities
+    from registrations import reconcile_confirmed_counts
+    rebuild_identities()
+    reconcile_confirmed_counts()
+
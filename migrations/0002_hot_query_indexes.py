@@ -0,0 +1,41 @@
+# Composite indexes for the hot query shapes (check with explain_hot_queries.py).
+# Registration(event_id, status) is already served by the leading columns of
+# ix_registration_event_status from 0001, so it is not created twice.
+
+description = 'Composite indexes for listings, conflict checks, registrations, announcements and feedback'
+
+
+def upgrade(op):
+    # Listings and the expire-events job: status + end time, ordered by start
+    op.create_index('Event', 'ix_event_status_end_start', ['event_status', 'end_datetime', 'start_datetime'])
+
+    # Venue conflict checks: one room, by status, within a time window
+    op.create_index('Booking', 'ix_booking_room_status_window',
+                    ['room_id', 'status_id', 'req_start_datetime', 'req_end_datetime'])
+
+    # One registration per student per event. Remove any duplicates left by
+    # the old check-then-insert first (keeping the earliest row).
+    if not op.has_index('Registration', 'uq_registration_student_event'):
+        op.execute("""
+            DELETE FROM Registration WHERE registration_id IN (
+                SELECT registration_id FROM (
+                    SELECT r.registration_id FROM Registration r
+                    JOIN Registration earlier ON earlier.student_id = r.student_id
+                                             AND earlier.event_id = r.event_id
+                                             AND earlier.registration_id < r.registration_id
+                ) AS duplicates
+            )
+        """)
+        op.create_index('Registration', 'uq_registration_student_event', ['student_id', 'event_id'], unique=True)
+
+    # Announcement badges / inbox: one audience, newest first
+    op.create_index('Announcements', 'ix_announcements_audience_sent', ['target_audience', 'sent_at'])
+
+    # Feedback lists per event, newest first
+    op.create_index('Feedback', 'ix_feedback_event_submitted', ['event_id', 'submitted_at'])
+
+
+def after_upgrade():
+    # Duplicates removed above may have been counted as confirmed seats
+    from registrations import reconcile_confirmed_counts
+    reconcile_confirmed_counts()
@@ -0,0 +1,16 @@
+# Per-event and per-host rating rollups for the feedback pages
+# (feedback_rollups.py). Both tables are filled from the existing Feedback
+# rows after the schema commit.
+from models import EventRatingRollup, HostRatingRollup
+
+description = 'Feedback rating rollups per event and per host'
+
+
+def upgrade(op):
+    op.create_table(EventRatingRollup)
+    op.create_table(HostRatingRollup)
+
+
+def after_upgrade():
+    from feedback_rollups import rebuild_rollups
+    rebuild_rollups()
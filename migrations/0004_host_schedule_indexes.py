@@ -0,0 +1,10 @@
+# Indexes for the host double-booking warning (schedule_conflicts.py): one
+# host's events that end after a given time, so the overlap check never reads
+# the host's finished events.
+
+description = 'Host schedule indexes for double-booking checks'
+
+
+def upgrade(op):
+    op.create_index('Event', 'ix_event_organizer_end', ['organizer_id', 'end_datetime', 'start_datetime'])
+    op.create_index('Event', 'ix_event_lecturer_end', ['lecturer_id', 'end_datetime', 'start_datetime'])
@@ -34,7 +34,7 @@ class Admin(db.Model, UserMixin):
     announcements = db.relationship('Announcements', backref='author', lazy=True)
 
     def get_id(self):
-        return self.admin_id
+        return f'admin:{self.admin_id}'
 
 
 class Organizer(db.Model, UserMixin):
@@ -50,7 +50,7 @@ class Organizer(db.Model, UserMixin):
     bookings = db.relationship('Booking', backref='organizer_requester', lazy=True)
 
     def get_id(self):
-        return self.organizer_id
+        return f'organizer:{self.organizer_id}'
 
 
 class Lecturer(db.Model, UserMixin):
@@ -66,7 +66,7 @@ class Lecturer(db.Model, UserMixin):
     bookings = db.relationship('Booking', backref='lecturer_requester', lazy=True)
 
     def get_id(self):
-        return self.lecturer_id
+        return f'lecturer:{self.lecturer_id}'
 
 
 class Student(db.Model, UserMixin):
@@ -82,7 +82,18 @@ class Student(db.Model, UserMixin):
     feedbacks = db.relationship('Feedback', backref='student', lazy=True)
 
     def get_id(self):
-        return self.student_id
+        return f'student:{self.student_id}'
+
+
+# Single lookup table for every account's email (kept lowercase).
+# Maps an email to the role ('student', 'organizer', 'lecturer', 'admin')
+# and the primary key in that role's table, so login and email checks
+# need one indexed query instead of probing all four actor tables.
+class UserIdentity(db.Model):
+    __tablename__ = 'UserIdentity'
+    email = db.Column(db.String(100), primary_key=True)
+    role = db.Column(db.String(20), nullable=False)
+    user_id = db.Column(db.String(20), nullable=False)
 
 
 # ==========================================
@@ -104,13 +115,17 @@ class Equipments(db.Model):
     __tablename__ = 'Equipments'
     equipment_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     item_name = db.Column(db.String(100), nullable=False)
-    total_stock = db.Column(db.Integer, default=0)
+    total_stock = db.Column(db.Integer, default=0)  # Units owned; usage is tracked in EquipmentReservation
 
     requests = db.relationship('Equipment_request', backref='equipment', lazy=True)
 
 
 class Category(db.Model):
     __tablename__ = 'Category'
+    __table_args__ = (
+        db.Index('ft_category_name', 'category_name', mysql_prefix='FULLTEXT'),
+    )
+
     category_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     category_name = db.Column(db.String(50), nullable=False)
     created_by_admin_id = db.Column(db.String(20), db.ForeignKey('Admin.admin_id'))
@@ -121,6 +136,21 @@ class Category(db.Model):
 # ==========================================
 class Event(db.Model):
     __tablename__ = 'Event'
+    # Composite indexes matching the keyset pagination order (start_datetime, event_id)
+    __table_args__ = (
+        db.Index('ix_event_status_start', 'event_status', 'start_datetime', 'event_id'),
+        db.Index('ix_event_start', 'start_datetime', 'event_id'),
+        db.Index('ix_event_organizer_start', 'organizer_id', 'start_datetime', 'event_id'),
+        db.Index('ix_event_lecturer_start', 'lecturer_id', 'start_datetime', 'event_id'),
+        # Upcoming/past listings and expire-events (migrations/0002)
+        db.Index('ix_event_status_end_start', 'event_status', 'end_datetime', 'start_datetime'),
+        # Host schedule clashes (schedule_conflicts.py, migrations/0004)
+        db.Index('ix_event_organizer_end', 'organizer_id', 'end_datetime', 'start_datetime'),
+        db.Index('ix_event_lecturer_end', 'lecturer_id', 'end_datetime', 'start_datetime'),
+        # Full-text search (search.py); plain index on other databases
+        db.Index('ft_event_title_description', 'title', 'description', mysql_prefix='FULLTEXT'),
+    )
+
     event_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
@@ -130,6 +160,11 @@ class Event(db.Model):
     event_status = db.Column(db.String(20))
     venue_location = db.Column(db.String(100))
     capacity = db.Column(db.Integer)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    # Maintained by registrations.py (reserve_seat / release_seat); never set it directly
+    confirmed_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Sign-ups go through the admission queue and waitlist (admission.py)
+    high_demand = db.Column(db.Boolean, nullable=False, default=False, server_default='0')
     
     # Foreign Keys
     category_id = db.Column(db.Integer, db.ForeignKey('Category.category_id'))
@@ -146,6 +181,11 @@ class Event(db.Model):
 
 class Booking(db.Model):
     __tablename__ = 'Booking'
+    # Venue conflict checks (migrations/0002)
+    __table_args__ = (
+        db.Index('ix_booking_room_status_window', 'room_id', 'status_id', 'req_start_datetime', 'req_end_datetime'),
+    )
+
     booking_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     booking_date = db.Column(db.DateTime, default=datetime.now)
     req_start_datetime = db.Column(db.DateTime)
@@ -172,8 +212,31 @@ class Equipment_request(db.Model):
     approved_by_admin_id = db.Column(db.String(20), db.ForeignKey('Admin.admin_id'), nullable=True)
 
 
+class EquipmentReservation(db.Model):
+    # Ledger of approved equipment, one row per approved Equipment_request,
+    # holding the quantity for the event's time window (see equipment_ledger.py)
+    __tablename__ = 'EquipmentReservation'
+    __table_args__ = (
+        db.Index('ix_reservation_equipment_window', 'equipment_id', 'start_datetime', 'end_datetime'),
+    )
+
+    reservation_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    request_id = db.Column(db.Integer, db.ForeignKey('Equipment_request.request_id'), unique=True, nullable=False)
+    equipment_id = db.Column(db.Integer, db.ForeignKey('Equipments.equipment_id'), nullable=False)
+    event_id = db.Column(db.Integer, db.ForeignKey('Event.event_id'), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    start_datetime = db.Column(db.DateTime, nullable=False)
+    end_datetime = db.Column(db.DateTime, nullable=False)
+
+
 class Registration(db.Model):
     __tablename__ = 'Registration'
+    # Head of an event's waitlist: (event_id, 'Waitlisted') ordered by registration_id
+    __table_args__ = (
+        db.Index('ix_registration_event_status', 'event_id', 'status', 'registration_id'),
+        db.UniqueConstraint('student_id', 'event_id', name='uq_registration_student_event'),
+    )
+
     registration_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     registration_date = db.Column(db.DateTime, default=datetime.now)
     status = db.Column(db.String(20), default='Confirmed')
@@ -184,6 +247,10 @@ class Registration(db.Model):
 
 class Announcements(db.Model):
     __tablename__ = 'Announcements'
+    __table_args__ = (
+        db.Index('ix_announcements_audience_sent', 'target_audience', 'sent_at'),
+    )
+
     announcement_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     title = db.Column(db.String(200))
     message = db.Column(db.Text)
@@ -195,6 +262,10 @@ class Announcements(db.Model):
 
 class Feedback(db.Model):
     __tablename__ = 'Feedback'
+    __table_args__ = (
+        db.Index('ix_feedback_event_submitted', 'event_id', 'submitted_at'),
+    )
+
     feedback_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     rating = db.Column(db.Integer)
     comments = db.Column(db.Text)
@@ -202,3 +273,50 @@ class Feedback(db.Model):
     
     student_id = db.Column(db.String(20), db.ForeignKey('Student.student_id'))
     event_id = db.Column(db.Integer, db.ForeignKey('Event.event_id'))
+
+
+class EventRatingRollup(db.Model):
+    # Running rating totals per event, kept in step with Feedback by
+    # feedback_rollups.record_feedback (rebuild with `flask rebuild-feedback-rollups`)
+    __tablename__ = 'EventRatingRollup'
+
+    event_id = db.Column(db.Integer, db.ForeignKey('Event.event_id'), primary_key=True)
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_1 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_2 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_3 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_4 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_5 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    latest_at = db.Column(db.DateTime)
+
+    event = db.relationship('Event')
+
+    @property
+    def average(self):
+        return round(self.rating_sum / self.rating_count, 1) if self.rating_count else None
+
+
+class HostRatingRollup(db.Model):
+    # Same totals across all events of one organizer or lecturer
+    __tablename__ = 'HostRatingRollup'
+
+    host_type = db.Column(db.String(20), primary_key=True)  # 'Organizer' / 'Lecturer'
+    host_id = db.Column(db.String(20), primary_key=True)
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_1 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_2 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_3 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_4 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_5 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    latest_at = db.Column(db.DateTime)
+
+    @property
+    def average(self):
+        return round(self.rating_sum / self.rating_count, 1) if self.rating_count else None
+
+    @property
+    def histogram(self):
+        # [(stars, count)] from 5 down to 1
+        return [(n, getattr(self, f'stars_{n}')) for n in range(5, 0, -1)]
@@ -1,21 +1,29 @@
-import os
-from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
-from werkzeug.utils import secure_filename
 from datetime import datetime
-from models import db, Organizer, Event, Booking, Rooms, Equipments, Equipment_request, Feedback, Registration, Student, Category, Announcements, RequestStatus
+from room_index import room_index
+from dashboard_stats import invalidate_admin_stats
+from announcement_badges import get_announcement_ids
+from registrations import spots_left
+from sqlalchemy.orm import joinedload, contains_eager
+from loading import eager
+from feedback_rollups import host_rollups
+from equipment_ledger import available_quantity, available_quantities, release_event, reschedule_event
+from pagination import paginate_events, paginate_ranked
+from search import event_search
+from image_pipeline import image_pipeline
+from listing_cache import invalidate_listings
+from schedule_conflicts import host_clashes, clash_message
+from models import db, Organizer, Event, Booking, Equipments, Equipment_request, Feedback, Registration, Student, Category, Announcements, RequestStatus
 
 organizer_view = Blueprint('organizer_view', __name__)
 
-# Helper for Image Upload
+# Helper for Image Upload: stored under its content hash, renditions made in the background
 def save_event_image(file):
-    if file and file.filename != '':
-        filename = secure_filename(file.filename)
-        unique_filename = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{filename}"
-        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(file_path)
-        return unique_filename
-    return None
+    filename = image_pipeline.ingest(file)
+    if file and file.filename and not filename:
+        flash('Image not saved: please upload a JPG, PNG, GIF or WebP file.', 'warning')
+    return filename
 
 # ========================================================
 # 1. DASHBOARD (Public View of All Upcoming Events)
@@ -23,38 +31,23 @@ def save_event_image(file):
 @organizer_view.route('/dashboard')
 @login_required
 def dashboard():
-    # ---------------------------------------------------------
-    # 1. AUTO-EXPIRE LOGIC (Global Check)
-    # ---------------------------------------------------------
+    # Note: 'Upcoming' events that have ended are marked 'Expired' by the
+    # background scheduler (scheduler.py), so this page only reads.
     current_dt = datetime.now()
 
-    # Find all events that are marked 'Upcoming' but have already ended
-    expired_events = Event.query.filter(
-        Event.end_datetime < current_dt, 
-        Event.event_status == 'Upcoming'
-    ).all()
-
-    # Update them to 'Expired'
-    if expired_events:
-        for event in expired_events:
-            event.event_status = 'Expired'
-        db.session.commit()
-    # ---------------------------------------------------------
-
     # ---------------------------------------------------------
-    # 2. GET FILTER PARAMETERS
+    # 1. GET FILTER PARAMETERS
     # ---------------------------------------------------------
     category_id = request.args.get('category')
     search_query = request.args.get('search', '').strip()
     sort = request.args.get('sort', '')
     timeframe = request.args.get('timeframe', 'upcoming') # Default to 'upcoming'
-    page = request.args.get('page', 1, type=int)
 
     # Load categories for the filter dropdown
     categories = Category.query.all()
 
     # ---------------------------------------------------------
-    # 3. BUILD QUERY
+    # 2. BUILD QUERY
     # ---------------------------------------------------------
     query = Event.query
 
@@ -75,25 +68,26 @@ def dashboard():
     if category_id:
         query = query.filter(Event.category_id == category_id)
 
-    # C. Search Filter
+    # C. Search Filter (full-text index over title, description and category)
     if search_query:
-        query = query.filter(Event.title.ilike(f'%{search_query}%'))
+        query = event_search.filter(query, search_query)
 
-    # D. Sorting Logic
+    # D. Sorting Logic (newest first for 'newest' and by default for past events)
     if sort == 'newest':
-        query = query.order_by(Event.start_datetime.desc())
+        descending = True
     elif sort == 'oldest':
-        query = query.order_by(Event.start_datetime.asc())
+        descending = False
     else:
-        if timeframe == 'past':
-            query = query.order_by(Event.start_datetime.desc())
-        else:
-            query = query.order_by(Event.start_datetime.asc())
+        descending = (timeframe == 'past')
 
     # ---------------------------------------------------------
-    # 4. PAGINATION & RENDER
+    # 3. PAGINATION & RENDER
     # ---------------------------------------------------------
-    events_paginated = query.paginate(page=page, per_page=6, error_out=False)
+    # Searches without an explicit sort are shown best match first
+    if search_query and not sort:
+        events_paginated = paginate_ranked(event_search.order_by_relevance(query, search_query), per_page=6)
+    else:
+        events_paginated = paginate_events(query, descending=descending, per_page=6)
 
     return render_template('organizer/organizer_dashboard.html', 
                            user=current_user,
@@ -113,10 +107,9 @@ def dashboard():
 def my_events():
     # Admin/Organizer check removed as requested
     
-    page = request.args.get('page', 1, type=int)
-    my_events_paginated = Event.query.filter_by(organizer_id=current_user.organizer_id)\
-        .order_by(Event.start_datetime.desc())\
-        .paginate(page=page, per_page=6, error_out=False)
+    my_events_paginated = paginate_events(
+        Event.query.filter_by(organizer_id=current_user.organizer_id),
+        descending=True, per_page=6)
     
     # PASS 'now' variable
     return render_template('organizer/my_events.html', 
@@ -189,19 +182,26 @@ def create_event():
             end_datetime=end_dt,
             event_status=status, 
             capacity=capacity, 
+            high_demand=bool(request.form.get('high_demand')),
             event_img=img_filename,
             organizer_id=current_user.organizer_id,
             category_id=category_id
         )
 
+        # Heads-up if the organizer already hosts something at that time
+        clashes = host_clashes(start_dt, end_dt, organizer_id=current_user.organizer_id)
+
         try:
             db.session.add(new_event)
             db.session.commit()
+            invalidate_listings()
             
             if status == 'Upcoming':
                 flash('Event Published! It is now visible to students.', 'success')
             else:
                 flash('Event saved as Draft. You can edit and publish it later.', 'info')
+            if clashes:
+                flash(clash_message(clashes, 'Schedule clash: you are also hosting'), 'warning')
                 
             return redirect(url_for('organizer_view.manage_event', event_id=new_event.event_id))
 
@@ -227,14 +227,19 @@ def manage_event(event_id):
     if event.organizer_id != current_user.organizer_id:
         return redirect(url_for('organizer_view.dashboard'))
 
-    rooms = Rooms.query.filter_by(is_active=True).all()
     equipments = Equipments.query.all()
     current_booking = Booking.query.filter_by(event_id=event_id)\
                                    .order_by(Booking.booking_id.desc())\
                                    .first()
     current_equipment_reqs = Equipment_request.query.filter_by(event_id=event_id).all()
+
+    # Units of each item still free during the event (equipment_ledger.py)
+    equipment_available = available_quantities(equipments, event.start_datetime, event.end_datetime)
     
-    rooms = Rooms.query.all()
+    # Only offer active rooms that fit the event and are free for its time slot
+    # (the event's own booking does not make its room look taken)
+    rooms = room_index.find_free_rooms(event.start_datetime, event.end_datetime, event.capacity or 0,
+                                       exclude_event_id=event.event_id)
     
     # Participant Tracking
     search_q = request.args.get('search_q', '').strip()
@@ -253,6 +258,7 @@ def manage_event(event_id):
                            participants=participants,
                            current_booking=current_booking,
                            current_equipment_reqs=current_equipment_reqs,
+                           equipment_available=equipment_available,
                            search_q=search_q, 
                            status_filter=status_filter)
 
@@ -302,9 +308,11 @@ def edit_event(event_id):
         return redirect(url_for('organizer_view.manage_event', event_id=event_id))
 
     # 4. Update Event Fields
+    times_changed = (event.start_datetime, event.end_datetime) != (new_start, new_end)
     event.title = title
     event.description = description
     event.capacity = capacity
+    event.high_demand = bool(request.form.get('high_demand'))
     event.start_datetime = new_start # Update DB
     event.end_datetime = new_end     # Update DB
     
@@ -322,7 +330,19 @@ def edit_event(event_id):
     else:
         flash('Event details updated successfully.', 'success')
 
+    # Approved equipment moves to the new time, or goes back to Pending if it is taken then
+    bumped = reschedule_event(event.event_id, new_start, new_end) if times_changed else []
+
     db.session.commit()
+    invalidate_listings()
+    if bumped:
+        invalidate_admin_stats()
+        flash('Not available at the new time, sent back for approval: '
+              + ', '.join(f'{req.quantity} x {req.equipment.item_name}' for req in bumped) + '.', 'warning')
+
+    clashes = host_clashes(new_start, new_end, organizer_id=current_user.organizer_id, exclude_event_id=event_id)
+    if clashes:
+        flash(clash_message(clashes, 'Schedule clash: you are also hosting'), 'warning')
     return redirect(url_for('organizer_view.manage_event', event_id=event_id))
 
 # ========================================================
@@ -340,18 +360,14 @@ def book_venue(event_id):
         flash('Invalid room selected.', 'danger')
         return redirect(url_for('organizer_view.manage_event', event_id=event_id))
 
-    # Robust Conflict Check
-    # We check for ANY overlap in time for the SAME room
+    # Conflict Check (served from the in-memory room index, no DB round trip)
+    # We check for ANY overlap in time for the SAME room, ignoring Rejected(3)
     # Logic: (StartA < EndB) and (EndA > StartB)
-    overlap = Booking.query.filter(
-        Booking.room_id == room_id, 
-        Booking.status_id.notin_([3]), # Ignore Rejected(3)
-        Booking.req_start_datetime < event.end_datetime, 
-        Booking.req_end_datetime > event.start_datetime
-    ).first()
+    overlap = room_index.find_conflict(room_id, event.start_datetime, event.end_datetime)
 
     if overlap:
-        flash(f'Booking Conflict: This room is already taken during {overlap.req_start_datetime} - {overlap.req_end_datetime}.', 'danger')
+        taken_start, taken_end, _ = overlap
+        flash(f'Booking Conflict: This room is already taken during {taken_start} - {taken_end}.', 'danger')
         return redirect(url_for('organizer_view.manage_event', event_id=event_id))
 
     # 1. Create New Booking Request
@@ -369,11 +385,39 @@ def book_venue(event_id):
 
     db.session.add(new_booking)
     db.session.commit()
+    room_index.add_booking(new_booking)
+    invalidate_admin_stats()
+    invalidate_listings()
     
     flash('Venue requested successfully. Waiting for Admin approval.', 'success')
     return redirect(url_for('organizer_view.manage_event', event_id=event_id))
 
 
+# ========================================================
+# 6b. FIND FREE ROOMS (JSON)
+# ========================================================
+# e.g. /api/free-rooms?start=2026-03-01T09:00&end=2026-03-01T12:00&capacity=50
+@organizer_view.route('/api/free-rooms')
+@login_required
+def free_rooms():
+    try:
+        start_dt = datetime.fromisoformat(request.args.get('start', ''))
+        end_dt = datetime.fromisoformat(request.args.get('end', ''))
+    except ValueError:
+        return jsonify({'error': 'start and end must be ISO datetimes (YYYY-MM-DDTHH:MM).'}), 400
+
+    if end_dt <= start_dt:
+        return jsonify({'error': 'end must be after start.'}), 400
+
+    # Missing means any size; anything that is not a whole number is rejected
+    min_capacity = request.args.get('capacity', type=int) if 'capacity' in request.args else 0
+    if min_capacity is None or min_capacity < 0:
+        return jsonify({'error': 'capacity must be a non-negative number.'}), 400
+
+    rooms = room_index.find_free_rooms(start_dt, end_dt, min_capacity)
+    return jsonify(rooms)
+
+
 # ========================================================
 # 7. REQUEST EQUIPMENT
 # ========================================================
@@ -383,6 +427,15 @@ def request_equipment(event_id):
     equipment_id = request.form.get('equipment_id')
     quantity = int(request.form.get('quantity'))
     
+    event = Event.query.get_or_404(event_id)
+    equipment_item = Equipments.query.get_or_404(equipment_id)
+
+    # Check against what is already reserved for the event's time window
+    available = available_quantity(equipment_item, event.start_datetime, event.end_datetime)
+    if quantity <= 0 or quantity > available:
+        flash(f'Only {available} {equipment_item.item_name}(s) are available during this event.', 'danger')
+        return redirect(url_for('organizer_view.manage_event', event_id=event_id))
+
     # 1. Proceed if valid
     new_req = Equipment_request(
         quantity=quantity, 
@@ -392,6 +445,7 @@ def request_equipment(event_id):
     )
     db.session.add(new_req)
     db.session.commit()
+    invalidate_admin_stats()
     
     flash('Equipment requested successfully.', 'success')
     return redirect(url_for('organizer_view.manage_event', event_id=event_id))
@@ -408,11 +462,11 @@ def view_feedback():
     filter_rating = request.args.get('rating')
     filter_sort = request.args.get('sort', 'newest') # Default to Newest
 
-    # 2. Base Query: Only feedback for this organizer's events
-    my_events = Event.query.filter_by(organizer_id=current_user.organizer_id).all()
-    my_event_ids = [e.event_id for e in my_events]
-    
-    query = Feedback.query.filter(Feedback.event_id.in_(my_event_ids))
+    # 2. Rating summary and per-event averages, read from the rollup tables
+    host_rollup, event_rollups = host_rollups('Organizer', current_user.organizer_id)
+
+    # Base Query: Only feedback for this organizer's events
+    query = Feedback.query.join(Feedback.event).filter(Event.organizer_id == current_user.organizer_id)
 
     # 3. Apply Filters
     if filter_event_id:
@@ -427,12 +481,14 @@ def view_feedback():
     else:
         query = query.order_by(Feedback.submitted_at.desc())
 
-    feedbacks = query.all()
+    feedbacks = query.options(*eager(contains_eager(Feedback.event), joinedload(Feedback.student))).all()
 
-    # Pass 'my_events' to populate the dropdown list
+    # Dropdown lists the events that have feedback
     return render_template('organizer/feedback_list.html', 
                            feedbacks=feedbacks, 
-                           events=my_events,
+                           events=[r.event for r in event_rollups],
+                           host_rollup=host_rollup,
+                           event_rollups=event_rollups,
                            current_event=filter_event_id,
                            current_rating=filter_rating,
                            current_sort=filter_sort)
@@ -450,15 +506,17 @@ def booking_history():
     # Base Query
     query = Booking.query.join(Event).filter(Booking.req_organizer_id == current_user.organizer_id)
 
-    # Search (Event Title)
+    # Search (full-text index over title, description and category)
     if search_q:
-        query = query.filter(Event.title.ilike(f'%{search_q}%'))
+        query = event_search.filter(query, search_q)
 
     # Status Filter
     if status_filter:
         query = query.filter(Booking.status_id == status_filter)
 
-    bookings = query.all()
+    # Event comes from the join above; room and status are loaded with it
+    bookings = query.options(*eager(contains_eager(Booking.event),
+                                    joinedload(Booking.room), joinedload(Booking.status))).all()
     statuses = RequestStatus.query.all()
 
     return render_template('organizer/booking_history.html', 
@@ -474,15 +532,11 @@ def view_event_details(event_id):
     # Admin/Organizer check removed as requested
     
     event = Event.query.get_or_404(event_id)
-    
-    # Calculate spots left
-    confirmed_count = Registration.query.filter_by(event_id=event_id, status='Confirmed').count()
-    spots_left = event.capacity - confirmed_count
 
     return render_template('organizer/event_details.html', 
                            user=current_user, 
                            event=event, 
-                           spots_left=spots_left)
+                           spots_left=spots_left(event))
     
 
 # ========================================================
@@ -508,13 +562,11 @@ def announcements():
 @organizer_view.context_processor
 def inject_announcement_ids():
     if current_user.is_authenticated:
-        # UPDATED: Added current_user.organizer_id to the filter list here too
-        recent_anns = Announcements.query.filter(
-            Announcements.target_audience.in_(['All', 'Organizer', current_user.organizer_id])
-        ).order_by(Announcements.sent_at.desc()).all()
-        
+        # Served from a versioned cache: only a version check every few seconds
+        ids = get_announcement_ids('Organizer', current_user.organizer_id)
+
         # Pass the list of IDs to all templates
-        return dict(recent_announcement_ids=[a.announcement_id for a in recent_anns])
+        return dict(recent_announcement_ids=ids)
     
     return dict(recent_announcement_ids=[])
 
@@ -543,7 +595,8 @@ def delete_event(event_id):
         # Delete children records first to prevent Foreign Key errors
         # -------------------------------------------------------------
         
-        # A. Delete Equipment Requests linked to this event
+        # A. Delete Equipment Requests (and their reservations) linked to this event
+        release_event(event_id)
         Equipment_request.query.filter_by(event_id=event_id).delete()
         
         # B. Delete Venue Bookings linked to this event
@@ -552,6 +605,8 @@ def delete_event(event_id):
         # 4. Delete the Event itself
         db.session.delete(event)
         db.session.commit()
+        room_index.remove_event(event_id)
+        invalidate_listings()
         
         flash('Draft event and its booking requests were deleted successfully.', 'success')
         
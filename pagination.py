@@ -0,0 +1,103 @@
+import base64
+from datetime import datetime
+from flask import request
+from sqlalchemy import tuple_
+from models import Event
+
+
+# ========================================================
+# KEYSET (CURSOR) PAGINATION FOR EVENT LISTINGS
+# ========================================================
+# Pages are addressed by the (start_datetime, event_id) of the last/first
+# event shown instead of an OFFSET, so page 50 costs the same as page 1
+# (one index range scan, no COUNT(*)). Links carry ?after=<cursor> for the
+# next page and ?before=<cursor> for the previous one; ?page= is only kept
+# for display.
+class KeysetPage:
+    def __init__(self, items, page, has_next, has_prev, next_cursor, prev_cursor):
+        self.items = items
+        self.page = page
+        self.has_next = has_next
+        self.has_prev = has_prev
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+
+def encode_cursor(event):
+    raw = f'{event.start_datetime.isoformat()}|{event.event_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    # Returns (start_datetime, event_id), or None for a missing/garbled cursor
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode()
+        start_str, event_id = raw.split('|')
+        return datetime.fromisoformat(start_str), int(event_id)
+    except ValueError:
+        return None
+
+
+def paginate_events(query, descending=False, per_page=6):
+    # `query` must be an Event query without ORDER BY; the sort key is
+    # always (start_datetime, event_id) so it matches the composite indexes.
+    # Events without a start time have no place in that order (and no
+    # cursor), so they are left out.
+    after = decode_cursor(request.args.get('after'))
+    before = decode_cursor(request.args.get('before'))
+    page = max(request.args.get('page', 1, type=int), 1)
+
+    query = query.filter(Event.start_datetime.isnot(None))
+    key = tuple_(Event.start_datetime, Event.event_id)
+    if descending:
+        forward = (Event.start_datetime.desc(), Event.event_id.desc())
+        backward = (Event.start_datetime.asc(), Event.event_id.asc())
+    else:
+        forward = (Event.start_datetime.asc(), Event.event_id.asc())
+        backward = (Event.start_datetime.desc(), Event.event_id.desc())
+
+    if before:
+        # Walk backwards from the first item of the current page, then flip
+        query = query.filter(key > before if descending else key < before)
+        rows = query.order_by(*backward).limit(per_page + 1).all()
+        items = list(reversed(rows[:per_page]))
+        has_prev = len(rows) > per_page
+        has_next = True
+    else:
+        if after:
+            query = query.filter(key < after if descending else key > after)
+        rows = query.order_by(*forward).limit(per_page + 1).all()
+        items = rows[:per_page]
+        has_next = len(rows) > per_page
+        has_prev = after is not None
+
+    if not has_prev:
+        page = 1
+
+    return KeysetPage(
+        items=items,
+        page=page,
+        has_next=has_next,
+        has_prev=has_prev,
+        next_cursor=encode_cursor(items[-1]) if items else None,
+        prev_cursor=encode_cursor(items[0]) if items else None,
+    )
+
+
+def paginate_ranked(query, per_page=6):
+    # Search results ordered by relevance: `query` comes from
+    # event_search.order_by_relevance(). A relevance score is no stable sort
+    # key, so pages use LIMIT/OFFSET; searches are rarely paged deeply.
+    page = max(request.args.get('page', 1, type=int), 1)
+    rows = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+
+    return KeysetPage(
+        items=rows[:per_page],
+        page=page,
+        has_next=len(rows) > per_page,
+        has_prev=page > 1,
+        next_cursor=None,
+        prev_cursor=None,
+    )
@@ -0,0 +1,113 @@
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from cache import TTLCache
+from models import db, Student, Lecturer, Organizer, Admin, UserIdentity
+
+# Session user IDs look like "<role>:<id>", e.g. "admin:AD01" (see get_id in models.py)
+ROLE_MODELS = {
+    'student': Student,
+    'lecturer': Lecturer,
+    'organizer': Organizer,
+    'admin': Admin,
+}
+
+# Loaded users, keyed by their session ID. Entries are column-only copies
+# that never belong to a DB session, so they are safe to share between requests.
+principal_cache = TTLCache(maxsize=2048, ttl=60)
+
+
+# ========================================================
+# LOAD THE LOGGED-IN USER (used by the Flask-Login user_loader)
+# ========================================================
+def load_principal(session_id):
+    role, sep, user_id = session_id.partition(':')
+
+    # Sessions/remember-me cookies created before IDs carried a role
+    if not sep:
+        return _load_untagged(session_id)
+
+    model = ROLE_MODELS.get(role)
+    if model is None:
+        return None
+
+    cached = principal_cache.get(session_id)
+    if cached is not None:
+        # Attach a copy to this request's session without querying the DB
+        return db.session.merge(cached, load=False)
+
+    # Exactly one primary-key lookup on the right table
+    user = db.session.get(model, user_id)
+    if user is not None:
+        principal_cache.set(session_id, _detached_copy(user))
+    return user
+
+
+def invalidate_principal(user):
+    # Call after a user's profile, password or account is changed/deleted
+    principal_cache.pop(user.get_id())
+
+
+def _detached_copy(user):
+    model = type(user)
+    columns = {attr.key: getattr(user, attr.key) for attr in inspect(model).column_attrs}
+    copy = model(**columns)
+    make_transient_to_detached(copy)
+    return copy
+
+
+def _load_untagged(user_id):
+    return (
+        db.session.get(Student, user_id) or
+        db.session.get(Lecturer, user_id) or
+        db.session.get(Organizer, user_id) or
+        db.session.get(Admin, user_id)
+    )
+
+
+# ========================================================
+# IDENTITY INDEX (email -> role + ID)
+# ========================================================
+def find_identity(email):
+    # One primary-key lookup, whichever table the account lives in
+    return db.session.get(UserIdentity, email.strip().lower())
+
+
+def find_user_by_email(email):
+    identity = find_identity(email)
+    if identity is None:
+        return None, None
+    user = db.session.get(ROLE_MODELS[identity.role], identity.user_id)
+    return user, identity.role
+
+
+def add_identity(role, user_id, email):
+    # Added to the current transaction; the caller commits
+    db.session.add(UserIdentity(email=email.strip().lower(), role=role, user_id=user_id))
+
+
+def remove_identity(role, user):
+    email = getattr(user, f'{role}_email')
+    UserIdentity.query.filter_by(email=email.strip().lower()).delete()
+
+
+def rebuild_identities():
+    # Recreate the whole index from the four actor tables
+    UserIdentity.__table__.create(db.engine, checkfirst=True)
+    UserIdentity.query.delete()
+    count = 0
+    for role, model in ROLE_MODELS.items():
+        id_column = getattr(model, f'{role}_id')
+        email_column = getattr(model, f'{role}_email')
+        for user_id, email in db.session.query(id_column, email_column):
+            add_identity(role, user_id, email)
+            count += 1
+    db.session.commit()
+    return count
+
+
+def init_app(app):
+    @app.cli.command('sync-identities')
+    def sync_identities_command():
+        """Rebuild the UserIdentity email index from the user tables."""
+        count = rebuild_identities()
+        print(f'Indexed {count} accounts.')
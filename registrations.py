@@ -0,0 +1,86 @@
+from sqlalchemy import update, select, func
+from models import db, Event, Registration
+
+
+# ========================================================
+# CONFIRMED-REGISTRATION COUNTER (Event.confirmed_count)
+# ========================================================
+# Seats are taken with a conditional UPDATE, so the capacity check and the
+# increment happen in one statement. The row lock it takes is held until
+# the caller commits, so parallel sign-ups for the same event cannot oversell.
+# updated_at is set to itself so a sign-up does not count as an event edit.
+
+def reserve_seat(event_id):
+    # True if a seat was taken, False if the event is full (or has no capacity)
+    result = db.session.execute(
+        update(Event)
+        .where(Event.event_id == event_id, Event.confirmed_count < Event.capacity)
+        .values(confirmed_count=Event.confirmed_count + 1, updated_at=Event.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def release_seat(event_id):
+    db.session.execute(
+        update(Event)
+        .where(Event.event_id == event_id, Event.confirmed_count > 0)
+        .values(confirmed_count=Event.confirmed_count - 1, updated_at=Event.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def promote_next_waitlisted(event_id):
+    # Hands a freed seat to the oldest 'Waitlisted' registration. The lookup is
+    # a single seek on ix_registration_event_status (event_id, status,
+    # registration_id), so it costs the same however long the waitlist is.
+    # Returns the promoted registration_id, or None if the waitlist is empty.
+    while True:
+        next_id = db.session.query(Registration.registration_id).filter(
+            Registration.event_id == event_id,
+            Registration.status == 'Waitlisted'
+        ).order_by(Registration.registration_id).limit(1).scalar()
+        if next_id is None:
+            return None
+
+        # Conditional, in case a parallel cancellation promoted the same row
+        promoted = db.session.execute(
+            update(Registration)
+            .where(Registration.registration_id == next_id, Registration.status == 'Waitlisted')
+            .values(status='Confirmed')
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if promoted:
+            return next_id
+
+
+def spots_left(event):
+    return (event.capacity or 0) - (event.confirmed_count or 0)
+
+
+# ========================================================
+# RECONCILIATION (flask reconcile-registrations)
+# ========================================================
+def reconcile_confirmed_counts():
+    # Recount 'Confirmed' registrations and fix every event that drifted
+    actual = (
+        select(func.count(Registration.registration_id))
+        .where(Registration.event_id == Event.event_id, Registration.status == 'Confirmed')
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        update(Event)
+        .where(Event.confirmed_count != actual)
+        .values(confirmed_count=actual, updated_at=Event.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def init_app(app):
+    @app.cli.command('reconcile-registrations')
+    def reconcile_registrations_command():
+        """Recompute Event.confirmed_count from the Registration table."""
+        count = reconcile_confirmed_counts()
+        print(f'{count} event(s) had their confirmed count corrected.')
@@ -0,0 +1,197 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from flask import request
+from sqlalchemy import event
+from models import db
+
+# The same SQL run this many times in one request is reported as a duplicate
+DUPLICATE_THRESHOLD = 3
+
+STATEMENT_CHARS = 500
+RECENT_SLOW = 100
+
+# Endpoints that never touch the database
+SKIPPED_ENDPOINTS = {'static', 'asset'}
+
+
+# ========================================================
+# PER-REQUEST SQL PROFILER (opt-in: SQL_PROFILING=1)
+# ========================================================
+# Off by default. Then init_app registers nothing, so requests and queries
+# run exactly as without it.
+#
+# When on, engine events time every statement and request hooks add them up
+# per request: query count, total DB time, the slowest statement and the
+# duplicates (the same SQL text run DUPLICATE_THRESHOLD+ times with different
+# parameters: the signature of an N+1 loop).
+#
+# Totals per route (method + URL rule) are kept in memory for the admin page
+# /admin/debug/requests. Requests over SLOW_REQUEST_MS, over
+# SLOW_REQUEST_QUERIES statements, or with duplicates are also written as one
+# JSON line each to a rotating log (SLOW_REQUEST_LOG, default
+# instance/slow_requests.log). The totals are per worker process; the log is
+# shared.
+class RequestProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.slow_ms = 500
+        self.slow_queries = 30
+        self.log_path = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._routes = {}  # route -> running totals
+        self._recent = deque(maxlen=RECENT_SLOW)
+        self._started_at = datetime.now()
+        self._log = logging.getLogger('slow_requests')
+
+    def init_app(self, app):
+        app.extensions['request_profiler'] = self
+        self.enabled = app.config.get('SQL_PROFILING', False)
+        if not self.enabled:
+            return
+
+        self.slow_ms = app.config.get('SLOW_REQUEST_MS', self.slow_ms)
+        self.slow_queries = app.config.get('SLOW_REQUEST_QUERIES', self.slow_queries)
+        self.log_path = app.config.get('SLOW_REQUEST_LOG', os.path.join(app.instance_path, 'slow_requests.log'))
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        handler = RotatingFileHandler(self.log_path, maxBytes=5 * 1024 * 1024, backupCount=5, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self._log.handlers = [handler]
+        self._log.setLevel(logging.INFO)
+        self._log.propagate = False
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        app.before_request(self._start_request)
+        app.after_request(self._note_status)
+        app.teardown_request(self._finish_request)
+
+    # Engine events: time each statement of the current request
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None and getattr(self._local, 'profile', None) is not None:
+            context._profiler_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        profile = getattr(self._local, 'profile', None)
+        started = getattr(context, '_profiler_started', None)
+        if profile is None or started is None:
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        profile['queries'] += 1
+        profile['db_ms'] += elapsed
+        if elapsed > profile['slowest_ms']:
+            profile['slowest_ms'], profile['slowest'] = elapsed, statement
+        count, total = profile['statements'].get(statement, (0, 0.0))
+        profile['statements'][statement] = (count + 1, total + elapsed)
+
+    # Request hooks: one profile per request, added to the totals at the end
+    def _start_request(self):
+        if request.endpoint in SKIPPED_ENDPOINTS:
+            return
+        self._local.profile = {
+            'started': time.perf_counter(),
+            'route': f'{request.method} {request.url_rule.rule if request.url_rule else "(no route)"}',
+            'path': request.full_path.rstrip('?'),
+            'status': None,
+            'queries': 0, 'db_ms': 0.0,
+            'slowest_ms': 0.0, 'slowest': None,
+            'statements': {},  # SQL text -> (count, total ms)
+        }
+
+    def _note_status(self, response):
+        profile = getattr(self._local, 'profile', None)
+        if profile is not None:
+            profile['status'] = response.status_code
+        return response
+
+    def _finish_request(self, exc=None):
+        profile = getattr(self._local, 'profile', None)
+        if profile is None:
+            return
+        self._local.profile = None
+
+        duplicates = sorted(
+            ({'statement': _shorten(sql), 'count': count, 'db_ms': round(total, 2)}
+             for sql, (count, total) in profile['statements'].items() if count >= DUPLICATE_THRESHOLD),
+            key=lambda d: -d['count'])
+        entry = {
+            'at': datetime.now().isoformat(timespec='seconds'),
+            'route': profile['route'],
+            'path': profile['path'],
+            'status': profile['status'] or 500,
+            'duration_ms': round((time.perf_counter() - profile['started']) * 1000, 2),
+            'queries': profile['queries'],
+            'db_ms': round(profile['db_ms'], 2),
+            'slowest_ms': round(profile['slowest_ms'], 2),
+            'slowest': _shorten(profile['slowest']),
+            'duplicates': duplicates,
+        }
+        self._add_to_totals(entry)
+
+        if entry['duration_ms'] >= self.slow_ms or entry['queries'] >= self.slow_queries or duplicates:
+            self._recent.appendleft(entry)
+            self._log.info(json.dumps(entry))
+
+    def _add_to_totals(self, entry):
+        with self._lock:
+            totals = self._routes.get(entry['route'])
+            if totals is None:
+                totals = self._routes[entry['route']] = {
+                    'route': entry['route'], 'requests': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'queries': 0, 'max_queries': 0, 'db_ms': 0.0,
+                    'slowest_ms': 0.0, 'slowest': None, 'max_duplicate': 0, 'duplicate': None,
+                }
+            totals['requests'] += 1
+            totals['total_ms'] += entry['duration_ms']
+            totals['max_ms'] = max(totals['max_ms'], entry['duration_ms'])
+            totals['queries'] += entry['queries']
+            totals['max_queries'] = max(totals['max_queries'], entry['queries'])
+            totals['db_ms'] += entry['db_ms']
+            if entry['slowest_ms'] > totals['slowest_ms']:
+                totals['slowest_ms'], totals['slowest'] = entry['slowest_ms'], entry['slowest']
+            if entry['duplicates'] and entry['duplicates'][0]['count'] > totals['max_duplicate']:
+                totals['max_duplicate'] = entry['duplicates'][0]['count']
+                totals['duplicate'] = entry['duplicates'][0]['statement']
+
+    # Reporting (admin debug page)
+    def top_routes(self, sort='db_ms', limit=25):
+        # Per route averages, worst first by: db_ms, queries, duration or duplicates
+        with self._lock:
+            rows = [dict(t) for t in self._routes.values()]
+        for row in rows:
+            row['avg_ms'] = round(row['total_ms'] / row['requests'], 2)
+            row['avg_queries'] = round(row['queries'] / row['requests'], 1)
+            row['avg_db_ms'] = round(row['db_ms'] / row['requests'], 2)
+            row['db_ms'] = round(row['db_ms'], 2)
+        key = {'queries': 'avg_queries', 'duration': 'avg_ms', 'duplicates': 'max_duplicate'}.get(sort, 'db_ms')
+        return sorted(rows, key=lambda row: row[key], reverse=True)[:limit]
+
+    def recent_slow(self, limit=RECENT_SLOW):
+        return list(self._recent)[:limit]
+
+    def since(self):
+        return self._started_at
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._recent.clear()
+            self._started_at = datetime.now()
+
+
+def _shorten(statement):
+    if statement is None:
+        return None
+    statement = ' '.join(statement.split())
+    return statement if len(statement) <= STATEMENT_CHARS else statement[:STATEMENT_CHARS] + ' ...'
+
+
+request_profiler = RequestProfiler()
@@ -0,0 +1,170 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from sqlalchemy.orm import selectinload
+from models import db, Booking, Rooms
+from room_index import _RoomSchedule
+
+# Request status IDs: 1=Pending, 2=Approved, 3=Rejected
+PENDING, APPROVED = 1, 2
+
+DEFAULT_DAYS = 30
+
+
+# ========================================================
+# ROOM ASSIGNMENT OPTIMIZER (admin request queue)
+# ========================================================
+# Proposes a room for every pending venue booking in a period so that as many
+# of them as possible can be approved together. The admin reviews the
+# proposal and applies it through process_bulk (one transaction).
+#
+# A booking can go to any active room whose capacity covers its event's
+# capacity and that is free for its whole time window. Approved bookings, and
+# pending ones outside the batch, block their rooms.
+#
+# 1. Bookings are placed in order of end time (the classic greedy for
+#    interval scheduling: finishing early leaves the most room for the rest).
+#    The requested room is kept when it fits and is free; otherwise the
+#    smallest room that fits is used, and among equal capacities the one whose
+#    previous booking ended last, so gaps stay usable.
+# 2. Each booking still without a room gets one augmenting step (bipartite
+#    matching): if a room is blocked by a single booking placed in step 1,
+#    and that booking can move to another free room, it moves.
+# Rooms are kept as sorted interval schedules (the same structure as the room
+# index), so every free/overlap check is O(log n): a few thousand requests
+# take about a second.
+
+def default_window(today=None):
+    start = datetime.combine((today or datetime.now()).date(), datetime.min.time())
+    return start, start + timedelta(days=DEFAULT_DAYS)
+
+
+def propose_assignment(start, end):
+    # 1. Pending bookings in the period
+    bookings = Booking.query.filter(
+        Booking.status_id == PENDING,
+        Booking.req_start_datetime < end,
+        Booking.req_end_datetime > start
+    ).options(selectinload(Booking.event), selectinload(Booking.room)).order_by(Booking.booking_id).all()
+
+    # 2. Active rooms, smallest first
+    rooms = sorted((room for room in Rooms.query.all() if room.is_active is not False),
+                   key=lambda room: (room.capacity or 0, room.room_id))
+    rooms_by_id = {room.room_id: room for room in rooms}
+    capacities = [room.capacity or 0 for room in rooms]
+    schedules = {room.room_id: _RoomSchedule() for room in rooms}
+
+    proposal = {'start': start, 'end': end, 'assignments': [], 'unassigned': []}
+    if not bookings:
+        return proposal
+
+    # 3. Bookings that already hold a room during the batch's time span
+    batch_ids = {b.booking_id for b in bookings}
+    blockers = db.session.query(
+        Booking.booking_id, Booking.room_id, Booking.event_id, Booking.status_id,
+        Booking.req_start_datetime, Booking.req_end_datetime
+    ).filter(
+        Booking.status_id.in_((PENDING, APPROVED)),
+        Booking.req_start_datetime < max(b.req_end_datetime for b in bookings),
+        Booking.req_end_datetime > min(b.req_start_datetime for b in bookings)
+    ).all()
+    events_with_venue = set()
+    for row in blockers:
+        if row.booking_id in batch_ids:
+            continue
+        if row.status_id == APPROVED:
+            events_with_venue.add(row.event_id)
+        if row.room_id in schedules:
+            schedules[row.room_id].add(row.req_start_datetime, row.req_end_datetime, row.booking_id)
+
+    placed = {}  # booking_id -> room_id chosen by the optimizer
+
+    def needed(booking):
+        return booking.event.capacity or 0
+
+    def fitting_rooms(booking):
+        return rooms[bisect_left(capacities, needed(booking)):]
+
+    def choose_room(booking, exclude=None):
+        start_dt, end_dt = booking.req_start_datetime, booking.req_end_datetime
+        requested = rooms_by_id.get(booking.room_id)
+        if requested is not None and requested.room_id != exclude and (requested.capacity or 0) >= needed(booking) \
+                and schedules[requested.room_id].find_overlap(start_dt, end_dt) is None:
+            return requested
+
+        best, best_gap = None, None
+        for room in fitting_rooms(booking):
+            if best is not None and (room.capacity or 0) > (best.capacity or 0):
+                break  # only rooms of the smallest free capacity compete
+            schedule = schedules[room.room_id]
+            if room.room_id == exclude or schedule.find_overlap(start_dt, end_dt) is not None:
+                continue
+            last_end = schedule.last_end_before(start_dt)
+            gap = start_dt - last_end if last_end is not None else timedelta.max
+            if best is None or gap < best_gap:
+                best, best_gap = room, gap
+        return best
+
+    def place(booking, room):
+        schedules[room.room_id].add(booking.req_start_datetime, booking.req_end_datetime, booking.booking_id)
+        placed[booking.booking_id] = room.room_id
+
+    # 4. Greedy pass, earliest end first
+    by_id = {b.booking_id: b for b in bookings}
+    events_placed = set()
+    waiting = []
+    for booking in sorted(bookings, key=lambda b: (b.req_end_datetime, b.req_start_datetime, b.booking_id)):
+        reason = None
+        if booking.event is None:
+            reason = 'Event no longer exists.'
+        elif booking.event_id in events_with_venue:
+            reason = 'Event already has an approved venue.'
+        elif booking.event_id in events_placed:
+            reason = 'Another request for this event is already in the proposal.'
+        elif not capacities or needed(booking) > capacities[-1]:
+            reason = f'No active room holds {needed(booking)} people.'
+        if reason:
+            proposal['unassigned'].append({'booking': booking, 'reason': reason})
+            continue
+
+        room = choose_room(booking)
+        if room is not None:
+            place(booking, room)
+            events_placed.add(booking.event_id)
+        else:
+            waiting.append(booking)
+
+    # 5. One augmenting step for the bookings left over
+    for booking in waiting:
+        if booking.event_id in events_placed:
+            proposal['unassigned'].append({'booking': booking, 'reason': 'Another request for this event is already in the proposal.'})
+            continue
+        start_dt, end_dt = booking.req_start_datetime, booking.req_end_datetime
+        for room in fitting_rooms(booking):
+            schedule = schedules[room.room_id]
+            overlaps = schedule.find_overlaps(start_dt, end_dt)
+            if len(overlaps) != 1 or overlaps[0][2] not in placed:
+                continue
+            other = by_id[overlaps[0][2]]
+            alternative = choose_room(other, exclude=room.room_id)
+            if alternative is None:
+                continue
+            schedule.remove(*overlaps[0])
+            place(other, alternative)
+            place(booking, room)
+            events_placed.add(booking.event_id)
+            break
+        else:
+            proposal['unassigned'].append({'booking': booking, 'reason': 'No room that fits is free at that time.'})
+
+    # 6. Result, in time order
+    for booking_id, room_id in placed.items():
+        booking = by_id[booking_id]
+        proposal['assignments'].append({
+            'booking': booking,
+            'room': rooms_by_id[room_id],
+            'moved': room_id != booking.room_id,
+        })
+    proposal['assignments'].sort(key=lambda a: (a['booking'].req_start_datetime, a['booking'].booking_id))
+    proposal['unassigned'].sort(key=lambda u: (u['booking'].req_start_datetime or datetime.min, u['booking'].booking_id))
+    proposal['moved'] = sum(1 for a in proposal['assignments'] if a['moved'])
+    return proposal
@@ -0,0 +1,330 @@
+import threading
+from bisect import bisect_left, bisect_right
+from sqlalchemy import func, or_
+from models import db, Booking, Rooms
+
+# Booking status IDs: 1=Pending, 2=Approved, 3=Rejected
+REJECTED_STATUS_ID = 3
+
+
+# ========================================================
+# ROOM AVAILABILITY INDEX
+# ========================================================
+# Keeps every non-rejected Booking in memory, grouped per room and sorted
+# by start time, so book_venue can check for overlaps without a DB round trip.
+# It also keeps the Rooms catalogue sorted by capacity for the free-room finder.
+#
+# For each room we store three parallel lists ordered by start time:
+#   starts   -> req_start_datetime of each booking
+#   entries  -> (start, end, booking_id)
+#   max_ends -> running maximum of the end times (starts[0..i])
+#
+# An overlap with [start, end) exists when some booking has
+# (booking.start < end) and (booking.end > start). Every booking before
+# bisect_left(starts, end) satisfies the first half, and because max_ends
+# never decreases we can binary search it for the first booking whose end
+# goes past `start`. Both steps are O(log n).
+#
+# The index lives in one process. With several worker processes each would
+# miss the bookings made by the others, so ROOM_INDEX_ENABLED must be turned
+# off (ROOM_INDEX=0) there: lookups then go to the Booking table instead.
+class _RoomSchedule:
+    def __init__(self):
+        self.starts = []
+        self.entries = []
+        self.max_ends = []
+
+    def add(self, start, end, booking_id):
+        entry = (start, end, booking_id)
+        pos = bisect_right(self.entries, entry)
+        self.entries.insert(pos, entry)
+        self.starts.insert(pos, start)
+        self._rebuild_max_ends(pos)
+
+    def remove(self, start, end, booking_id):
+        entry = (start, end, booking_id)
+        pos = bisect_left(self.entries, entry)
+        if pos < len(self.entries) and self.entries[pos] == entry:
+            del self.entries[pos]
+            del self.starts[pos]
+            self._rebuild_max_ends(pos)
+
+    def _rebuild_max_ends(self, pos):
+        # Only the suffix from `pos` onwards can change
+        del self.max_ends[pos:]
+        running = self.max_ends[-1] if self.max_ends else None
+        for _, end, _ in self.entries[pos:]:
+            running = end if running is None or end > running else running
+            self.max_ends.append(running)
+
+    def find_overlap(self, start, end):
+        limit = bisect_left(self.starts, end)
+        if limit == 0:
+            return None
+
+        # First booking (among those starting before `end`) whose end > start
+        pos = bisect_right(self.max_ends, start, 0, limit)
+        if pos == limit:
+            return None
+        return self.entries[pos]
+
+    def find_overlaps(self, start, end):
+        # Every entry overlapping [start, end), in start order
+        limit = bisect_left(self.starts, end)
+        pos = bisect_right(self.max_ends, start, 0, limit)
+        return [entry for entry in self.entries[pos:limit] if entry[1] > start]
+
+    def last_end_before(self, start):
+        # Latest end among the entries that start before `start` (None if there are none)
+        pos = bisect_left(self.starts, start)
+        return self.max_ends[pos - 1] if pos else None
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class RoomAvailabilityIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rooms = {}       # room_id -> _RoomSchedule
+        self._bookings = {}    # booking_id -> (room_id, event_id, start, end)
+        self._by_event = {}    # event_id -> set(booking_id)
+        self._room_info = {}   # room_id -> dict of Rooms columns
+        self._by_capacity = [] # sorted (capacity, room_name, room_id) of active rooms
+        self._loaded = False
+        self.enabled = True
+
+    def init_app(self, app):
+        app.extensions['room_index'] = self
+        self.enabled = app.config.get('ROOM_INDEX_ENABLED', True)
+
+    # ----------------------------------------------------
+    # Loading
+    # ----------------------------------------------------
+    def load(self):
+        rows = db.session.query(
+            Booking.booking_id, Booking.room_id, Booking.event_id,
+            Booking.req_start_datetime, Booking.req_end_datetime
+        ).filter(Booking.status_id != REJECTED_STATUS_ID).all()
+        rooms = db.session.query(
+            Rooms.room_id, Rooms.room_name, Rooms.capacity,
+            Rooms.location, Rooms.room_type, Rooms.is_active
+        ).all()
+
+        with self._lock:
+            self._rooms = {}
+            self._bookings = {}
+            self._by_event = {}
+            for row in rows:
+                self._add(row.booking_id, row.room_id, row.event_id,
+                          row.req_start_datetime, row.req_end_datetime)
+            self._room_info = {}
+            for room in rooms:
+                self._room_info[room.room_id] = self._room_dict(room)
+            self._rebuild_capacity_order()
+            self._loaded = True
+
+    def is_loaded(self):
+        return self._loaded
+
+    def _ensure_loaded(self):
+        # The index is filled once per process, on the first lookup that needs it
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self.load()
+
+    # ----------------------------------------------------
+    # Incremental updates (call after the DB commit succeeds)
+    # ----------------------------------------------------
+    def add_booking(self, booking):
+        if booking.status_id == REJECTED_STATUS_ID:
+            self.remove_booking(booking.booking_id)
+            return
+        with self._lock:
+            if not self._loaded:
+                return
+            self._remove(booking.booking_id)
+            self._add(booking.booking_id, booking.room_id, booking.event_id,
+                      booking.req_start_datetime, booking.req_end_datetime)
+
+    def remove_booking(self, booking_id):
+        with self._lock:
+            self._remove(booking_id)
+
+    def remove_event(self, event_id):
+        with self._lock:
+            for booking_id in list(self._by_event.get(event_id, ())):
+                self._remove(booking_id)
+
+    def refresh_room(self, room):
+        # Call after a Rooms row is added or edited
+        with self._lock:
+            if not self._loaded:
+                return
+            self._room_info[room.room_id] = self._room_dict(room)
+            self._rebuild_capacity_order()
+
+    def remove_room(self, room_id):
+        with self._lock:
+            if self._room_info.pop(room_id, None) is not None:
+                self._rebuild_capacity_order()
+
+    @staticmethod
+    def _room_dict(room):
+        return {
+            'room_id': room.room_id,
+            'room_name': room.room_name,
+            'capacity': int(room.capacity) if room.capacity is not None else 0,
+            'location': room.location,
+            'room_type': room.room_type,
+            'is_active': bool(room.is_active) if room.is_active is not None else True,
+        }
+
+    def _rebuild_capacity_order(self):
+        self._by_capacity = sorted(
+            (info['capacity'], info['room_name'], room_id)
+            for room_id, info in self._room_info.items() if info['is_active']
+        )
+
+    def _add(self, booking_id, room_id, event_id, start, end):
+        # Bookings without a room or time window can never conflict
+        if room_id is None or start is None or end is None:
+            return
+        self._rooms.setdefault(room_id, _RoomSchedule()).add(start, end, booking_id)
+        self._bookings[booking_id] = (room_id, event_id, start, end)
+        self._by_event.setdefault(event_id, set()).add(booking_id)
+
+    def _remove(self, booking_id):
+        found = self._bookings.pop(booking_id, None)
+        if not found:
+            return
+        room_id, event_id, start, end = found
+        self._rooms[room_id].remove(start, end, booking_id)
+        event_bookings = self._by_event.get(event_id)
+        if event_bookings is not None:
+            event_bookings.discard(booking_id)
+            if not event_bookings:
+                del self._by_event[event_id]
+
+    # ----------------------------------------------------
+    # Queries
+    # ----------------------------------------------------
+    def find_conflict(self, room_id, start, end):
+        # Returns (start, end, booking_id) of an overlapping booking, or None
+        if not self.enabled:
+            return _db_conflict(room_id, start, end)
+        self._ensure_loaded()
+        with self._lock:
+            schedule = self._rooms.get(room_id)
+            if schedule is None:
+                return None
+            return schedule.find_overlap(start, end)
+
+    def is_free(self, room_id, start, end):
+        return self.find_conflict(room_id, start, end) is None
+
+    def find_free_rooms(self, start, end, min_capacity=0, exclude_event_id=None):
+        # Every active room with capacity >= min_capacity and no overlapping
+        # non-rejected booking, best fit (smallest spare capacity) first.
+        # Bookings of `exclude_event_id` do not count, so an event's own
+        # request keeps its room in the list.
+        # Rooms are kept sorted by capacity, so we jump straight to the first
+        # one that is big enough and each check is O(log n).
+        if not self.enabled:
+            return _db_free_rooms(start, end, min_capacity, exclude_event_id)
+        self._ensure_loaded()
+        free_rooms = []
+        with self._lock:
+            pos = bisect_left(self._by_capacity, (min_capacity,))
+            for capacity, _, room_id in self._by_capacity[pos:]:
+                schedule = self._rooms.get(room_id)
+                if schedule is not None and self._is_taken(schedule, start, end, exclude_event_id):
+                    continue
+                room = dict(self._room_info[room_id])
+                room['spare_capacity'] = capacity - min_capacity
+                free_rooms.append(room)
+        return free_rooms
+
+    def _is_taken(self, schedule, start, end, exclude_event_id):
+        if exclude_event_id is None:
+            return schedule.find_overlap(start, end) is not None
+        return any(self._bookings[booking_id][1] != exclude_event_id
+                   for _, _, booking_id in schedule.find_overlaps(start, end))
+
+    # ----------------------------------------------------
+    # Consistency check against the Booking table
+    # ----------------------------------------------------
+    def verify(self):
+        # Compares this process's live index (as it is, not reloaded) with the
+        # table; run it inside the server, e.g. from /admin/debug/room-index
+        if not self._loaded:
+            return []
+        rows = db.session.query(
+            Booking.booking_id, Booking.room_id, Booking.event_id,
+            Booking.req_start_datetime, Booking.req_end_datetime
+        ).filter(
+            Booking.status_id != REJECTED_STATUS_ID,
+            Booking.room_id.isnot(None),
+            Booking.req_start_datetime.isnot(None),
+            Booking.req_end_datetime.isnot(None)
+        ).all()
+        expected = {row.booking_id: (row.room_id, row.event_id, row.req_start_datetime, row.req_end_datetime)
+                    for row in rows}
+
+        with self._lock:
+            actual = dict(self._bookings)
+
+        problems = []
+        for booking_id in sorted(expected.keys() - actual.keys()):
+            problems.append(f'Booking {booking_id} is missing from the room index.')
+        for booking_id in sorted(actual.keys() - expected.keys()):
+            problems.append(f'Booking {booking_id} is in the room index but not in the Booking table (or was rejected).')
+        for booking_id in sorted(expected.keys() & actual.keys()):
+            if expected[booking_id] != actual[booking_id]:
+                problems.append(f'Booking {booking_id} differs: index has {actual[booking_id]}, table has {expected[booking_id]}.')
+        return problems
+
+
+# ========================================================
+# DB LOOKUPS (ROOM_INDEX_ENABLED off: several worker processes)
+# ========================================================
+def _db_conflict(room_id, start, end):
+    row = db.session.query(
+        Booking.req_start_datetime, Booking.req_end_datetime, Booking.booking_id
+    ).filter(
+        Booking.room_id == room_id,
+        Booking.status_id != REJECTED_STATUS_ID,
+        Booking.req_start_datetime < end,
+        Booking.req_end_datetime > start
+    ).order_by(Booking.req_start_datetime).first()
+    return tuple(row) if row else None
+
+
+def _db_free_rooms(start, end, min_capacity=0, exclude_event_id=None):
+    taken = db.session.query(Booking.room_id).filter(
+        Booking.room_id.isnot(None),
+        Booking.status_id != REJECTED_STATUS_ID,
+        Booking.req_start_datetime < end,
+        Booking.req_end_datetime > start
+    )
+    if exclude_event_id is not None:
+        taken = taken.filter(or_(Booking.event_id.is_(None), Booking.event_id != exclude_event_id))
+    rooms = db.session.query(
+        Rooms.room_id, Rooms.room_name, Rooms.capacity,
+        Rooms.location, Rooms.room_type, Rooms.is_active
+    ).filter(
+        Rooms.is_active.isnot(False),
+        func.coalesce(Rooms.capacity, 0) >= min_capacity,
+        Rooms.room_id.notin_(taken)
+    ).order_by(func.coalesce(Rooms.capacity, 0), Rooms.room_name, Rooms.room_id).all()
+
+    free_rooms = []
+    for room in rooms:
+        room = RoomAvailabilityIndex._room_dict(room)
+        room['spare_capacity'] = room['capacity'] - min_capacity
+        free_rooms.append(room)
+    return free_rooms
+
+
+room_index = RoomAvailabilityIndex()
@@ -0,0 +1,218 @@
+from datetime import datetime, timedelta
+from models import db, Booking, Rooms
+
+# NumPy is optional: only the utilization report needs it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SLOT_MINUTES = 15
+SLOTS_PER_HOUR = 60 // SLOT_MINUTES
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+# Utilization % is measured against opening hours only (heatmap shows all 24)
+OPEN_HOUR, CLOSE_HOUR = 8, 22
+
+APPROVED = 2
+
+# Longest reporting window, and how many slots are turned into a matrix at a time
+MAX_WINDOW_DAYS = 731
+CHUNK_SLOTS = 31 * 24 * SLOTS_PER_HOUR
+
+
+# ========================================================
+# ROOM UTILIZATION (admin analytics page + flask room-utilization)
+# ========================================================
+# Approved bookings are loaded as arrays of (room, start slot, end slot) and
+# turned into a rooms x 15-minute-slots occupancy matrix in one pass:
+#   +1 at each start slot, -1 at each end slot (np.bincount), then a cumulative
+#   sum along each room's row gives the number of bookings holding the room.
+# Everything after that (heatmap, months, peaks) is column/row sums and
+# bincounts over that matrix - no Python loop over bookings or slots.
+# The matrix is built about a month of slots at a time and folded into
+# per-slot and per-room totals, so memory depends on the number of rooms,
+# not the window length (two years x 2000 rooms peaks around 150 MB).
+# Windows are capped at MAX_WINDOW_DAYS.
+
+def utilization_available():
+    return np is not None
+
+
+def default_window(today=None):
+    # The last 12 months up to the end of today
+    end = datetime.combine((today or datetime.now()).date(), datetime.min.time()) + timedelta(days=1)
+    return end - timedelta(days=365), end
+
+
+def check_window(start, end):
+    if end <= start:
+        raise ValueError('The end date must be after the start date.')
+    if end - start > timedelta(days=MAX_WINDOW_DAYS):
+        raise ValueError(f'The reporting window can be at most {MAX_WINDOW_DAYS} days.')
+
+
+def load_intervals(start, end):
+    # (room_ids, room_names, room index per booking, start slot, end slot) clipped to the window
+    rooms = db.session.query(Rooms.room_id, Rooms.room_name).order_by(Rooms.room_id).all()
+    room_ids = np.array([r.room_id for r in rooms], dtype=np.int64)
+    room_names = [r.room_name for r in rooms]
+
+    rows = db.session.query(Booking.room_id, Booking.req_start_datetime, Booking.req_end_datetime).filter(
+        Booking.status_id == APPROVED,
+        Booking.room_id.isnot(None),
+        Booking.req_start_datetime < end,
+        Booking.req_end_datetime > start
+    ).all()
+
+    # Minutes from the window start (building datetime64 arrays from datetime
+    # objects is several times slower than this for tens of thousands of rows)
+    minute = timedelta(minutes=1)
+    booking_rooms = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    starts = np.fromiter(((r[1] - start) // minute for r in rows), dtype=np.int64, count=len(rows))
+    ends = np.fromiter(((r[2] - start) // minute for r in rows), dtype=np.int64, count=len(rows))
+
+    # Map room_id -> row number (bookings for rooms that no longer exist are dropped)
+    room_index = np.searchsorted(room_ids, booking_rooms)
+    known = np.isin(booking_rooms, room_ids)
+
+    n_slots = (end - start) // minute // SLOT_MINUTES
+    start_slot = np.clip(starts // SLOT_MINUTES, 0, n_slots)
+    # A booking occupies every slot it touches, so round the end up
+    end_slot = np.clip(-(-ends // SLOT_MINUTES), 0, n_slots)
+    valid = known & (end_slot > start_slot)
+
+    return room_ids, room_names, room_index[valid], start_slot[valid], end_slot[valid], n_slots
+
+
+def occupancy_matrix(n_rooms, room_index, start_slot, end_slot, n_slots):
+    # rooms x slots array: number of approved bookings holding each room in each slot
+    width = n_slots + 1
+    diff = np.bincount(room_index * width + start_slot, minlength=n_rooms * width) \
+        - np.bincount(room_index * width + end_slot, minlength=n_rooms * width)
+    return np.cumsum(diff.reshape(n_rooms, width), axis=1, dtype=np.int32)[:, :n_slots]
+
+
+def utilization_report(start=None, end=None):
+    if np is None:
+        raise RuntimeError('NumPy is required for the utilization report (pip install numpy).')
+    if start is None or end is None:
+        start, end = default_window()
+    check_window(start, end)
+
+    room_ids, room_names, room_index, start_slot, end_slot, n_slots = load_intervals(start, end)
+    n_rooms = len(room_ids)
+
+    # Calendar position of every slot
+    slot_times = np.datetime64(start, 'm') + np.arange(n_slots) * np.timedelta64(SLOT_MINUTES, 'm')
+    days = slot_times.astype('datetime64[D]')
+    weekday = (days.astype(np.int64) + 3) % 7          # 1970-01-01 was a Thursday; 0 = Monday
+    hour = (slot_times - days).astype(np.int64) // 60
+    month = slot_times.astype('datetime64[M]')
+    open_slot = (hour >= OPEN_HOUR) & (hour < CLOSE_HOUR)
+
+    busy_per_slot = np.zeros(n_slots, dtype=np.int64)  # rooms in use, per slot
+    concurrent = np.zeros(n_slots, dtype=np.int64)     # bookings running, per slot
+    room_busy_open = np.zeros(n_rooms, dtype=np.int64)
+    room_busy = np.zeros(n_rooms, dtype=np.int64)
+    room_peak = np.zeros(n_rooms, dtype=np.int64)
+    room_overbooked = np.zeros(n_rooms, dtype=np.int64)
+
+    # Occupancy matrix one chunk of slots at a time, bookings clipped to the chunk
+    for first in range(0, n_slots, CHUNK_SLOTS):
+        last = min(first + CHUNK_SLOTS, n_slots)
+        width = last - first
+        inside = (start_slot < last) & (end_slot > first)
+        occupancy = occupancy_matrix(n_rooms, room_index[inside],
+                                     np.clip(start_slot[inside] - first, 0, width),
+                                     np.clip(end_slot[inside] - first, 0, width), width)
+        busy = occupancy > 0
+        busy_per_slot[first:last] = busy.sum(axis=0)
+        concurrent[first:last] = occupancy.sum(axis=0)
+        room_busy_open += (busy & open_slot[first:last]).sum(axis=1)
+        room_busy += busy.sum(axis=1)
+        room_overbooked += (occupancy > 1).sum(axis=1)
+        if n_rooms:
+            np.maximum(room_peak, occupancy.max(axis=1), out=room_peak)
+
+    # Hour-of-day x weekday heatmap: share of room-slots in use
+    cell = weekday * 24 + hour
+    cell_busy = np.bincount(cell, weights=busy_per_slot, minlength=7 * 24)
+    cell_total = np.bincount(cell, minlength=7 * 24) * max(n_rooms, 1)
+    heatmap = np.divide(cell_busy * 100, cell_total, out=np.zeros(7 * 24), where=cell_total > 0).reshape(7, 24)
+
+    # Monthly utilization (opening hours)
+    months, month_of_slot = np.unique(month, return_inverse=True)
+    month_busy = np.bincount(month_of_slot, weights=busy_per_slot * open_slot, minlength=len(months))
+    month_total = np.bincount(month_of_slot, weights=open_slot, minlength=len(months)) * max(n_rooms, 1)
+    monthly = np.divide(month_busy * 100, month_total, out=np.zeros(len(months)), where=month_total > 0)
+
+    # Per room
+    open_slots = max(int(open_slot.sum()), 1)
+    room_util = room_busy_open * 100 / open_slots
+    room_booked_hours = room_busy / SLOTS_PER_HOUR
+    room_overbooked_hours = room_overbooked / SLOTS_PER_HOUR
+
+    rooms = [{
+        'room_id': int(room_ids[i]),
+        'room_name': room_names[i],
+        'utilization': round(float(room_util[i]), 1),
+        'booked_hours': float(room_booked_hours[i]),
+        'peak_concurrency': int(room_peak[i]),
+        'overbooked_hours': float(room_overbooked_hours[i]),
+    } for i in np.argsort(-room_util, kind='stable')]
+
+    peak_slot = int(concurrent.argmax()) if n_slots else 0
+    return {
+        'start': start,
+        'end': end,
+        'bookings': int(len(start_slot)),
+        'rooms': rooms,
+        'idle_rooms': [r for r in rooms if r['booked_hours'] == 0],
+        'overbooked_rooms': [r for r in rooms if r['peak_concurrency'] > 1],
+        'heatmap': [[round(float(v), 1) for v in row] for row in heatmap],
+        'heatmap_max': round(float(heatmap.max()), 1) if heatmap.size else 0,
+        'monthly': [(str(m), round(float(v), 1)) for m, v in zip(months, monthly)],
+        'overall_utilization': round(float(monthly.mean()), 1) if len(monthly) else 0,
+        'peak_concurrency': int(concurrent[peak_slot]) if n_slots else 0,
+        'peak_at': slot_times[peak_slot].astype(datetime) if n_slots and concurrent[peak_slot] else None,
+        'rooms_in_use_peak': int(busy_per_slot.max()) if n_slots else 0,
+    }
+
+
+def init_app(app):
+    import click
+
+    @app.cli.command('room-utilization')
+    @click.option('--start', type=click.DateTime(formats=['%Y-%m-%d']), help='first day (default: a year ago)')
+    @click.option('--end', type=click.DateTime(formats=['%Y-%m-%d']), help='day after the last one (default: tomorrow)')
+    @click.option('--top', default=10, help='rooms to list')
+    def room_utilization_command(start, end, top):
+        """Room utilization from approved bookings (needs NumPy)."""
+        if np is None:
+            print('NumPy is not installed (pip install numpy).')
+            return
+        default_start, default_end = default_window()
+        started = datetime.now()
+        try:
+            report = utilization_report(start or default_start, end or default_end)
+        except ValueError as e:
+            print(e)
+            return
+        elapsed = (datetime.now() - started).total_seconds()
+
+        print(f"{report['start']:%Y-%m-%d} to {report['end']:%Y-%m-%d}: {report['bookings']} approved booking(s), "
+              f"{len(report['rooms'])} room(s), computed in {elapsed:.2f}s")
+        print(f"Overall utilization ({OPEN_HOUR}:00-{CLOSE_HOUR}:00): {report['overall_utilization']}%")
+        if report['peak_at']:
+            print(f"Peak: {report['peak_concurrency']} booking(s) at once, {report['peak_at']:%Y-%m-%d %H:%M}")
+        print('\nBusiest rooms:')
+        for room in report['rooms'][:top]:
+            print(f"  {room['room_name']:<30} {room['utilization']:>5}%  {room['booked_hours']:>7.1f}h")
+        print(f"\nIdle rooms: {', '.join(r['room_name'] for r in report['idle_rooms']) or 'none'}")
+        for room in report['overbooked_rooms']:
+            print(f"OVERBOOKED: {room['room_name']} - up to {room['peak_concurrency']} bookings at once, "
+                  f"{room['overbooked_hours']}h in total")
+        print('\nMonthly utilization:')
+        for month, pct in report['monthly']:
+            print(f'  {month}  {pct:>5}%')
@@ -0,0 +1,96 @@
+from datetime import datetime
+from models import db, Event, Registration
+from cache import TTLCache
+from room_index import _RoomSchedule
+
+# Registrations that hold a place in the student's day
+ACTIVE_REGISTRATION = ('Confirmed', 'Waitlisted')
+
+MAX_LISTED = 5
+
+
+# ========================================================
+# PERSONAL SCHEDULE CLASHES (hosts and attendees)
+# ========================================================
+# Venue checks only look at rooms. These look at people, and only warn:
+#
+# host_clashes()    - the organizer's / lecturer's other events overlapping a
+#                     time window. Served by ix_event_organizer_end /
+#                     ix_event_lecturer_end (host, end_datetime, start_datetime):
+#                     "end_datetime > start" is a range on the index, so the
+#                     host's finished events are never read.
+# student_clashes() - the student's registered events overlapping a window.
+#                     Each student's registrations for events that are not over
+#                     yet are kept as a sorted interval list (the room index's
+#                     schedule structure), loaded once and then answered with a
+#                     binary search. Call invalidate_student() after the
+#                     student's registrations change, and
+#                     invalidate_student_schedules() when events with
+#                     registrations are moved or deleted.
+#   Other worker processes pick changes up when their entry expires (ttl).
+
+_student_schedules = TTLCache(maxsize=5000, ttl=300)
+
+
+def _describe(events):
+    return [{'event_id': e.event_id, 'title': e.title,
+             'start_datetime': e.start_datetime, 'end_datetime': e.end_datetime} for e in events]
+
+
+def host_clashes(start, end, organizer_id=None, lecturer_id=None, exclude_event_id=None):
+    # Up to MAX_LISTED of the host's events overlapping [start, end), earliest first
+    if start is None or end is None or not (organizer_id or lecturer_id):
+        return []
+    if organizer_id:
+        query = Event.query.filter(Event.organizer_id == organizer_id)
+    else:
+        query = Event.query.filter(Event.lecturer_id == lecturer_id)
+    query = query.filter(Event.end_datetime > start, Event.start_datetime < end)
+    if exclude_event_id is not None:
+        query = query.filter(Event.event_id != exclude_event_id)
+    return _describe(query.order_by(Event.start_datetime).limit(MAX_LISTED).all())
+
+
+def _student_schedule(student_id):
+    schedule = _student_schedules.get(student_id)
+    if schedule is None:
+        # Only events that have not ended yet: a new registration can never
+        # clash with one in the past
+        rows = db.session.query(Event.start_datetime, Event.end_datetime, Event.event_id).join(
+            Registration, Registration.event_id == Event.event_id
+        ).filter(
+            Registration.student_id == student_id,
+            Registration.status.in_(ACTIVE_REGISTRATION),
+            Event.end_datetime > datetime.now()
+        ).all()
+        schedule = _RoomSchedule()
+        for start, end, event_id in rows:
+            if start is not None:
+                schedule.add(start, end, event_id)
+        _student_schedules.set(student_id, schedule)
+    return schedule
+
+
+def student_clashes(student_id, start, end, exclude_event_id=None):
+    # Up to MAX_LISTED registered events overlapping [start, end), earliest first
+    if start is None or end is None:
+        return []
+    event_ids = [event_id for _, _, event_id in _student_schedule(student_id).find_overlaps(start, end)
+                 if event_id != exclude_event_id][:MAX_LISTED]
+    if not event_ids:
+        return []
+    return _describe(Event.query.filter(Event.event_id.in_(event_ids)).order_by(Event.start_datetime).all())
+
+
+def invalidate_student(student_id):
+    _student_schedules.pop(student_id)
+
+
+def invalidate_student_schedules():
+    _student_schedules.clear()
+
+
+def clash_message(clashes, prefix):
+    # "<prefix> Python Bootcamp (12 Mar, 10:00 AM), Git Workshop (12 Mar, 02:00 PM)."
+    listed = ', '.join(f"{c['title']} ({c['start_datetime'].strftime('%d %b, %I:%M %p')})" for c in clashes)
+    return f'{prefix} {listed}.'
@@ -0,0 +1,115 @@
+import threading
+from datetime import datetime
+from flask import current_app, request
+from models import db, Event
+from listing_cache import invalidate_listings
+
+
+# ========================================================
+# BACKGROUND SCHEDULER
+# ========================================================
+# Runs housekeeping jobs on daemon threads, each one in its own app context,
+# so request handlers never have to do it. Nothing starts on import or for
+# `flask <command>`: the jobs start with the first request a server handles.
+#   SCHEDULER_ENABLED unset - only under the development server
+#                             (python app.py / flask run), the default setup
+#   SCHEDULER_ENABLED=1/0   - always / never in the web process
+#   flask run-scheduler     - one foreground process next to the web workers
+#                             (use this with gunicorn, so there is one copy)
+class Scheduler:
+    def __init__(self):
+        self._jobs = []  # (name, function, interval in seconds)
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._decided = False
+
+    def add_job(self, name, func, interval):
+        self._jobs.append((name, func, interval))
+
+    def init_app(self, app):
+        app.extensions['scheduler'] = self
+        enabled = app.config.get('SCHEDULER_ENABLED')  # True, False or None (dev server only)
+        if enabled is False:
+            return
+
+        @app.before_request
+        def start_scheduler():
+            # Decided on the first request; after that this is one unlocked check
+            if self._decided:
+                return
+            if enabled or request.environ.get('SERVER_SOFTWARE', '').startswith('Werkzeug/'):
+                self.start(app)
+            self._decided = True
+
+    def start(self, app):
+        with self._lock:
+            if self._threads:
+                return
+            for name, func, interval in self._jobs:
+                thread = threading.Thread(target=self._run, args=(app, name, func, interval),
+                                          name=f'scheduler-{name}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def run_forever(self, app):
+        # Foreground: start the jobs and block until Ctrl+C
+        self.start(app)
+        try:
+            while not self._stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            self.stop()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, app, name, func, interval):
+        # Run once straight away, then every `interval` seconds
+        while not self._stop.is_set():
+            with app.app_context():
+                try:
+                    func()
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.error(f'Scheduled job "{name}" failed: {e}')
+                finally:
+                    db.session.remove()
+            self._stop.wait(interval)
+
+
+# ========================================================
+# JOB: AUTO-EXPIRE EVENTS
+# ========================================================
+def expire_events():
+    # One set-based UPDATE for every 'Upcoming' event that has already ended
+    now = datetime.now()
+    updated = Event.query.filter(
+        Event.end_datetime < now,
+        Event.event_status == 'Upcoming'
+    ).update({Event.event_status: 'Expired', Event.updated_at: now}, synchronize_session=False)
+    db.session.commit()
+    if updated:
+        invalidate_listings()
+    return updated
+
+
+scheduler = Scheduler()
+scheduler.add_job('expire-events', expire_events, interval=300)
+
+
+def init_app(app):
+    @app.cli.command('expire-events')
+    def expire_events_command():
+        """Mark 'Upcoming' events whose end time has passed as 'Expired'."""
+        count = expire_events()
+        print(f'{count} event(s) marked as Expired.')
+
+    @app.cli.command('run-scheduler')
+    def run_scheduler_command():
+        """Run the background jobs in the foreground until stopped (one per deployment)."""
+        print('Running ' + ', '.join(f'{name} (every {interval}s)' for name, _, interval in scheduler._jobs)
+              + '. Press Ctrl+C to stop.')
+        scheduler.run_forever(current_app._get_current_object())
+
+    scheduler.init_app(app)
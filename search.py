@@ -0,0 +1,237 @@
+import re
+import threading
+from bisect import bisect_left, insort
+from sqlalchemy import event as sa_event, select, union, table, column, text, false, Integer
+from sqlalchemy.dialects.mysql import match
+from models import db, Event, Category
+
+# Relevance weights per field
+TITLE_WEIGHT = 3
+CATEGORY_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+# In-process backend: the matches of the current search, per DB connection,
+# so the view's query can join and order by them
+search_hits = table('search_hits', column('event_id', Integer), column('score', Integer))
+
+
+def tokenize(value):
+    return re.findall(r'\w+', (value or '').lower())
+
+
+# ========================================================
+# EVENT SEARCH
+# ========================================================
+# Full-text search over event title, description and category name.
+#  - MySQL: FULLTEXT indexes queried with MATCH ... AGAINST in boolean mode
+#  - Anything else (SQLite, tests): an in-process inverted index
+# Every query term is a prefix match and all terms must match, each in any of
+# the three fields ("python workshop" finds a Python talk filed under
+# Workshop) on both backends.
+#
+# Search is applied to the view's own query, so timeframe, status, category
+# and host filters narrow the matches in the same statement, and relevance
+# order and LIMIT run in the database too: a page of results never loads the
+# full list of matching IDs into Python.
+#  - MySQL: one derived table per term, the UNION of the title/description
+#    FULLTEXT hits and the events whose category name matches, joined to the
+#    query (no OR, so each branch can use its FULLTEXT index)
+#  - in-process: the index's scores go into a TEMP table (search_hits) on the
+#    request's connection, which the query joins and orders by
+class EventSearch:
+    def __init__(self):
+        self._memory_index = InvertedEventIndex()
+
+    def init_app(self, app):
+        app.extensions['event_search'] = self
+
+        # Keep the in-process index in step with committed Event/Category changes
+        sa_event.listen(db.session, 'after_flush', self._memory_index.collect_changes)
+        sa_event.listen(db.session, 'after_commit', self._memory_index.apply_changes)
+        sa_event.listen(db.session, 'after_rollback', self._memory_index.discard_changes)
+
+    def filter(self, query, search_text):
+        # `query` (any query over Event, or joined to it) narrowed to the matches
+        terms = tokenize(search_text)
+        if not terms:
+            return query.filter(false())
+        if db.engine.dialect.name == 'mysql':
+            for i, term in enumerate(terms):
+                hits = _mysql_term_hits(term).subquery(f'search_term_{i}')
+                query = query.join(hits, hits.c.event_id == Event.event_id)
+            return query
+        self._fill_hits(terms)
+        return query.join(search_hits, search_hits.c.event_id == Event.event_id)
+
+    def order_by_relevance(self, query, search_text):
+        # A query that went through filter(), best match first
+        terms = tokenize(search_text)
+        if not terms:
+            return query
+        if db.engine.dialect.name == 'mysql':
+            score = match(Event.title, Event.description,
+                          against=' '.join(f'{term}*' for term in terms)).in_boolean_mode()
+            return query.order_by(score.desc(), Event.event_id.desc())
+        return query.order_by(search_hits.c.score.desc(), Event.event_id.desc())
+
+    def _fill_hits(self, terms):
+        # TEMP tables are private to the connection, which the session keeps
+        # for the rest of the request (one search per request)
+        scores = self._memory_index.scores(terms)
+        db.session.execute(text('CREATE TEMP TABLE IF NOT EXISTS search_hits '
+                                '(event_id INTEGER PRIMARY KEY, score INTEGER NOT NULL)'))
+        db.session.execute(search_hits.delete())
+        if scores:
+            db.session.execute(search_hits.insert(),
+                               [{'event_id': event_id, 'score': score} for event_id, score in scores.items()])
+
+
+def _mysql_term_hits(term):
+    # IDs of events where '+term*' matches the title/description or the category name
+    against = f'+{term}*'
+    return union(
+        select(Event.event_id).where(match(Event.title, Event.description, against=against).in_boolean_mode()),
+        select(Event.event_id).join(Category, Category.category_id == Event.category_id)
+                              .where(match(Category.category_name, against=against).in_boolean_mode()),
+    )
+
+
+# ========================================================
+# IN-PROCESS INVERTED INDEX (SQLite / test deployments)
+# ========================================================
+class InvertedEventIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}     # token -> {event_id: weight}
+        self._tokens = []       # sorted list of tokens, for prefix lookups
+        self._events = {}       # event_id -> (title, description, category_id)
+        self._event_tokens = {} # event_id -> {token: weight}
+        self._categories = {}   # category_id -> category_name
+        self._loaded = False
+
+    def load(self):
+        events = db.session.query(
+            Event.event_id, Event.title, Event.description, Event.category_id
+        ).all()
+        categories = db.session.query(Category.category_id, Category.category_name).all()
+
+        with self._lock:
+            self._postings = {}
+            self._tokens = []
+            self._events = {}
+            self._event_tokens = {}
+            self._categories = dict(categories)
+            for row in events:
+                self._index_event(row.event_id, row.title, row.description, row.category_id)
+            self._loaded = True
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self.load()
+
+    # ----------------------------------------------------
+    # Queries
+    # ----------------------------------------------------
+    def scores(self, terms):
+        # {event_id: relevance} for every event matching all terms
+        self._ensure_loaded()
+        with self._lock:
+            scores = None
+            for term in terms:
+                term_scores = {}
+                pos = bisect_left(self._tokens, term)
+                while pos < len(self._tokens) and self._tokens[pos].startswith(term):
+                    for event_id, weight in self._postings[self._tokens[pos]].items():
+                        if weight > term_scores.get(event_id, 0):
+                            term_scores[event_id] = weight
+                    pos += 1
+
+                # AND semantics: keep only events matching every term so far
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {event_id: score + term_scores[event_id]
+                              for event_id, score in scores.items() if event_id in term_scores}
+                if not scores:
+                    return {}
+        return scores
+
+    # ----------------------------------------------------
+    # Index maintenance
+    # ----------------------------------------------------
+    def _index_event(self, event_id, title, description, category_id):
+        self._unindex_event(event_id)
+
+        weights = {}
+        for token in tokenize(description):
+            weights[token] = max(weights.get(token, 0), DESCRIPTION_WEIGHT)
+        for token in tokenize(self._categories.get(category_id)):
+            weights[token] = max(weights.get(token, 0), CATEGORY_WEIGHT)
+        for token in tokenize(title):
+            weights[token] = max(weights.get(token, 0), TITLE_WEIGHT)
+
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._tokens, token)
+            postings[event_id] = weight
+
+        self._events[event_id] = (title, description, category_id)
+        self._event_tokens[event_id] = weights
+
+    def _unindex_event(self, event_id):
+        for token in self._event_tokens.pop(event_id, {}):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(event_id, None)
+            if not postings:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+        self._events.pop(event_id, None)
+
+    # ----------------------------------------------------
+    # Session hooks: snapshot changes at flush, apply them on commit
+    # ----------------------------------------------------
+    def collect_changes(self, session, flush_context):
+        changes = session.info.setdefault('search_changes', [])
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, Event):
+                changes.append(('event', obj.event_id, obj.title, obj.description, obj.category_id))
+            elif isinstance(obj, Category):
+                changes.append(('category', obj.category_id, obj.category_name))
+        for obj in session.deleted:
+            if isinstance(obj, Event):
+                changes.append(('event_deleted', obj.event_id))
+            elif isinstance(obj, Category):
+                changes.append(('category_deleted', obj.category_id))
+
+    def apply_changes(self, session):
+        changes = session.info.pop('search_changes', None)
+        if not changes or not self._loaded:
+            return
+        with self._lock:
+            for change in changes:
+                kind = change[0]
+                if kind == 'event':
+                    self._index_event(*change[1:])
+                elif kind == 'event_deleted':
+                    self._unindex_event(change[1])
+                elif kind == 'category':
+                    _, category_id, name = change
+                    self._categories[category_id] = name
+                    # Re-index the events filed under a renamed category
+                    for event_id, (title, description, cat_id) in list(self._events.items()):
+                        if cat_id == category_id:
+                            self._index_event(event_id, title, description, cat_id)
+                elif kind == 'category_deleted':
+                    self._categories.pop(change[1], None)
+
+    def discard_changes(self, session):
+        session.info.pop('search_changes', None)
+
+
+event_search = EventSearch()
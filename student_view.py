@@ -2,6 +2,17 @@ from flask import Blueprint, render_template, url_for, request, redirect, flash
 from flask_login import login_required, current_user
 from models import db, Student, Event, Registration, Category, Organizer, Lecturer, Feedback,Announcements, Admin
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from loading import eager
+from feedback_rollups import record_feedback
+from announcement_badges import get_announcement_ids
+from registrations import reserve_seat, release_seat, promote_next_waitlisted, spots_left
+from admission import admission_queue, CONFIRMED, WAITLISTED, DUPLICATE
+from pagination import paginate_events, paginate_ranked
+from search import event_search
+from listing_cache import listing_cache
+from schedule_conflicts import student_clashes, invalidate_student, clash_message
 
 student_view = Blueprint('student_view', __name__)
 
@@ -14,9 +25,20 @@ def home():
     if not isinstance(current_user, (Student, Organizer, Lecturer)):
         return redirect(url_for('auth.login'))
 
-    current_dt = datetime.now()
     categories = Category.query.all()
 
+    # Event cards are the same for everyone: cached (listing_cache.py)
+    listing_html = listing_cache.fragment('student.home', {}, render_home_listing)
+
+    return render_template('student/home.html', 
+                           user=current_user, 
+                           categories_nav=categories, 
+                           listing_html=listing_html)
+
+
+def render_home_listing():
+    current_dt = datetime.now()
+
     # --- QUERY 1: UPCOMING (Soonest Date First) ---
     upcoming_events = Event.query.filter(
         Event.start_datetime >= current_dt,
@@ -29,9 +51,7 @@ def home():
         Event.event_status == 'Upcoming'
     ).order_by(Event.event_id.desc()).limit(3).all()
 
-    return render_template('student/home.html', 
-                           user=current_user, 
-                           categories_nav=categories, 
+    return render_template('student/home_listing.html',
                            upcoming_events=upcoming_events,
                            new_events=new_events)
 
@@ -53,9 +73,29 @@ def events():
     # NEW: Timeframe Filter ('upcoming' is default)
     timeframe = request.args.get('timeframe', 'upcoming') 
 
-    current_dt = datetime.now()
     categories = Category.query.all()
 
+    # Event cards + pagination are cached per filter combination (listing_cache.py)
+    params = dict(category=category_id, search=search_query, sort=sort, timeframe=timeframe,
+                  after=request.args.get('after'), before=request.args.get('before'),
+                  page=request.args.get('page'))
+    listing_html = listing_cache.fragment(
+        'student.events', params,
+        lambda: render_events_listing(category_id, search_query, sort, timeframe))
+
+    return render_template('student/events.html', 
+                           user=current_user,
+                           listing_html=listing_html,
+                           categories_nav=categories,
+                           search_query=search_query,
+                           current_category=category_id,
+                           current_sort=sort,
+                           current_timeframe=timeframe)
+
+
+def render_events_listing(category_id, search_query, sort, timeframe):
+    current_dt = datetime.now()
+
     # Base Query
     query = Event.query
 
@@ -73,35 +113,34 @@ def events():
     if category_id:
         query = query.filter(Event.category_id == category_id)
 
-    # 3. Search Filter
+    # 3. Search Filter (full-text index over title, description and category)
     if search_query:
-        query = query.filter(Event.title.ilike(f'%{search_query}%'))
+        query = event_search.filter(query, search_query)
 
 # 4. Sorting
     if sort == 'newest':
         # Newest to Oldest (Latest date first)
-        query = query.order_by(Event.start_datetime.desc())
+        descending = True
         
     elif sort == 'oldest':
         # Oldest to Newest (Earliest date first)
-        query = query.order_by(Event.start_datetime.asc())
+        descending = False
         
     else:
         # Default Logic (Smart Sort)
         # If looking at Past events -> Show most recent first (Newest)
         # If looking at Upcoming events -> Show soonest first (Oldest/Earliest)
-        if timeframe == 'past':
-            query = query.order_by(Event.start_datetime.desc())
-        else:
-            query = query.order_by(Event.start_datetime.asc())
+        descending = (timeframe == 'past')
 
-    page = request.args.get('page', 1, type=int)
-    events_paginated = query.paginate(page=page, per_page=6)
+    # 5. Keyset pagination on (start_datetime, event_id) - no OFFSET, no COUNT(*)
+    # Searches without an explicit sort are shown best match first
+    if search_query and not sort:
+        events_paginated = paginate_ranked(event_search.order_by_relevance(query, search_query), per_page=6)
+    else:
+        events_paginated = paginate_events(query, descending=descending, per_page=6)
 
-    return render_template('student/events.html', 
-                           user=current_user,
+    return render_template('student/events_listing.html',
                            events=events_paginated, 
-                           categories_nav=categories,
                            search_query=search_query,
                            current_category=category_id,
                            current_sort=sort,
@@ -119,23 +158,27 @@ def event_details(event_id):
         return redirect(url_for('auth.login'))
 
     event = Event.query.get_or_404(event_id)
-    
-    # Calculate spots left
-    confirmed_count = Registration.query.filter_by(event_id=event_id, status='Confirmed').count()
-    spots_left = event.capacity - confirmed_count
 
     # Check if THIS specific user is already registered (Only if they are a student)
     is_registered = False
+    registration_status = None
+    clashes = []
     if isinstance(current_user, Student):
         check_reg = Registration.query.filter_by(student_id=current_user.student_id, event_id=event_id).first()
         if check_reg:
             is_registered = True
+            registration_status = check_reg.status
+        else:
+            # Warn before registering if the student is already busy at that time
+            clashes = student_clashes(current_user.student_id, event.start_datetime, event.end_datetime, event_id)
 
     return render_template('student/event_details.html', 
                            user=current_user, 
                            event=event, 
-                           spots_left=spots_left, 
-                           is_registered=is_registered)
+                           spots_left=spots_left(event), 
+                           is_registered=is_registered,
+                           registration_status=registration_status,
+                           clashes=clashes)
 
 
 # ========================================================
@@ -157,13 +200,32 @@ def register_event(event_id):
         flash('You are already registered.', 'info')
         return redirect(url_for('student_view.event_details', event_id=event_id))
 
-    # 2. Check Capacity
-    count = Registration.query.filter_by(event_id=event_id, status='Confirmed').count()
-    if count >= event.capacity:
+    # Overlapping registrations only warn; the student may still register
+    clashes = student_clashes(current_user.student_id, event.start_datetime, event.end_datetime, event_id)
+
+    # 2. High-demand events: queued, confirmed or waitlisted in batches
+    if event.high_demand:
+        outcome = admission_queue.submit(current_user.student_id, event_id)
+        invalidate_student(current_user.student_id)
+        if outcome == CONFIRMED:
+            flash('Successfully registered!.', 'success')
+        elif outcome == WAITLISTED:
+            flash('The event is full, so you have been added to the waitlist. You will be registered automatically if a spot opens up.', 'info')
+        elif outcome == DUPLICATE:
+            flash('You are already registered.', 'info')
+        else:
+            flash('Registration is very busy right now. Check My Registrations in a moment before trying again.', 'warning')
+        if outcome in (CONFIRMED, WAITLISTED) and clashes:
+            flash(clash_message(clashes, 'Heads up: this overlaps'), 'warning')
+        return redirect(url_for('student_view.my_registrations'))
+
+    # 3. Take a seat (atomic: fails if the event is already full)
+    if not reserve_seat(event_id):
+        db.session.rollback()
         flash('Registration closed.Event Fully Booked', 'danger')
         return redirect(url_for('student_view.event_details', event_id=event_id))
 
-    # 3. Create Registration
+    # 4. Create Registration
     new_reg = Registration(
         student_id=current_user.student_id,
         event_id=event_id,
@@ -171,9 +233,18 @@ def register_event(event_id):
         registration_date=datetime.now()
     )
     db.session.add(new_reg)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Double submit: uq_registration_student_event already has this pair
+        db.session.rollback()
+        flash('You are already registered.', 'info')
+        return redirect(url_for('student_view.event_details', event_id=event_id))
+    invalidate_student(current_user.student_id)
 
     flash('Successfully registered!.', 'success')
+    if clashes:
+        flash(clash_message(clashes, 'Heads up: this overlaps'), 'warning')
     return redirect(url_for('student_view.my_registrations'))
 
 
@@ -187,7 +258,8 @@ def my_registrations():
     if not isinstance(current_user, Student):
         return redirect(url_for('student_view.home'))
 
-    registrations = Registration.query.filter_by(student_id=current_user.student_id).all()
+    registrations = Registration.query.filter_by(student_id=current_user.student_id)\
+                                      .options(*eager(joinedload(Registration.event))).all()
     
     # Get list of events user has already reviewed
     feedback_list = Feedback.query.filter_by(student_id=current_user.student_id).all()
@@ -218,8 +290,12 @@ def cancel_registration(event_id):
 
     reg = Registration.query.filter_by(student_id=current_user.student_id, event_id=event_id).first()
     if reg:
+        # A freed seat goes to the first waitlisted student, otherwise back to the pool
+        if reg.status == 'Confirmed' and promote_next_waitlisted(event_id) is None:
+            release_seat(event_id)
         db.session.delete(reg)
         db.session.commit()
+        invalidate_student(current_user.student_id)
         flash('Registration cancelled successfully.', 'success')
     
     return redirect(url_for('student_view.my_registrations'))
@@ -234,10 +310,16 @@ def submit_feedback(event_id):
     if not isinstance(current_user, Student):
         return redirect(url_for('student_view.home'))
 
-    # 1. Save
-    rating = request.form.get('rating')
+    event = Event.query.get_or_404(event_id)
+
+    # 1. Validate (the rollup histogram only has 1-5 stars)
+    rating = request.form.get('rating', type=int)
     comments = request.form.get('comments')
+    if rating not in (1, 2, 3, 4, 5):
+        flash('Please choose a rating from 1 to 5 stars.', 'warning')
+        return redirect(url_for('student_view.my_registrations'))
 
+    # 2. Save, updating the event/host rating rollups in the same transaction
     new_feedback = Feedback(
         student_id=current_user.student_id,
         event_id=event_id,
@@ -246,6 +328,7 @@ def submit_feedback(event_id):
         submitted_at=datetime.now()
     )
     db.session.add(new_feedback)
+    record_feedback(new_feedback, event)
     db.session.commit()
 
     flash('Feedback submitted!', 'success')
@@ -287,15 +370,18 @@ def view_club_events(organizer_id):
     # Get the specific organizer
     org = Organizer.query.filter_by(organizer_id=organizer_id).first_or_404()
 
-    # Get ONLY their upcoming events
-    current_dt = datetime.now()
-    club_events = Event.query.filter(
-        Event.organizer_id == organizer_id,
-        Event.event_status == 'Upcoming',
-        Event.start_datetime >= current_dt
-    ).order_by(Event.start_datetime.asc()).all()
+    # Get ONLY their upcoming events (cards cached per club, listing_cache.py)
+    def render_listing():
+        club_events = Event.query.filter(
+            Event.organizer_id == organizer_id,
+            Event.event_status == 'Upcoming',
+            Event.start_datetime >= datetime.now()
+        ).order_by(Event.start_datetime.asc()).all()
+        return render_template('student/club_events_listing.html', events=club_events)
+
+    listing_html = listing_cache.fragment('student.club_events', {'organizer_id': organizer_id}, render_listing)
 
-    return render_template('student/club_events.html', organizer=org, events=club_events)
+    return render_template('student/club_events.html', organizer=org, listing_html=listing_html)
 
 
 # ========================================================
@@ -321,13 +407,11 @@ def announcements():
 @student_view.context_processor
 def inject_announcement_ids():
     if current_user.is_authenticated:
-        # UPDATED: Added current_user.student_id here too for the notification badge
-        recent_anns = Announcements.query.filter(
-            Announcements.target_audience.in_(['All', 'Student', current_user.student_id])
-        ).order_by(Announcements.sent_at.desc()).all()
-        
+        # Served from a versioned cache: only a version check every few seconds
+        ids = get_announcement_ids('Student', current_user.student_id)
+
         # Pass the list of IDs to all templates
-        return dict(recent_announcement_ids=[a.announcement_id for a in recent_anns])
+        return dict(recent_announcement_ids=ids)
     
     return dict(recent_announcement_ids=[])
 
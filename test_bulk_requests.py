@@ -0,0 +1,68 @@
+"""
+Bulk approval with a stale room-assignment proposal (bulk_requests.process_bulk).
+
+    python -m pytest test_bulk_requests.py
+
+Runs against an in-memory SQLite database.
+"""
+from datetime import datetime
+import pytest
+from flask import Flask
+from models import db, RequestStatus, Admin, Rooms, Event, Booking
+from room_index import room_index
+from bulk_requests import process_bulk, PENDING, APPROVED
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([RequestStatus(status_id=1, status_name='Pending'),
+                            RequestStatus(status_id=2, status_name='Approved'),
+                            RequestStatus(status_id=3, status_name='Rejected'),
+                            Admin(admin_id='AD01', admin_name='Admin', admin_email='ad@x.com', admin_password='x'),
+                            Rooms(room_id=1, room_name='Room 1', capacity=50, is_active=True),
+                            Rooms(room_id=2, room_name='Room 2', capacity=50, is_active=True)])
+        start, end = datetime(2030, 1, 1, 10), datetime(2030, 1, 1, 12)
+        for event_id in (1, 2):
+            db.session.add(Event(event_id=event_id, title=f'Event {event_id}', capacity=20,
+                                 start_datetime=start, end_datetime=end, event_status='Pending'))
+        # Event 1 asked for room 1; room 2 was approved for event 2 after the proposal was made
+        db.session.add_all([Booking(booking_id=1, event_id=1, room_id=1, status_id=PENDING,
+                                    req_start_datetime=start, req_end_datetime=end),
+                            Booking(booking_id=2, event_id=2, room_id=2, status_id=APPROVED,
+                                    req_start_datetime=start, req_end_datetime=end)])
+        db.session.commit()
+        room_index.load()
+        yield app
+        db.session.remove()
+
+
+def test_stale_proposal_leaves_booking_in_its_room(app):
+    with app.app_context():
+        # The optimizer proposed room 2 for booking 1, but room 2 is now taken
+        results = process_bulk('approve', [1], [], 'AD01', room_overrides={1: 2})
+
+        assert [r['ok'] for r in results] == [False]
+        assert 'already booked' in results[0]['message']
+        booking = db.session.get(Booking, 1)
+        assert (booking.room_id, booking.status_id) == (1, PENDING)
+        assert room_index.verify() == []
+
+
+def test_proposal_moves_booking_when_approved(app):
+    with app.app_context():
+        db.session.get(Booking, 2).status_id = 3
+        db.session.commit()
+        room_index.load()
+
+        results = process_bulk('approve', [1], [], 'AD01', room_overrides={1: 2})
+
+        assert [r['ok'] for r in results] == [True]
+        booking = db.session.get(Booking, 1)
+        assert (booking.room_id, booking.status_id) == (2, APPROVED)
+        assert room_index.verify() == []